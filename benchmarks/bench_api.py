@@ -0,0 +1,125 @@
+"""
+Measures the throughput of get_investments, get_loans and get_note_schedule against the local Mintos stand-in.
+Reports pages/sec and rows/sec of the whole call, the time spent parsing the rows and the peak memory traced during
+the call, so changes can be compared run against run without touching the live site.
+
+Usage: python -m benchmarks.bench_api [--rows ROWS] [--latency SECONDS] [--schedules NOTES] [--repeat N] [--rate RATE]
+"""
+
+from mintospy.constants import CONSTANTS
+from mintospy.throttle import Throttle
+from mintospy.cache import DiskCache
+from mintospy.api import MintosApi
+from testing import MintosStandIn
+from typing import Callable
+import tracemalloc
+import argparse
+import tempfile
+import time
+
+
+def measure(name: str, fetch: Callable[[], int], parse: Callable, pages: int, repeat: int) -> dict:
+    """
+    :param name: Name of the benchmarked call
+    :param fetch: Function doing the whole call, returning the number of rows it got
+    :param parse: Function parsing already fetched rows
+    :param pages: Pages (Requests) the call needs
+    :param repeat: Times to run the call (Best time is kept)
+    :return: Measurements of the call
+    """
+
+    timings, parse_timings = [], []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = fetch()
+        timings.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        parse()
+        parse_timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    fetch()
+    peak_memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    elapsed = min(timings)
+
+    return {
+        'name': name,
+        'rows': rows,
+        'pages/s': pages / elapsed,
+        'rows/s': rows / elapsed,
+        'total (s)': elapsed,
+        'parse (s)': min(parse_timings),
+        'peak (MiB)': peak_memory / 2 ** 20,
+    }
+
+
+def main(rows: int, latency: float, schedules: int, repeat: int, rate: float) -> None:
+    CONSTANTS.CACHE = DiskCache(tempfile.mkdtemp(prefix='mintospy-bench-'))
+
+    with MintosStandIn(investments=rows, loans=rows // 2, schedule_loans=50, latency=latency) as stand_in:
+        throttle = Throttle(rate=rate, burst=max(int(rate), 1), max_concurrency=CONSTANTS.MAX_WORKERS)
+
+        client = MintosApi(cookies=stand_in.cookies, save_cookies=False, throttle=throttle)
+
+        pages = -(-rows // CONSTANTS.MAX_RESULTS)
+
+        investments = client.get_investments(currency='EUR', quantity=rows, raw=True)
+        loans = client.get_loans(currencies=['EUR', 'KZT'], quantity=rows, raw=True)
+        isins = [f'LV{idx:010d}' for idx in range(schedules)]
+        schedule = client.get_note_schedule(isins[0], raw=True)
+
+        results = [
+            measure(
+                name='get_investments',
+                fetch=lambda: len(client.get_investments(currency='EUR', quantity=rows)),
+                parse=lambda: MintosApi._investments_frame(investments, claims=False),
+                pages=pages,
+                repeat=repeat,
+            ),
+            measure(
+                name='get_loans',
+                fetch=lambda: len(client.get_loans(currencies=['EUR', 'KZT'], quantity=rows)),
+                parse=lambda: MintosApi._loans_frame(loans),
+                pages=pages,
+                repeat=repeat,
+            ),
+            measure(
+                name='get_note_schedule',
+                fetch=lambda: sum(len(client.get_note_schedule(isin)) for isin in isins),
+                parse=lambda: [MintosApi._note_schedule_result({'paymentSchedule': schedule}, isins[0], False)
+                               for _ in isins],
+                pages=schedules,
+                repeat=repeat,
+            ),
+        ]
+
+    columns = list(results[0])
+
+    print(f'rows: {rows}, latency: {latency * 1000:.0f}ms, schedules: {schedules}')
+    print(''.join(f'{column:>18}' for column in columns))
+
+    for result in results:
+        print(''.join(
+            f'{value:>18}' if isinstance(value, str)
+            else f'{value:>18,}' if isinstance(value, int)
+            else f'{value:>18,.3f}'
+            for value in result.values()
+        ))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+
+    parser.add_argument('--rows', type=int, default=6_000, help='Rows requested from get_investments and get_loans')
+    parser.add_argument('--latency', type=float, default=0.05, help='Seconds every stand-in response is delayed by')
+    parser.add_argument('--schedules', type=int, default=20, help='Notes whose schedules are fetched one by one')
+    parser.add_argument('--repeat', type=int, default=3, help='Times each call is run (Best time is kept)')
+    parser.add_argument('--rate', type=float, default=1_000, help='Requests per second allowed by the throttle')
+
+    args = parser.parse_args()
+
+    main(rows=args.rows, latency=args.latency, schedules=args.schedules, repeat=args.repeat, rate=args.rate)
@@ -0,0 +1,55 @@
+"""
+Compares the JSON backends that responses can be decoded with, on 300-row loan pages of the local Mintos stand-in.
+
+Usage: python -m benchmarks.bench_decode [pages]
+"""
+
+from mintospy.constants import CONSTANTS
+from mintospy import codec
+from testing import MintosStandIn
+import json
+import time
+import sys
+
+
+def make_pages(quantity: int) -> list:
+    stand_in = MintosStandIn(loans=CONSTANTS.MAX_RESULTS * quantity)
+
+    return [
+        json.dumps(
+            stand_in._loans(
+                market='primary',
+                body={'currencies': [978], 'pagination': {'page': page, 'maxResults': CONSTANTS.MAX_RESULTS}},
+            ),
+        ).encode()
+        for page in range(1, quantity + 1)
+    ]
+
+
+def main() -> None:
+    quantity = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+
+    pages = make_pages(quantity)
+
+    megabytes = sum(map(len, pages)) / 2 ** 20
+
+    for backend in ('json', 'orjson'):
+        try:
+            codec.use(backend)
+
+        except ImportError:
+            print(f'{backend:>8}: not installed')
+            continue
+
+        start = time.perf_counter()
+
+        for page in pages:
+            codec.loads(page)
+
+        elapsed = time.perf_counter() - start
+
+        print(f'{backend:>8}: {quantity / elapsed:8.1f} pages/sec {megabytes / elapsed:8.1f} MB/sec')
+
+
+if __name__ == '__main__':
+    main()
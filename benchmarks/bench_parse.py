@@ -0,0 +1,107 @@
+"""
+Compares the row-by-row and columnar investment and note schedule parsers on synthetic Mintos data.
+
+Usage: python -m benchmarks.bench_parse [rows]
+"""
+
+from mintospy.utils import Utils
+import pandas as pd
+import random
+import time
+import sys
+
+
+def make_investments(quantity: int) -> list:
+    rng = random.Random(0)
+
+    investments = []
+
+    for idx in range(quantity):
+        investments.append({
+            'isin': f'LV{idx:010d}',
+            'lender': rng.choice(['Mogo', 'Wowwo', 'Kviku', 'Creditstar']),
+            'interestRate': f'{rng.uniform(5, 20):.2f}',
+            'initialAmount': {'amount': f'{rng.uniform(1, 500):.2f}', 'currency': 'EUR'},
+            'amount': {'amount': f'{rng.uniform(0, 500):.2f}', 'currency': 'EUR'},
+            'pendingPayments': {'amount': f'{rng.uniform(0, 5):.2f}', 'currency': 'EUR'},
+            'mintosRiskScore': {'score': str(rng.randint(1, 9)), 'subscores': {'buyback': '7.5', 'structure': '8'}},
+            'createdAt': 1650000000000 + idx * 60_000,
+            'loanDtEnd': 1690000000000 + idx * 60_000,
+            'term': rng.randint(1, 60),
+            'status': rng.choice(['current', 'late']),
+            'isListed': rng.choice([True, False]),
+        })
+
+    return investments
+
+
+def make_schedule(quantity: int) -> list:
+    rng = random.Random(0)
+
+    def component(key: str) -> dict:
+        scheduled = rng.uniform(0, 50)
+
+        return {key: f'{scheduled:.2f}', 'received': f'{scheduled * rng.choice([0, 1]):.2f}', 'hasRemainder': False}
+
+    schedule = []
+
+    for idx in range(quantity):
+        schedule.append({
+            'loan': {'id': idx, 'identifier': f'{idx}-01'},
+            'currency': {'abbreviation': 'EUR', 'isoCode': 978},
+            'date': 1690000000000 + idx * 60_000,
+            'number': idx % 12 + 1,
+            'isPrepaid': False,
+            'total': component('scheduled'),
+            'principal': component('scheduled'),
+            'interest': component('scheduled'),
+            'delayedInterest': component('accumulated'),
+            'latePaymentFee': component('accumulated'),
+        })
+
+    return schedule
+
+
+def best_of(func, repeat: int = 3) -> float:
+    timings = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+
+        func()
+
+        timings.append(time.perf_counter() - start)
+
+    return min(timings)
+
+
+def main(rows: int) -> None:
+    investments = make_investments(rows)
+
+    row_by_row = best_of(lambda: pd.DataFrame.from_records(Utils.parse_investments(investments)))
+
+    columnar = best_of(lambda: Utils.parse_investments_frame(investments))
+
+    print(f'rows:          {rows}')
+    print(f'row-by-row:    {row_by_row:.3f}s')
+    print(f'columnar:      {columnar:.3f}s')
+    print(f'speedup:       {row_by_row / columnar:.1f}x')
+
+    schedule = make_schedule(rows)
+
+    row_by_row = best_of(
+        lambda: pd.DataFrame([Utils.parse_note_schedule(Utils.parse_mintos_items(item)) for item in schedule]),
+    )
+
+    columnar = best_of(lambda: Utils.parse_note_schedule_frame(schedule))
+
+    cash_flows = best_of(lambda: Utils.note_cash_flows({'LV0000000001': schedule}))
+
+    print(f'schedule row-by-row: {row_by_row:.3f}s')
+    print(f'schedule columnar:   {columnar:.3f}s')
+    print(f'schedule speedup:    {row_by_row / columnar:.1f}x')
+    print(f'cash flows:          {cash_flows:.3f}s')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
@@ -1,2 +1,3 @@
 from mintospy.api import MintosApi
+from mintospy.async_api import AsyncMintosApi
 from mintospy.enums import *
@@ -1,28 +1,72 @@
-from mintospy.exceptions import MintosException
+from mintospy.hooks import Hook, CallTimer, RequestEvent, endpoint_of, emit
+from mintospy.exceptions import MintosException, NetworkException, RetryableException
+from mintospy.throttle import Throttle, backoff
+from mintospy.checkpoint import Checkpoint
+from mintospy.session import SessionVault
+from mintospy.cache import ResponseCache
 from mintospy.constants import CONSTANTS
 from mintospy.enums import Currency
 from mintospy.endpoints import ENDPOINTS
 from mintospy.utils import Utils
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as ec
-from selenium.webdriver.remote.webelement import WebElement
-from selenium.common.exceptions import TimeoutException
-from selenium_recaptcha_solver import RecaptchaSolver
-from typing import Union, List
+from mintospy import codec
+from concurrent.futures import ThreadPoolExecutor
+from typing import Union, List, Dict, Tuple, Iterable, Iterator, Callable, TYPE_CHECKING
 from datetime import datetime
-from bs4 import BeautifulSoup
-import undetected_chromedriver as webdriver
-import selenium.common.exceptions
-import pandas as pd
 import cloudscraper
+import requests
 import warnings
+import threading
 import random
-import pyotp
+import uuid
+import hashlib
+import heapq
+import math
+import copy
 import time
 import json
 import os
 
 
+if TYPE_CHECKING:
+    from selenium.webdriver.remote.webelement import WebElement
+    from mintospy.session import SessionKeeper
+    from mintospy.export import ArrowExport
+    import undetected_chromedriver as webdriver
+    import pandas as pd
+
+
+def _import_browser() -> None:
+    """
+    Checks that the browser stack used to log in is installed (It's only imported once a login needs it).
+    :raises ImportError: If any part of the browser extra is missing
+    """
+
+    try:
+        import undetected_chromedriver
+        import selenium_recaptcha_solver
+        import selenium
+        import pyotp
+
+    except ImportError as e:
+        raise ImportError(
+            'Logging in with a browser requires the browser extra: pip install "mintospy[browser]"',
+        ) from e
+
+
+class BulkResult(dict):
+    def __init__(self, results: dict, errors: dict):
+        """
+        Raw results of a call made for many keys at the same time, mapped by key, with the errors of the keys that
+        failed kept apart (Like the "errors" attribute of the dataframes of the same calls, but with the exceptions).
+        :param results: Results of the keys that succeeded
+        :param errors: Errors of the keys that failed
+        """
+
+        super().__init__(results)
+
+        self.errors = errors
+
+
 class MintosApi:
     def __init__(
             self,
@@ -31,9 +75,15 @@ class MintosApi:
             tfa_secret: str = None,
             cookies: List[dict] = None,
             save_cookies: bool = True,
+            hooks: List[Hook] = None,
+            throttle: Throttle = None,
+            response_cache: ResponseCache = None,
+            fast_login: bool = False,
+            browser_profile: str = None,
     ):
         """
         Mintos API wrapper with all relevant Mintos functionalities.
+        Creating a client doesn't send any request: the session is started (Logging in if needed) on the first call.
         :param email: Account's email
         :param password: Account's password
         :param tfa_secret: Base32 secret used for two-factor authentication
@@ -41,6 +91,16 @@ class MintosApi:
         :param cookies: Cookies to load in to web driver on boot
         :param save_cookies: Set to false if you don't want your cookies to be saved locally for faster login
         (Only mandatory if account has two-factor authentication enabled)
+        :param hooks: Instrumentation hooks that get an event for every request and the stage timings of every call
+        :param throttle: Rate and concurrency limiter of the requests to Mintos
+        (Shared by every client in the process by default, see CONSTANTS.THROTTLE)
+        :param response_cache: In-memory cache of the responses of read-only endpoints, so repeated calls with the same
+        arguments are answered locally until the responses expire (Nothing is cached by default). It can be shared by
+        clients of different accounts, each only gets its own account's responses
+        :param fast_login: Block images, fonts and trackers in the browser when logging in
+        (See CONSTANTS.LOGIN_BLOCKED_URLS)
+        :param browser_profile: Directory of a browser profile to log in with, which keeps the Mintos session across
+        restarts, so a login with a profile whose session is still valid only has to load the overview page
         """
 
         self.email = email
@@ -48,9 +108,28 @@ class MintosApi:
         self.tfa_secret = tfa_secret
 
         self.should_save = save_cookies
-        self.cookies = cookies if cookies else Utils.import_cookies(f'{email}_cookies.json')
+        self.hooks = list(hooks) if hooks else []
+        self.throttle = throttle or CONSTANTS.THROTTLE
+        self.response_cache = response_cache
+        self.fast_login = fast_login
+        self.browser_profile = browser_profile
+        self.login_timings = {}
+        self.session_expiry = time.time() + CONSTANTS.SESSION_EXPIRY_SECONDS
+        self.cookies, self.csrf_token = None, None
+
+        # Session shared by every client of the account, in this process and others
+        self.vault = SessionVault(f'{email}_cookies.json') if email else None
+
+        # Namespace of the client's responses in the response cache (Clients without an email don't share theirs)
+        self._cache_namespace = self._account_key() if email else uuid.uuid4().hex
+
+        # Held while the session is started, checked or replaced, so only one thread logs in at a time
+        self._session_lock = threading.RLock()
+        self._session_started = False
+
+        session = None if cookies or self.vault is None else self.vault.load()
 
-        if not self.cookies:
+        if not cookies and session is None:
             if email is None:
                 raise ValueError('Invalid email.')
 
@@ -69,27 +148,12 @@ class MintosApi:
             },
         )
 
-        if self.cookies:
-            for name, value in self.cookies.items():
-                self.scraper.cookies.set(name, value)
+        # Nothing is requested until the first call, which logs in or fetches the CSRF token if needed
+        if session is not None:
+            self._use_session(session['cookies'], session['csrf_token'], session['expiry'])
 
-        else:
-            # Initialise web driver session
-            self.driver = self._create_driver()
-
-            # Initialise RecaptchaV2 solver object
-            self.solver = RecaptchaSolver(driver=self.driver)
-
-            try:
-                # Automatically authenticate to Mintos API upon API object initialization
-                self.login()
-
-            except TimeoutException:
-                raise MintosException('Check your network connection.')
-
-        self.csrf_token = self._get_csrf_token()
-
-        self.scraper.headers.update({'anti-csrf-token': self.csrf_token})
+        elif cookies:
+            self._use_session(cookies)
 
     def get_portfolio_data(self, currency: Currency) -> dict:
         """
@@ -99,11 +163,16 @@ class MintosApi:
 
         currency_iso_code = CONSTANTS.get_currency_iso(currency)
 
-        response = self.scraper.get(
-            url=f'{ENDPOINTS.API_PORTFOLIO_URI}/{currency_iso_code}/portfolio-data',
-        ).json()
+        with CallTimer('get_portfolio_data', self.hooks) as timer:
+            with timer.stage('fetch'):
+                response = self._request(
+                    method='GET',
+                    url=f'{ENDPOINTS.API_PORTFOLIO_URI}/{currency_iso_code}/portfolio-data',
+                    timer=timer,
+                )
 
-        return Utils.parse_mintos_items(response)
+            with timer.stage('parse'):
+                return Utils.parse_mintos_items(response)
 
     def get_net_annual_return(self, currency: Currency) -> dict:
         """
@@ -113,12 +182,17 @@ class MintosApi:
 
         currency_iso_code = CONSTANTS.get_currency_iso(currency)
 
-        response = self.scraper.get(
-            url=ENDPOINTS.API_NAR_URI,
-            params={'currencyIsoCode': currency_iso_code},
-        ).json()
+        with CallTimer('get_net_annual_return', self.hooks) as timer:
+            with timer.stage('fetch'):
+                response = self._request(
+                    method='GET',
+                    url=ENDPOINTS.API_NAR_URI,
+                    params={'currencyIsoCode': currency_iso_code},
+                    timer=timer,
+                )
 
-        return Utils.parse_mintos_items(response)
+            with timer.stage('parse'):
+                return Utils.parse_mintos_items(response)
 
     def get_aggregates_overview(self, currency: Currency) -> dict:
         """
@@ -128,12 +202,53 @@ class MintosApi:
 
         currency_iso_code = CONSTANTS.get_currency_iso(currency)
 
-        response = self.scraper.get(
-            url=ENDPOINTS.API_AGGREGATES_OVERVIEW_URI,
-            params={'currencyIsoCode': currency_iso_code, 'lenderStatus': 'All'},
-        ).json()
+        with CallTimer('get_aggregates_overview', self.hooks) as timer:
+            with timer.stage('fetch'):
+                response = self._request(
+                    method='GET',
+                    url=ENDPOINTS.API_AGGREGATES_OVERVIEW_URI,
+                    params={'currencyIsoCode': currency_iso_code, 'lenderStatus': 'All'},
+                    timer=timer,
+                )
+
+            with timer.stage('parse'):
+                return Utils.parse_mintos_items(response)
 
-        return Utils.parse_mintos_items(response)
+    def get_dashboard(
+            self,
+            currencies: List[Currency],
+            raw: bool = False,
+            max_workers: int = None,
+    ) -> Union['pd.DataFrame', BulkResult]:
+        """
+        Gets the portfolio data, net annual return and aggregates overview of many currencies at the same time.
+        A call that fails doesn't stop the others, its error is reported instead (Under the "errors" attribute of the
+        dataframe, mapping currency to the failed calls and their errors).
+        :param currencies: Currencies of the portfolios to get data from
+        :param raw: Return the results of every call by currency and call if set to True (Failed calls are under its
+        "errors" attribute, mapped to their exception), or returns a single pandas dataframe of every metric if set to
+        False
+        :param max_workers: Maximum number of calls running at the same time (CONSTANTS.MAX_WORKERS by default)
+        :return: Value and source (portfolio_data, net_annual_return or aggregates_overview) of every metric, indexed by
+        currency and metric (Metrics returned by several calls keep the value of the first of them)
+        """
+
+        calls = {
+            'portfolio_data': self.get_portfolio_data,
+            'net_annual_return': self.get_net_annual_return,
+            'aggregates_overview': self.get_aggregates_overview,
+        }
+
+        with CallTimer('get_dashboard', self.hooks) as timer:
+            return self._map_bulk(
+                func=lambda key: calls[key[1]](key[0]),
+                keys=[(currency, call) for currency in currencies for call in calls],
+                max_workers=max_workers,
+                timer=timer,
+                raw=raw,
+                frame=lambda results: self._dashboard_frame(results, timer),
+                group=self._by_currency,
+            )
 
     def get_investments(
             self,
@@ -164,7 +279,10 @@ class MintosApi:
             current: bool = True,
             ascending_sort: bool = False,
             raw: bool = False,
-    ) -> Union[pd.DataFrame, List[dict]]:
+            max_workers: int = None,
+            checkpoint: str = None,
+            typed: bool = False,
+    ) -> Union['pd.DataFrame', List[dict]]:
         """
         :param currency: Currency that investments are denominated in
         :param quantity: Quantity of investments to get
@@ -218,9 +336,1624 @@ class MintosApi:
         :param current: Returns current notes in portfolio if set to true, otherwise returns finished investments
         :param ascending_sort: Sort notes in ascending order based on "sort" argument if True, otherwise sort descending
         :param raw: Return raw notes JSON if set to True, or returns pandas dataframe of notes if set to False
+        :param max_workers: Maximum number of pages fetched at the same time (CONSTANTS.MAX_WORKERS by default)
+        :param checkpoint: Path of a file to save the pages to as they arrive, so calling again with the same arguments
+        after an interruption only fetches the missing pages (The file is removed once every page is fetched)
+        :param typed: Return a dataframe with typed columns (Floats, nullable integers and booleans, categories and
+        datetime64 dates, with missing values left empty) instead of filling missing values with "N/A"
+        :return: Pandas DataFrame or raw JSON of notes (Chosen in the "raw" argument)
+        """
+
+        if isinstance(strategies, list):
+            self._validate_strategies(strategies, self.get_investment_filters(current))
+
+        request_args = self._investments_request(
+            currency=currency,
+            start_page=start_page,
+            claims=claims,
+            sort_field=sort_field,
+            countries=countries,
+            pending_payments=pending_payments,
+            amortization_methods=amortization_methods,
+            claim_id=claim_id,
+            isin=isin,
+            late_loan_exposure=late_loan_exposure,
+            lending_companies=lending_companies,
+            lender_statuses=lender_statuses,
+            listed_for_sale=listed_for_sale,
+            max_interest_rate=max_interest_rate,
+            min_interest_rate=min_interest_rate,
+            loan_types=loan_types,
+            max_risk_score=max_risk_score,
+            min_risk_score=min_risk_score,
+            max_term=max_term,
+            min_term=min_term,
+            max_purchased_date=max_purchased_date,
+            min_purchased_date=min_purchased_date,
+            current=current,
+            ascending_sort=ascending_sort,
+        )
+
+        with CallTimer('get_investments', self.hooks) as timer:
+            with timer.stage('fetch'), Checkpoint(checkpoint, [request_args], start_page, quantity) as pages:
+                responses = self._fetch_pages([request_args], start_page, quantity, max_workers, timer, pages)[0]
+
+            return self._investments_result(responses, quantity, claims, raw, timer, typed)
+
+    def iter_investments(
+            self,
+            currency: Currency,
+            quantity: int = None,
+            start_page: int = 1,
+            claims: bool = False,
+            current: bool = True,
+            frames: bool = False,
+            raw: bool = False,
+            typed: bool = False,
+            progress: Callable[[int, int], None] = None,
+            undecoded: bool = False,
+            **filters,
+    ) -> Iterator[Union[dict, 'pd.DataFrame', bytes]]:
+        """
+        Streams investments page by page as they arrive, instead of collecting every page before returning.
+        The next page is requested while the current one is being consumed, and no more pages are requested once the
+        caller stops iterating.
+        :param currency: Currency that investments are denominated in
+        :param quantity: Maximum quantity of investments to get (Gets every investment by default)
+        :param start_page: Page to start getting investments from (Gets from first page by default)
+        :param claims: Specify whether to get Notes or Claims (True -> Gets claims; False -> Gets notes)
+        :param current: Returns current notes in portfolio if set to true, otherwise returns finished investments
+        :param frames: Yield a pandas dataframe per page if set to True, otherwise yields one record per investment
+        :param raw: Yield raw JSON records/pages if set to True, or parsed records/dataframes if set to False
+        :param typed: Yield dataframes with typed columns instead of filling missing values with "N/A"
+        (See get_investments)
+        :param progress: Called after every page with the quantity of investments retrieved so far and the
+        quantity expected in total (Based on the total reported by Mintos)
+        :param undecoded: Yield the JSON body of every page as the bytes Mintos sent, for callers that store pages as
+        they are (Overrides frames and raw, and the last page isn't cut down to the quantity)
+        :param filters: Any filter or sorting argument accepted by get_investments (sort_field, countries, etc.)
+        :return: Iterator of investment records, or of a pandas dataframe/raw JSON list/JSON body per page
+        """
+
+        strategies = filters.pop('strategies', None)
+
+        if isinstance(strategies, list):
+            self._validate_strategies(strategies, self.get_investment_filters(current))
+
+        request_args = self._investments_request(
+            currency=currency,
+            start_page=start_page,
+            claims=claims,
+            current=current,
+            **filters,
+        )
+
+        pages = self._iter_pages(
+            request_args=request_args,
+            start_page=start_page,
+            quantity=quantity,
+            get_items=lambda response: self._investment_items(response, claims),
+            progress=progress,
+            bodies=undecoded,
+        )
+
+        if undecoded:
+            yield from pages
+
+            return
+
+        for items in pages:
+            if frames:
+                yield items if raw else self._investments_frame(items, claims, typed=typed)
+
+            else:
+                yield from items if raw else Utils.parse_investments(items)
+
+    def get_investment_filters(self, current: bool = False, cached: bool = True) -> dict:
+        """
+        This seems to only work in a sequence of API calls, so it's not recommended to call it alone!
+        :param current: Set to True to get filters for current investments, else set to False
+        :param cached: Set to False to skip the local cache and always fetch the filters from Mintos
+        :return: Investment filters provided by Mintos
+        """
+
+        if not cached:
+            return self._load_investment_filters(current)
+
+        return CONSTANTS.CACHE.get(
+            key=f'investment_filters_{0 if current else 1}_{self._account_key()}',
+            loader=lambda: self._load_investment_filters(current),
+            ttl=CONSTANTS.FILTERS_TTL_SECONDS,
+        )
+
+    def get_loans(
+            self,
+            currencies: List[Currency],
+            quantity: int = 30,
+            start_page: int = 1,
+            sort_field: str = 'interest_rate',
+            secondary_market: bool = False,
+            countries: List[str] = None,
+            pending_payments: bool = None,
+            amortization_methods: List[str] = None,
+            isin: str = None,
+            late_loan_exposure: List[str] = None,
+            lending_companies: List[str] = None,
+            lender_statuses: List[str] = None,
+            listed_for_sale: bool = None,
+            max_interest_rate: float = None,
+            min_interest_rate: float = None,
+            loan_types: List[str] = None,
+            max_risk_score: float = 10,
+            min_risk_score: float = 0,
+            strategies: List[str] = None,
+            max_term: int = None,
+            min_term: int = None,
+            direct_investment_structure: bool = None,
+            min_investment_amount: float = None,
+            current: bool = True,
+            ascending_sort: bool = False,
+            raw: bool = False,
+            split_currencies: bool = False,
+            max_workers: int = None,
+            checkpoint: str = None,
+            typed: bool = False,
+    ) -> Union['pd.DataFrame', List[dict]]:
+        """
+        :param currencies: Currencies that investments are denominated in
+        :param quantity: Quantity of investments to get
+        :param start_page: Page to start getting investments from (Gets from first page by default)
+        :param sort_field: Field to sort by (
+        Sort fields:
+        isin -> Sort by Notes' International Securities Identification Number (ISIN) alphabetically;
+        risk_score -> Sort by risk score;
+        lending_company -> Sort by lending company alphabetically;
+        remaining_term -> Sort by remaining term;
+        initial_principal -> Sort by initial principal / remaining;
+        interest_rate -> Sort by interest rate;
+        available_for_investment -> Sort by amount available for investment;
+        )
+        :param secondary_market: If True, loans will be retrieved from the secondary market, else from the primary
+        :param countries: What countries notes should be issued from
+        :param pending_payments: If payments for notes should be pending or not
+        :param amortization_methods: Amortization type of notes (Full, partial, interest-only, or bullet)
+        :param isin: International Securities Identification Number (ISIN) of security to filter by
+        :param late_loan_exposure: Late loan exposure of notes (0_20 for 0-20%, 20_40 for 20-40%, and so on)
+        :param lending_companies: Only return notes issued by specified lending companies
+        :param lender_statuses: Only return notes from lenders in a certain state (Active, suspended, or in default)
+        :param listed_for_sale: Specify whether to return notes that are on sale in the secondary market or not
+        :param max_interest_rate: Only return notes up to this maximum interest rate
+        :param min_interest_rate: Only return notes up to this minimum interest rate
+        :param loan_types: Only return notes composed of certain loan types
+        (agricultural, business, car, invoice_financing, mortgage, pawnbroking, personal, short_term)
+        :param max_risk_score: Only returns notes below this risk score (1-10 or "SW" for notes with suspended rating)
+        :param min_risk_score: Only returns notes above this risk score (1-10 or "SW" for notes with suspended rating)
+        :param strategies: Only return notes that were invested in with certain strategies
+        :param max_term: Only return notes up to a maximum term
+        :param min_term: Only return notes up to a minimum term
+        :param direct_investment_structure: Only returns notes with a direct or indirect structure
+        :param min_investment_amount: Minimum investment amount for a Note
+        :param current: Returns current notes in portfolio if set to true, otherwise returns finished investments
+        :param ascending_sort: Sort notes in ascending order based on "sort" argument if True, otherwise sort descending
+        :param raw: Return raw notes JSON if set to True, or returns pandas dataframe of notes if set to False
+        :param split_currencies: Query each currency separately and concurrently, merging the results by "sort_field"
+        (Each currency is paginated on its own, starting from "start_page")
+        :param max_workers: Maximum number of pages fetched at the same time (CONSTANTS.MAX_WORKERS by default)
+        :param checkpoint: Path of a file to save the pages to as they arrive, so calling again with the same arguments
+        after an interruption only fetches the missing pages (The file is removed once every page is fetched)
+        :param typed: Return a dataframe with typed columns (Floats, nullable integers and booleans, categories and
+        datetime64 dates, with missing values left empty) instead of filling missing values with "N/A"
         :return: Pandas DataFrame or raw JSON of notes (Chosen in the "raw" argument)
         """
 
+        if isinstance(strategies, list):
+            self._validate_strategies(strategies, self.get_investment_filters(current))
+
+        request_args = self._loans_request(
+            currencies=currencies,
+            start_page=start_page,
+            sort_field=sort_field,
+            secondary_market=secondary_market,
+            countries=countries,
+            pending_payments=pending_payments,
+            amortization_methods=amortization_methods,
+            isin=isin,
+            late_loan_exposure=late_loan_exposure,
+            lending_companies=lending_companies,
+            lender_statuses=lender_statuses,
+            listed_for_sale=listed_for_sale,
+            max_interest_rate=max_interest_rate,
+            min_interest_rate=min_interest_rate,
+            loan_types=loan_types,
+            max_risk_score=max_risk_score,
+            min_risk_score=min_risk_score,
+            max_term=max_term,
+            min_term=min_term,
+            direct_investment_structure=direct_investment_structure,
+            min_investment_amount=min_investment_amount,
+            ascending_sort=ascending_sort,
+        )
+
+        queries = self._split_currencies(request_args) if split_currencies else [request_args]
+
+        with CallTimer('get_loans', self.hooks) as timer:
+            with timer.stage('fetch'), Checkpoint(checkpoint, queries, start_page, quantity) as pages:
+                responses = self._fetch_pages(queries, start_page, quantity, max_workers, timer, pages)
+
+            return self._loans_result(responses, quantity, request_args['json']['sorting'], raw, timer, typed)
+
+    def iter_loans(
+            self,
+            currencies: List[Currency],
+            quantity: int = None,
+            start_page: int = 1,
+            secondary_market: bool = False,
+            current: bool = True,
+            frames: bool = False,
+            raw: bool = False,
+            typed: bool = False,
+            progress: Callable[[int, int], None] = None,
+            undecoded: bool = False,
+            **filters,
+    ) -> Iterator[Union[dict, 'pd.DataFrame', bytes]]:
+        """
+        Streams loans page by page as they arrive, instead of collecting every page before returning.
+        The next page is requested while the current one is being consumed, and no more pages are requested once the
+        caller stops iterating.
+        :param currencies: Currencies that investments are denominated in
+        :param quantity: Maximum quantity of loans to get (Gets every loan by default)
+        :param start_page: Page to start getting loans from (Gets from first page by default)
+        :param secondary_market: If True, loans will be retrieved from the secondary market, else from the primary
+        :param current: Used to validate strategies against current or finished investments' filters
+        :param frames: Yield a pandas dataframe per page if set to True, otherwise yields one record per loan
+        :param raw: Yield raw JSON records/pages if set to True, or parsed records/dataframes if set to False
+        :param typed: Yield dataframes with typed columns instead of filling missing values with "N/A" (See get_loans)
+        :param progress: Called after every page with the quantity of loans retrieved so far and the
+        quantity expected in total (Based on the total reported by Mintos)
+        :param undecoded: Yield the JSON body of every page as the bytes Mintos sent, for callers that store pages as
+        they are (Overrides frames and raw, and the last page isn't cut down to the quantity)
+        :param filters: Any filter or sorting argument accepted by get_loans (sort_field, countries, etc.)
+        :return: Iterator of loan records, or of a pandas dataframe/raw JSON list/JSON body per page
+        """
+
+        strategies = filters.pop('strategies', None)
+
+        if isinstance(strategies, list):
+            self._validate_strategies(strategies, self.get_investment_filters(current))
+
+        request_args = self._loans_request(
+            currencies=currencies,
+            start_page=start_page,
+            secondary_market=secondary_market,
+            **filters,
+        )
+
+        pages = self._iter_pages(
+            request_args=request_args,
+            start_page=start_page,
+            quantity=quantity,
+            get_items=self._loan_items,
+            progress=progress,
+            bodies=undecoded,
+        )
+
+        if undecoded:
+            yield from pages
+
+            return
+
+        for items in pages:
+            if frames:
+                yield items if raw else self._loans_frame(items, typed=typed)
+
+            else:
+                yield from items if raw else Utils.parse_investments(items)
+
+    def get_loan_filters(self, cached: bool = True) -> dict:
+        """
+        :param cached: Set to False to skip the local cache and always fetch the filters from Mintos
+        :return: Loan filters provided by Mintos
+        """
+
+        if not cached:
+            return self._load_loan_filters()
+
+        return CONSTANTS.CACHE.get(
+            key='loan_filters',
+            loader=self._load_loan_filters,
+            ttl=CONSTANTS.FILTERS_TTL_SECONDS,
+        )
+
+    def get_note_loans(self, isin: str, raw: bool = False, typed: bool = False) -> Union['pd.DataFrame', List[dict]]:
+        """
+        :param isin: ISIN of note
+        :param raw: Return raw details in JSON if set to True, or returns pandas dataframe of details if set to False
+        :param typed: Return a dataframe with typed columns instead of filling missing values with "N/A"
+        (See get_investments)
+        :return: Loans that compose the Note
+        """
+
+        with CallTimer('get_note_loans', self.hooks) as timer:
+            with timer.stage('fetch'):
+                response = self._request(
+                    method='GET',
+                    url=f'{ENDPOINTS.API_NOTES_DETAILS_URI}/{isin}/loans',
+                    timer=timer,
+                )
+
+            return self._note_loans_result(response, isin, raw, timer, typed)
+
+    def get_notes_loans(
+            self,
+            isins: List[str],
+            raw: bool = False,
+            max_workers: int = None,
+            typed: bool = False,
+    ) -> Union['pd.DataFrame', BulkResult]:
+        """
+        Gets the loans of many Notes at the same time. A Note whose loans can't be fetched doesn't stop the others,
+        its error is reported instead (Under the "errors" attribute of the dataframe, mapping ISIN to error).
+        :param isins: ISINs of notes (Duplicates are only fetched once)
+        :param raw: Return raw loans in JSON by ISIN if set to True (Failed ISINs are under its "errors" attribute,
+        mapped to their exception), or returns a single pandas dataframe of every Note's loans if set to False
+        :param max_workers: Maximum number of Notes fetched at the same time (CONSTANTS.MAX_WORKERS by default)
+        :param typed: Return a dataframe with typed columns instead of filling missing values with "N/A"
+        (See get_investments)
+        :return: Loans that compose the Notes, indexed by ISIN and loan identifier
+        """
+
+        with CallTimer('get_notes_loans', self.hooks) as timer:
+            return self._map_bulk(
+                func=lambda isin: self._fetch_note_loans(isin, timer),
+                keys=isins,
+                max_workers=max_workers,
+                timer=timer,
+                raw=raw,
+                parse=lambda items: [Utils.parse_mintos_items(item) for item in items],
+                frame=lambda loans: self._notes_loans_frame(loans, timer, typed),
+            )
+
+    def get_note_schedule(
+            self,
+            isin: str,
+            raw: bool = False,
+            typed: bool = False,
+            cash_flows: bool = False,
+    ) -> Union['pd.DataFrame', List[dict]]:
+        """
+        :param isin: ISIN of note
+        :param raw: Return raw details in JSON if set to True, or returns pandas dataframe of details if set to False
+        :param typed: Return a dataframe with typed columns instead of filling missing values with "N/A"
+        (See get_investments)
+        :param cash_flows: Return a long dataframe with a row per payment component instead, with the isin, loan, date,
+        component, scheduled and received columns (See Utils.note_cash_flows)
+        :return: Schedule of all the loans in the Note
+        """
+
+        with CallTimer('get_note_schedule', self.hooks) as timer:
+            with timer.stage('fetch'):
+                response = self._request(
+                    method='GET',
+                    url=f'{ENDPOINTS.API_NOTES_DETAILS_URI}/{isin}/payment-schedule',
+                    timer=timer,
+                )
+
+            return self._note_schedule_result(response, isin, raw, timer, typed, cash_flows)
+
+    def get_note_schedules(
+            self,
+            isins: List[str],
+            raw: bool = False,
+            max_workers: int = None,
+            typed: bool = False,
+            cash_flows: bool = False,
+    ) -> Union['pd.DataFrame', BulkResult]:
+        """
+        Gets the schedules of many Notes at the same time. A Note whose schedule can't be fetched doesn't stop the
+        others, its error is reported instead (Under the "errors" attribute of the dataframe, mapping ISIN to error).
+        :param isins: ISINs of notes (Duplicates are only fetched once)
+        :param raw: Return raw schedules in JSON by ISIN if set to True (Failed ISINs are under its "errors" attribute,
+        mapped to their exception), or returns a single pandas dataframe of every schedule if set to False
+        :param max_workers: Maximum number of schedules fetched at the same time (CONSTANTS.MAX_WORKERS by default)
+        :param typed: Return a dataframe with typed columns instead of filling missing values with "N/A"
+        (See get_investments)
+        :param cash_flows: Return a long dataframe with a row per payment component instead (See get_note_schedule)
+        :return: Schedules of all the loans in the Notes, indexed by ISIN and loan identifier
+        """
+
+        with CallTimer('get_note_schedules', self.hooks) as timer:
+            return self._map_bulk(
+                func=lambda isin: self._fetch_note_schedule(isin, timer),
+                keys=isins,
+                max_workers=max_workers,
+                timer=timer,
+                raw=raw,
+                parse=lambda schedule: [Utils.parse_mintos_items(item) for item in schedule],
+                frame=lambda schedules: self._note_schedules_frame(schedules, timer, typed, cash_flows),
+            )
+
+    def get_claim_details(self, claim_id: str, cached: bool = True, finished: bool = False) -> dict:
+        """
+        :param claim_id: ID of claim
+        :param cached: Set to False to skip the local cache of finished claims and always fetch the details from Mintos
+        :param finished: Set to True if the claim has finished, e.g. it's one of
+        get_investments(claims=True, current=False), so its details, which don't change anymore, are kept in the local
+        cache and only fetched from Mintos once
+        :return: Claim details provided by Mintos
+        """
+
+        with CallTimer('get_claim_details', self.hooks) as timer:
+            with timer.stage('fetch'):
+                cached_details = self._cached_claim_details(finished, cached)
+
+                if str(claim_id) in cached_details:
+                    response = cached_details[str(claim_id)]
+
+                else:
+                    response = self._fetch_claim_details(claim_id, timer)
+
+                    if finished:
+                        self._cache_claim_details({claim_id: response})
+
+            return self._claim_details_result(response, claim_id, timer)
+
+    def get_claims_details(
+            self,
+            claim_ids: List[str],
+            raw: bool = False,
+            max_workers: int = None,
+            typed: bool = False,
+            cached: bool = True,
+            finished: bool = False,
+    ) -> Union['pd.DataFrame', BulkResult]:
+        """
+        Gets the details of many claims at the same time. A claim whose details can't be fetched doesn't stop the
+        others, its error is reported instead (Under the "errors" attribute of the dataframe, mapping ID to error).
+        :param claim_ids: IDs of claims (Duplicates are only fetched once)
+        :param raw: Return raw details in JSON by ID if set to True (Failed IDs are under its "errors" attribute,
+        mapped to their exception), or returns a single pandas dataframe of every claim's details if set to False
+        :param max_workers: Maximum number of details fetched at the same time (CONSTANTS.MAX_WORKERS by default)
+        :param typed: Return a dataframe with typed columns instead of filling missing values with "N/A"
+        (See get_investments)
+        :param cached: Set to False to skip the local cache of finished claims and always fetch the details from Mintos
+        :param finished: Set to True if the claims have finished (See get_claim_details)
+        :return: Claim details provided by Mintos, indexed by claim ID
+        """
+
+        with CallTimer('get_claims_details', self.hooks) as timer:
+            with timer.stage('fetch'):
+                cached_details = self._cached_claim_details(finished, cached)
+
+                details, errors = self._map_concurrently(
+                    func=lambda claim_id: self._fetch_claim_details(claim_id, timer),
+                    keys=[claim_id for claim_id in claim_ids if str(claim_id) not in cached_details],
+                    max_workers=max_workers,
+                )
+
+                if finished and details:
+                    self._cache_claim_details(details)
+
+            return self._bulk_result(
+                results=self._ordered_claim_details(claim_ids, cached_details, details),
+                errors=errors,
+                timer=timer,
+                raw=raw,
+                parse=Utils.parse_mintos_items,
+                frame=lambda results: self._claims_details_frame(results, timer, typed),
+            )
+
+    def export_investments(
+            self,
+            export: 'ArrowExport',
+            currencies: List[Currency],
+            claims: bool = False,
+            current: bool = None,
+            quantity: int = None,
+            **filters,
+    ) -> int:
+        """
+        Writes investments to an Arrow table or a Parquet dataset page by page as they arrive, partitioned by currency
+        and by portfolio (current or finished), instead of building a dataframe of every investment first.
+        :param export: Where to write the investments (TableExport or ParquetExport from mintospy.export)
+        :param currencies: Currencies that investments are denominated in
+        :param claims: Specify whether to export Notes or Claims (True -> Exports claims; False -> Exports notes)
+        :param current: Only export current investments if set to True, or finished investments if set to False
+        (Exports both by default)
+        :param quantity: Maximum quantity of investments to export per partition (Exports every investment by default)
+        :param filters: Any filter or sorting argument accepted by get_investments (sort_field, countries, etc.)
+        :return: Quantity of investments exported
+        """
+
+        exported = 0
+
+        with CallTimer('export_investments', self.hooks) as timer:
+            for currency in currencies:
+                for is_current in ([True, False] if current is None else [current]):
+                    pages = self.iter_investments(
+                        currency=currency,
+                        quantity=quantity,
+                        claims=claims,
+                        current=is_current,
+                        frames=True,
+                        raw=True,
+                        **filters,
+                    )
+
+                    partition = {'currency': currency, 'portfolio': 'current' if is_current else 'finished'}
+
+                    for items in pages:
+                        investments_df = self._investments_frame(items, claims, timer, typed=True)
+
+                        with timer.stage('export'):
+                            exported += export.write(investments_df, partition)
+
+        return exported
+
+    def export_loans(
+            self,
+            export: 'ArrowExport',
+            currencies: List[Currency],
+            quantity: int = None,
+            secondary_market: bool = False,
+            **filters,
+    ) -> int:
+        """
+        Writes loans to an Arrow table or a Parquet dataset page by page as they arrive, partitioned by currency,
+        instead of building a dataframe of every loan first.
+        :param export: Where to write the loans (TableExport or ParquetExport from mintospy.export)
+        :param currencies: Currencies that loans are denominated in
+        :param quantity: Maximum quantity of loans to export per currency (Exports every loan by default)
+        :param secondary_market: If True, loans will be retrieved from the secondary market, else from the primary
+        :param filters: Any filter or sorting argument accepted by get_loans (sort_field, countries, etc.)
+        :return: Quantity of loans exported
+        """
+
+        exported = 0
+
+        with CallTimer('export_loans', self.hooks) as timer:
+            for currency in currencies:
+                pages = self.iter_loans(
+                    currencies=[currency],
+                    quantity=quantity,
+                    secondary_market=secondary_market,
+                    frames=True,
+                    raw=True,
+                    **filters,
+                )
+
+                for items in pages:
+                    loans_df = self._loans_frame(items, timer, typed=True)
+
+                    with timer.stage('export'):
+                        exported += export.write(loans_df, {'currency': currency})
+
+        return exported
+
+    def export_note_schedules(
+            self,
+            export: 'ArrowExport',
+            isins: List[str],
+            max_workers: int = None,
+    ) -> Dict[str, Exception]:
+        """
+        Writes the schedules of many Notes to an Arrow table or a Parquet dataset, partitioned by currency.
+        Schedules are fetched and written in batches of CONSTANTS.MAX_RESULTS Notes, so only one batch is in memory at
+        a time. A Note whose schedule can't be fetched doesn't stop the others.
+        :param export: Where to write the schedules (TableExport or ParquetExport from mintospy.export)
+        :param isins: ISINs of notes (Duplicates are only exported once)
+        :param max_workers: Maximum number of schedules fetched at the same time (CONSTANTS.MAX_WORKERS by default)
+        :return: Errors of the Notes whose schedules couldn't be exported, mapped by ISIN
+        """
+
+        isins, errors = list(dict.fromkeys(isins)), {}
+
+        with CallTimer('export_note_schedules', self.hooks) as timer:
+            for start in range(0, len(isins), CONSTANTS.MAX_RESULTS):
+                with timer.stage('fetch'):
+                    schedules, batch_errors = self._map_concurrently(
+                        func=lambda isin: self._fetch_note_schedule(isin, timer),
+                        keys=isins[start:start + CONSTANTS.MAX_RESULTS],
+                        max_workers=max_workers,
+                    )
+
+                errors.update(batch_errors)
+
+                schedule_df = self._note_schedules_frame(schedules, timer, typed=True)
+
+                if len(schedule_df) == 0:
+                    continue
+
+                with timer.stage('export'):
+                    for currency, currency_df in schedule_df.groupby('currency', observed=True, sort=False):
+                        export.write(currency_df, {'currency': currency})
+
+        return errors
+
+    def keep_alive(self, interval: float = None) -> 'SessionKeeper':
+        """
+        Starts keeping the session alive from a background thread (See SessionKeeper).
+        :param interval: Seconds between checks of the session (CONSTANTS.SESSION_REFRESH_SECONDS by default)
+        :return: Started session keeper (Stop it, or use it as a context manager, to stop checking)
+        """
+
+        from mintospy.session import SessionKeeper
+
+        return SessionKeeper(self, interval).start()
+
+    def refresh_session(self) -> bool:
+        """
+        Checks the session with a cheap authenticated request. If it's still valid, its CSRF token and expiry are
+        renewed, otherwise a new session is logged in to and swapped in (See reauthenticate).
+        :return: True if the session was still valid, False if a new one had to be logged in to
+        """
+
+        with self._session_lock:
+            self._ensure_session()
+
+            if self._session_valid():
+                self.session_expiry = time.time() + CONSTANTS.SESSION_EXPIRY_SECONDS
+
+                self._renew_csrf_token()
+
+                return True
+
+            self._reauthenticate()
+
+            return False
+
+    def reauthenticate(self) -> None:
+        """
+        Logs in to a new session with the browser and swaps it into the client in a single assignment, so calls
+        already running finish with the old session and every later call uses the new one.
+        """
+
+        with self._session_lock:
+            self._reauthenticate()
+
+    def login(self, timer: CallTimer = None) -> None:
+        """
+        Logs in to Mintos Marketplace via headless Chromium browser
+        :param timer: Timer of the login, timing the page_load, credentials, recaptcha, totp and overview phases
+        """
+
+        _import_browser()
+
+        from selenium.common.exceptions import TimeoutException
+
+        timer = timer or CallTimer()
+
+        elements = CONSTANTS.LOGIN_ELEMENTS
+
+        with timer.stage('page_load'):
+            self.driver.get(ENDPOINTS.LOGIN_URI)
+
+            element = self._wait_for_any(['username', 'overview', 'maintenance'], timeout=10)
+
+        if element == 'maintenance':
+            raise MintosException("Mintos' system is currently being updated. Try again later.")
+
+        # The session of a browser profile may still be valid, in which case Mintos goes straight to the overview
+        if element == 'username':
+            with timer.stage('credentials'):
+                self.driver.find_element(*elements['username']).send_keys(self.email)
+                self.driver.find_element(*elements['password']).send_keys(self.password)
+                self.driver.find_element(*elements['submit']).click()
+
+            with timer.stage('recaptcha'):
+                self._pass_recaptcha(
+                    error='login_error',
+                    error_message='Invalid username or password',
+                    exception=ValueError('Invalid username or password.'),
+                    next_element='tfa_label' if self.tfa_secret else 'overview',
+                )
+
+            if self.tfa_secret is not None:
+                with timer.stage('totp'):
+                    self._wait_for_element(*elements['tfa_label'], timeout=20)
+
+                    self._wait_for_element(*elements['tfa_code'], timeout=5).send_keys(self._gen_totp())
+
+                    self.driver.find_element(*elements['submit']).click()
+
+                with timer.stage('recaptcha'):
+                    self._pass_recaptcha(
+                        error='tfa_error',
+                        error_message='Invalid two-factor code',
+                        exception=ValueError('Invalid TFA secret.'),
+                        next_element='overview',
+                    )
+
+        with timer.stage('overview'):
+            try:
+                # Wait for overview page to be displayed to mark the end of the login process
+                self._wait_for_element(*elements['overview'], timeout=CONSTANTS.LOGIN_TIMEOUT_SECONDS)
+
+            except TimeoutException:
+                raise MintosException('Your account could not be fetched - Check your internet connection.')
+
+        self._save_cookies()
+
+        self.driver.quit()
+
+    def _pass_recaptcha(self, error: str, error_message: str, exception: Exception, next_element: str) -> None:
+        """
+        Waits for the outcome of a submitted login form, solving the ReCAPTCHA challenge if one appears.
+        :param error: Login element that shows the form's errors (See CONSTANTS.LOGIN_ELEMENTS)
+        :param error_message: Error that means the form was filled out wrongly
+        :param exception: Exception to raise if it was
+        :param next_element: Login element that shows the form was accepted
+        :raises TimeoutException: If neither the error nor the next element appear in time
+        """
+
+        element = self._wait_for_any(['recaptcha', error, next_element], timeout=CONSTANTS.LOGIN_TIMEOUT_SECONDS)
+
+        if element == 'recaptcha':
+            self.solver.solve_recaptcha_v2_challenge(
+                iframe=self.driver.find_element(*CONSTANTS.LOGIN_ELEMENTS['recaptcha']),
+            )
+
+            element = self._wait_for_any([error, next_element], timeout=CONSTANTS.LOGIN_TIMEOUT_SECONDS)
+
+        if element == error:
+            message = self.driver.find_element(*CONSTANTS.LOGIN_ELEMENTS[error]).text.strip()
+
+            if message.lower() == error_message.lower():
+                raise exception
+
+    def _use_session(self, cookies: dict, csrf_token: str = None, expiry: float = None) -> None:
+        """
+        Sets the cookies and CSRF token of an existing session on the cloudscraper instance.
+        :param cookies: Cookies of the session
+        :param csrf_token: CSRF token of the session (Fetched when the session is started if not known)
+        :param expiry: Unix timestamp the session expires at (Known sessions keep the expiry they were stored with)
+        """
+
+        self.cookies = cookies
+
+        for name, value in cookies.items():
+            self.scraper.cookies.set(name, value)
+
+        if expiry is not None:
+            self.session_expiry = expiry
+
+        if csrf_token is not None:
+            self.csrf_token = csrf_token
+
+            self.scraper.headers.update({'anti-csrf-token': csrf_token})
+
+    def _ensure_session(self) -> None:
+        """
+        Starts the session before the first request: logs in with the browser if there are no cookies (Unless another
+        client of the account logged in meanwhile, see SessionVault), and fetches the CSRF token if it isn't known.
+        """
+
+        if self._session_started:
+            return
+
+        with self._session_lock:
+            if self._session_started:
+                return
+
+            if self.cookies is None:
+                with self.vault.lock():
+                    # Another client may have logged in since this one was created
+                    session = self.vault.load()
+
+                    if session is not None:
+                        self._use_session(session['cookies'], session['csrf_token'], session['expiry'])
+
+                    else:
+                        self._browser_login()
+
+                        # Fetched while holding the lock, so the clients waiting for it get the token as well
+                        self._renew_csrf_token()
+
+            if self.csrf_token is None:
+                self._renew_csrf_token()
+
+            self._session_started = True
+
+    def _renew_csrf_token(self) -> None:
+        """
+        Fetches a CSRF token for the session and saves it together with the cookies.
+        """
+
+        self.csrf_token = self._get_csrf_token()
+
+        self.scraper.headers.update({'anti-csrf-token': self.csrf_token})
+
+        self._write_cookies()
+
+    def _browser_login(self) -> None:
+        """
+        Logs in with a headless browser and sets the cookies of the new session on the cloudscraper instance.
+        """
+
+        # The browser stack is only needed (and imported) when there are no cookies to authenticate with
+        _import_browser()
+
+        from selenium_recaptcha_solver import RecaptchaSolver
+        from selenium.common.exceptions import TimeoutException
+
+        with CallTimer('login', self.hooks) as timer:
+            with timer.stage('driver'):
+                # Initialise web driver session
+                self.driver = self._create_driver(profile=self.browser_profile, block_resources=self.fast_login)
+
+                # Initialise RecaptchaV2 solver object
+                self.solver = RecaptchaSolver(driver=self.driver)
+
+            try:
+                # Automatically authenticate to Mintos API upon API object initialization
+                self.login(timer)
+
+            except TimeoutException:
+                raise MintosException('Check your network connection.')
+
+            finally:
+                self.login_timings = dict(timer.durations)
+
+    def _save_cookies(self) -> None:
+        """
+        Saves cookies from web driver and sets them on cloudscraper instance.
+        In the event of no web driver, saves the cloudscraper instance's cookies.
+        """
+
+        self.cookies = self.driver.get_cookies()
+
+        for cookie in self.cookies:
+            self.scraper.cookies.set(cookie['name'], cookie['value'])
+
+        self._write_cookies()
+
+    def _write_cookies(self) -> None:
+        """
+        Saves the cloudscraper instance's cookies and CSRF token to the session vault, valid until the session expires.
+        """
+
+        if not self.should_save or self.vault is None:
+            return
+
+        self.vault.save(self.scraper.cookies.get_dict(), self.csrf_token, self.session_expiry)
+
+    def _session_valid(self) -> bool:
+        """
+        :return: False if Mintos rejects the session, True otherwise (Including when Mintos can't be reached)
+        """
+
+        self.throttle.acquire()
+
+        throttled, retry_after = None, None
+
+        try:
+            response = self.scraper.get(
+                url=ENDPOINTS.API_INVESTMENTS_FILTER_URI,
+                params={'status': 0},
+                timeout=CONSTANTS.REQUEST_TIMEOUT_SECONDS,
+            )
+
+            throttled = Throttle.is_throttled(response.status_code, response.headers)
+
+            retry_after = Throttle.retry_after(response.headers) if throttled else None
+
+        except requests.exceptions.RequestException:
+            return True
+
+        finally:
+            self.throttle.release(throttled, retry_after)
+
+        return response.status_code != 401
+
+    def _reauthenticate(self) -> None:
+        """
+        See reauthenticate (Must be called while holding the session lock).
+        :raises MintosException: If the client has no credentials to log in with
+        """
+
+        client = self._login_session()
+
+        # Requests read self.scraper once, so swapping it is atomic for them
+        self.scraper = client.scraper
+
+        self.csrf_token = client.csrf_token
+        self.cookies = client.scraper.cookies.get_dict()
+        self.session_expiry = client.session_expiry
+
+        # Responses of the old session aren't served to the new one
+        if self.response_cache is not None:
+            self.response_cache.invalidate(namespace=self._cache_namespace)
+
+        self._write_cookies()
+
+    def _login_session(self) -> 'MintosApi':
+        """
+        Logs in with the browser on a separate client, leaving this client's session untouched meanwhile.
+        :return: Client of the new session, with its CSRF token and expiry set (Those stored with it if another client
+        of the account logged in again first, so reusing its session sends no request)
+        :raises MintosException: If the client has no credentials to log in with
+        """
+
+        if self.email is None or self.password is None:
+            raise MintosException('The session expired, and the client has no email and password to log in again.')
+
+        cookies = self.scraper.cookies.get_dict()
+
+        with self.vault.lock():
+            session = self.vault.load()
+
+            # Another client of the account may already have logged in again, the stored session is only replaced
+            # when it's still the expired one
+            if session is not None and session['cookies'] != cookies:
+                client = MintosApi(
+                    email=self.email,
+                    cookies=session['cookies'],
+                    hooks=self.hooks,
+                    throttle=self.throttle,
+                )
+
+                client._use_session(session['cookies'], session['csrf_token'], session['expiry'])
+
+            else:
+                self.vault.clear()
+
+                client = MintosApi(
+                    email=self.email,
+                    password=self.password,
+                    tfa_secret=self.tfa_secret,
+                    save_cookies=self.should_save,
+                    hooks=self.hooks,
+                    throttle=self.throttle,
+                    fast_login=self.fast_login,
+                    browser_profile=self.browser_profile,
+                )
+
+            client._ensure_session()
+
+        return client
+
+    def _gen_totp(self) -> str:
+        """
+        :return: TOTP used for Mintos TFA
+        """
+
+        _import_browser()
+
+        import pyotp
+
+        return pyotp.TOTP(self.tfa_secret).now()
+
+    def _wait_for_element(
+            self,
+            tag: str,
+            locator: str,
+            timeout: int,
+            multiple: bool = False,
+    ) -> Union['WebElement', List['WebElement']]:
+        """
+        :param tag: Tag to get element by (id, class name, xpath, tag name, etc.)
+        :param locator: Value of the tag (Example: tag -> id, locator -> button-id)
+        :param timeout: Time to wait for element before raising TimeoutError
+        :param multiple: Specify whether to return multiple web elements that match tag and locator
+        :return: Web element specified by tag and locator
+        :raises TimeoutException: If the element is not located within the desired time span
+        """
+
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as ec
+
+        element_attributes = (tag, locator)
+
+        WebDriverWait(self.driver, timeout).until(ec.visibility_of_element_located(element_attributes))
+
+        if multiple:
+            return self.driver.find_elements(by=tag, value=locator)
+
+        return self.driver.find_element(by=tag, value=locator)
+
+    def _wait_for_any(self, names: List[str], timeout: int) -> str:
+        """
+        :param names: Login elements to wait for (See CONSTANTS.LOGIN_ELEMENTS)
+        :param timeout: Time to wait for any of them before raising TimeoutError
+        :return: Name of the first element that's displayed
+        :raises TimeoutException: If none of the elements is displayed within the desired time span
+        """
+
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.common.exceptions import StaleElementReferenceException
+
+        def displayed(driver: 'webdriver.Chrome') -> Union[str, bool]:
+            for name in names:
+                if any(element.is_displayed() for element in driver.find_elements(*CONSTANTS.LOGIN_ELEMENTS[name])):
+                    return name
+
+            return False
+
+        wait = WebDriverWait(
+            driver=self.driver,
+            timeout=timeout,
+            poll_frequency=0.1,
+            ignored_exceptions=[StaleElementReferenceException],
+        )
+
+        return wait.until(displayed)
+
+    def _get_csrf_token(self) -> str:
+        """
+        :return: CSRF token of the session, read from the web app page (Which is only read up to the token)
+        :raises ValueError: If the page has no CSRF token
+        """
+
+        csrf_token = self._request(
+            method='GET',
+            url=ENDPOINTS.WEB_APP_URI,
+            read=Utils.read_csrf_token,
+            authenticate=False,
+        )
+
+        if not isinstance(csrf_token, str):
+            raise ValueError('Failed to extract CSRF token.')
+
+        return csrf_token
+
+    def _js_click(self, element: 'WebElement') -> None:
+        """
+        :param element: Web element to perform click on via JavaScript
+        """
+
+        self.driver.execute_script('arguments[0].click();', element)
+
+    def _fetch_claim_details(self, claim_id: str, timer: CallTimer = None) -> dict:
+        """
+        :param claim_id: ID of claim
+        :param timer: Timer of the call the details are fetched for
+        :return: Raw details of the claim
+        """
+
+        response = self._request(
+            method='GET',
+            url=f'{ENDPOINTS.API_CLAIMS_DETAILS_URI}/{claim_id}/summary',
+            timer=timer,
+        )
+
+        return self._claim_details_response(response, claim_id)
+
+    def _cached_claim_details(self, finished: bool, cached: bool) -> Dict[str, dict]:
+        """
+        :param finished: Whether the claims have finished (Only finished claims are cached)
+        :param cached: Set to False to skip the local cache
+        :return: Raw details of the finished claims in the local cache, mapped by claim ID (As a string)
+        """
+
+        if not finished or not cached:
+            return {}
+
+        return CONSTANTS.CACHE.get_items(f'claim_details_{self._account_key()}')
+
+    def _cache_claim_details(self, details: Dict[str, dict]) -> None:
+        """
+        :param details: Raw details of finished claims, mapped by claim ID
+        """
+
+        CONSTANTS.CACHE.set_items(
+            key=f'claim_details_{self._account_key()}',
+            items={str(claim_id): response for claim_id, response in details.items()},
+            ttl=CONSTANTS.FINISHED_CLAIM_TTL_SECONDS,
+        )
+
+    def _fetch_note_loans(self, isin: str, timer: CallTimer = None) -> List[dict]:
+        """
+        :param isin: ISIN of note
+        :param timer: Timer of the call the loans are fetched for
+        :return: Raw loans of the Note
+        :raises ValueError: If Mintos didn't return the Note's loans
+        """
+
+        response = self._request(
+            method='GET',
+            url=f'{ENDPOINTS.API_NOTES_DETAILS_URI}/{isin}/loans',
+            timer=timer,
+        )
+
+        return self._response_items(response, 'items', f'loans for Note with ISIN of {isin}')
+
+    def _fetch_note_schedule(self, isin: str, timer: CallTimer = None) -> List[dict]:
+        """
+        :param isin: ISIN of note
+        :param timer: Timer of the call the schedule is fetched for
+        :return: Raw payment schedule items of the Note
+        :raises ValueError: If Mintos didn't return the Note's schedule
+        """
+
+        response = self._request(
+            method='GET',
+            url=f'{ENDPOINTS.API_NOTES_DETAILS_URI}/{isin}/payment-schedule',
+            timer=timer,
+        )
+
+        return self._response_items(response, 'paymentSchedule', f'loan schedules for Note with ISIN of {isin}')
+
+    def _fetch_pages(
+            self,
+            queries: List[dict],
+            start_page: int,
+            quantity: int,
+            max_workers: int = None,
+            timer: CallTimer = None,
+            checkpoint: Checkpoint = None,
+    ) -> List[List[dict]]:
+        """
+        Fetches the first page of every query, then every remaining page of all queries concurrently.
+        :param queries: Keyword arguments of each paginated POST request (Query under "json" or "data")
+        :param start_page: Page to start fetching each query from
+        :param quantity: Quantity of items to fetch for each query
+        :param max_workers: Maximum number of pages fetched at the same time (CONSTANTS.MAX_WORKERS by default)
+        :param timer: Timer of the call the pages are fetched for
+        :param checkpoint: Checkpoint the pages are saved to, and pages already fetched are taken from
+        :return: Responses of each query, in page order
+        :raises MintosException: If Mintos returns an error for any of the pages
+        """
+
+        checkpoint = checkpoint or Checkpoint(None, queries, start_page, quantity)
+
+        def fetch_page(idx: int, page: int) -> dict:
+            response = checkpoint.get(idx, page)
+
+            if response is None:
+                response = self._post_page(queries[idx], page, timer)
+
+                checkpoint.save(idx, page, response)
+
+            return response
+
+        with ThreadPoolExecutor(max_workers=max_workers or CONSTANTS.MAX_WORKERS) as executor:
+            first_pages = list(executor.map(lambda idx: fetch_page(idx, start_page), range(len(queries))))
+
+            # Once the first page tells us the total, every remaining page is known and can be fetched concurrently
+            remaining = [
+                (idx, page)
+                for idx, response in enumerate(first_pages)
+                for page in self._remaining_pages(response, start_page, quantity)
+            ]
+
+            remaining_pages = executor.map(lambda task: fetch_page(*task), remaining)
+
+            responses = [[response] for response in first_pages]
+
+            for (idx, _), response in zip(remaining, remaining_pages):
+                responses[idx].append(response)
+
+        return responses
+
+    def _iter_pages(
+            self,
+            request_args: dict,
+            start_page: int,
+            quantity: Union[int, None],
+            get_items: Callable[[dict], List[dict]],
+            progress: Callable[[int, int], None] = None,
+            bodies: bool = False,
+    ) -> Iterator[Union[List[dict], bytes]]:
+        """
+        Fetches pages one after another, always requesting the next page before yielding the current one.
+        :param request_args: Keyword arguments of the paginated POST request (Query under "json" or "data")
+        :param start_page: Page to start fetching from
+        :param quantity: Maximum quantity of items to fetch (Fetches every item if None)
+        :param get_items: Function that extracts the items from a page's response
+        :param progress: Called after every page with the quantity of items retrieved so far and expected in total
+        :param bodies: Yield the undecoded body of each page instead of its items (Pages are still decoded to know
+        when to stop, but the body is handed back as it was received)
+        :return: Iterator of the items in each page, or of their bodies
+        """
+
+        executor = ThreadPoolExecutor(max_workers=1)
+
+        try:
+            page = start_page
+
+            future = executor.submit(self._post_page, request_args, page, body=bodies)
+
+            retrieved = 0
+
+            while future is not None:
+                response, content = future.result() if bodies else (future.result(), None)
+
+                items = get_items(response)
+
+                if quantity is not None:
+                    items = items[0:quantity - retrieved]
+
+                retrieved += len(items)
+
+                total = response['pagination']['total'] if isinstance(response, dict) and items else 0
+
+                expected = max(total - (start_page - 1) * CONSTANTS.MAX_RESULTS, 0)
+
+                if quantity is not None:
+                    expected = min(expected, quantity)
+
+                is_last_page = retrieved >= expected or page * CONSTANTS.MAX_RESULTS >= total
+
+                page += 1
+
+                future = None if is_last_page else executor.submit(self._post_page, request_args, page, body=bodies)
+
+                if progress is not None:
+                    progress(retrieved, expected)
+
+                if items:
+                    yield content if bodies else items
+
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def _map_concurrently(
+            func: Callable[[str], any],
+            keys: Iterable[str],
+            max_workers: int = None,
+    ) -> Tuple[Dict[str, any], Dict[str, Exception]]:
+        """
+        :param func: Function to call with each key
+        :param keys: Keys to call the function with (Duplicates are only called once)
+        :param max_workers: Maximum number of calls running at the same time (CONSTANTS.MAX_WORKERS by default)
+        :return: Results of the successful calls and errors of the failed ones, both mapped by key in the keys' order
+        """
+
+        keys = list(dict.fromkeys(keys))
+
+        results, errors = {}, {}
+
+        if not keys:
+            return results, errors
+
+        with ThreadPoolExecutor(max_workers=min(max_workers or CONSTANTS.MAX_WORKERS, len(keys))) as executor:
+            futures = {key: executor.submit(func, key) for key in keys}
+
+            for key, future in futures.items():
+                try:
+                    results[key] = future.result()
+
+                except Exception as e:
+                    errors[key] = e
+
+        return results, errors
+
+    def _map_bulk(
+            self,
+            func: Callable[[any], any],
+            keys: Iterable[any],
+            max_workers: int,
+            timer: CallTimer,
+            raw: bool,
+            frame: Callable[[dict], 'pd.DataFrame'],
+            parse: Callable[[any], any] = None,
+            group: Callable[[dict], dict] = None,
+    ) -> Union['pd.DataFrame', BulkResult]:
+        """
+        Calls a function with many keys at the same time (See _map_concurrently), and builds the result of the call
+        (See _bulk_result).
+        :param func: Function to call with each key
+        :param keys: Keys to call the function with (Duplicates are only called once)
+        :param max_workers: Maximum number of calls running at the same time (CONSTANTS.MAX_WORKERS by default)
+        """
+
+        with timer.stage('fetch'):
+            results, errors = self._map_concurrently(func, keys, max_workers)
+
+        return self._bulk_result(results, errors, timer, raw, frame, parse, group)
+
+    @staticmethod
+    def _bulk_result(
+            results: dict,
+            errors: Dict[any, Exception],
+            timer: CallTimer,
+            raw: bool,
+            frame: Callable[[dict], 'pd.DataFrame'],
+            parse: Callable[[any], any] = None,
+            group: Callable[[dict], dict] = None,
+    ) -> Union['pd.DataFrame', BulkResult]:
+        """
+        :param results: Results of the keys that succeeded
+        :param errors: Errors of the keys that failed
+        :param timer: Timer of the call the results are parsed for
+        :param raw: Return the raw results if set to True, or returns the dataframe built by frame if set to False
+        :param frame: Function that builds the dataframe of the results
+        :param parse: Function that parses each raw result
+        :param group: Function that nests the results and errors mapped by key (Applied to both)
+        :return: Raw results, with the errors under the "errors" attribute, or dataframe of the results, with the
+        messages of the errors under attrs["errors"]
+        """
+
+        group = group or (lambda values: values)
+
+        if raw:
+            with timer.stage('parse'):
+                if parse is not None:
+                    results = {key: parse(result) for key, result in results.items()}
+
+                return BulkResult(group(results), group(errors))
+
+        result_df = frame(results)
+
+        result_df.attrs['errors'] = group({key: str(error) for key, error in errors.items()})
+
+        return result_df
+
+    @staticmethod
+    def _by_currency(values: Dict[Tuple[str, str], any]) -> Dict[str, Dict[str, any]]:
+        """
+        :param values: Values mapped by currency and call
+        :return: Values mapped by currency, then by call
+        """
+
+        grouped = {}
+
+        for (currency, call), value in values.items():
+            grouped.setdefault(currency, {})[call] = value
+
+        return grouped
+
+    def _load_investment_filters(self, current: bool) -> dict:
+        return self._request(
+            method='GET',
+            url=ENDPOINTS.API_INVESTMENTS_FILTER_URI,
+            params={'status': 0 if current else 1},
+        )
+
+    def _load_loan_filters(self) -> dict:
+        return self._request(method='GET', url=ENDPOINTS.API_LOANS_FILTER_URI)
+
+    def _account_key(self) -> str:
+        """
+        :return: Key of the logged-in account for cache entries that differ between accounts (Doesn't expose the email)
+        """
+
+        return hashlib.sha256(str(self.email).encode()).hexdigest()[:16]
+
+    def _request(
+            self,
+            method: str,
+            url: str,
+            page: int = None,
+            timer: CallTimer = None,
+            decode: bool = True,
+            read: Callable[[Iterator[bytes]], any] = None,
+            authenticate: bool = True,
+            body: bool = False,
+            **kwargs,
+    ) -> any:
+        """
+        Sends a request to Mintos (Every request goes through here), retrying it with jittered exponential backoff
+        when the connection fails, Mintos throttles it or answers with a server error, or the body isn't valid JSON.
+        :param method: HTTP method of the request
+        :param url: URL to send the request to
+        :param page: Page requested, if the request is paginated
+        :param timer: Timer of the call the request is made for (JSON decoding time is added to it)
+        :param decode: Decode the response as JSON if set to True, otherwise return its text
+        :param read: Streams the body to this function instead, which returns the result as soon as it has it (The
+        rest of the body is never downloaded)
+        :param authenticate: Start the session first if it isn't yet (See _ensure_session)
+        :param body: Also return the undecoded body of the JSON response, as a (response, body) tuple
+        :param kwargs: Extra arguments for the request (params, json, data, etc.)
+        :return: Decoded JSON response, its text, or what read returned
+        :raises NetworkException: If the request still fails after CONSTANTS.MAX_RETRIES retries
+        """
+
+        if authenticate:
+            self._ensure_session()
+
+        kwargs.setdefault('timeout', CONSTANTS.REQUEST_TIMEOUT_SECONDS)
+
+        if read is not None:
+            decode, kwargs['stream'] = False, True
+
+        if self.response_cache and decode:
+            cache_key = self.response_cache.key(method, url, kwargs, self._cache_namespace)
+
+        else:
+            cache_key = None
+
+        if cache_key is not None:
+            content = self.response_cache.get(cache_key)
+
+            if content is not None:
+                with (timer or CallTimer()).stage('decode'):
+                    response = codec.loads(content)
+
+                return (response, content) if body else response
+
+        for attempt in range(CONSTANTS.MAX_RETRIES + 1):
+            try:
+                return self._send(method, url, page, timer, decode, cache_key, read, body, **kwargs)
+
+            except (RetryableException, requests.exceptions.RequestException, json.decoder.JSONDecodeError) as e:
+                if attempt == CONSTANTS.MAX_RETRIES:
+                    raise NetworkException(
+                        f'{method} {endpoint_of(url)} failed after {attempt + 1} attempts: {e}',
+                    ) from e
+
+                time.sleep(
+                    backoff(
+                        attempt=attempt,
+                        base=CONSTANTS.RETRY_BACKOFF_SECONDS,
+                        cap=CONSTANTS.RETRY_BACKOFF_MAX_SECONDS,
+                        retry_after=getattr(e, 'retry_after', None),
+                    ),
+                )
+
+    def _send(
+            self,
+            method: str,
+            url: str,
+            page: int,
+            timer: CallTimer,
+            decode: bool,
+            cache_key: str = None,
+            read: Callable[[Iterator[bytes]], any] = None,
+            body: bool = False,
+            **kwargs,
+    ) -> any:
+        """
+        Sends a request to Mintos through the scraper once the throttle allows it, and reports it to the hooks.
+        See _request for the arguments.
+        :param cache_key: Key to save the response under in the response cache, if its endpoint is cached
+        :return: Decoded JSON response, its text, or what read returned
+        :raises RetryableException: If Mintos throttled the request or answered with a server error
+        """
+
+        self.throttle.acquire()
+
+        start, throttled, retry_after = time.perf_counter(), None, None
+
+        try:
+            response = self.scraper.request(method, url, **kwargs)
+
+            throttled = Throttle.is_throttled(response.status_code, response.headers)
+
+            retry_after = Throttle.retry_after(response.headers) if throttled else None
+
+        finally:
+            self.throttle.release(throttled, retry_after)
+
+        latency = time.perf_counter() - start
+
+        start = time.perf_counter()
+
+        try:
+            if throttled or response.status_code in CONSTANTS.RETRY_STATUSES:
+                raise RetryableException(f'Mintos answered with {response.status_code}.', retry_after)
+
+            if read is not None:
+                result = read(response.iter_content(chunk_size=CONSTANTS.STREAM_CHUNK_BYTES))
+
+            elif decode:
+                result = codec.loads(response.content)
+
+                if body:
+                    result = (result, response.content)
+
+            else:
+                result = response.text
+
+            if cache_key is not None and response.status_code == 200:
+                self.response_cache.set(cache_key, url, response.content, self._cache_namespace)
+
+            return result
+
+        finally:
+            decode_time = time.perf_counter() - start
+
+            if read is not None:
+                # Only what was read so far was downloaded
+                size = response.raw.tell()
+
+                response.close()
+
+            if timer is not None:
+                timer.add('decode', decode_time)
+
+            if self.hooks:
+                event = RequestEvent(
+                    endpoint=endpoint_of(url),
+                    method=method,
+                    status=response.status_code,
+                    bytes=size if read is not None else len(response.content),
+                    latency=latency,
+                    decode=decode_time,
+                    page=page,
+                )
+
+                emit(self.hooks, 'on_request', event)
+
+    def _post_page(self, request_args: dict, page: int, timer: CallTimer = None, body: bool = False) -> any:
+        """
+        :param request_args: Keyword arguments of the paginated POST request (Query under "json" or "data")
+        :param page: Page to request
+        :param timer: Timer of the call the page is fetched for
+        :param body: Also return the undecoded body of the page, as a (response, body) tuple
+        :return: Response of the requested page
+        :raises MintosException: If Mintos returns an error for the page
+        """
+
+        result = self._request(method='POST', page=page, timer=timer, body=body, **self._with_page(request_args, page))
+
+        response = result[0] if body else result
+
+        if isinstance(response, dict) and response.get('errors'):
+            raise MintosException(response['errors'][0])
+
+        return result
+
+    @staticmethod
+    def _remaining_pages(response: dict, start_page: int, quantity: int) -> range:
+        """
+        :param response: Response of the first requested page
+        :param start_page: Page the first response corresponds to
+        :param quantity: Quantity of items requested in total
+        :return: Pages that still need to be fetched to get the requested quantity
+        """
+
+        last_page = start_page + math.ceil(quantity / CONSTANTS.MAX_RESULTS) - 1
+
+        if last_page <= start_page or not isinstance(response, dict):
+            return range(0)
+
+        total_pages = math.ceil(response['pagination']['total'] / CONSTANTS.MAX_RESULTS)
+
+        return range(start_page + 1, min(last_page, total_pages) + 1)
+
+    @staticmethod
+    def _with_page(request_args: dict, page: int) -> dict:
+        """
+        :param request_args: Keyword arguments of the paginated POST request (Query under "json" or "data")
+        :param page: Page to request
+        :return: Copy of the request arguments pointing to the specified page
+        """
+
+        request_args = copy.deepcopy(request_args)
+
+        params = request_args.get('json', request_args.get('data'))
+
+        if 'pagination' in params:
+            params['pagination']['page'] = page
+
+        else:
+            params['page'] = page
+
+        return request_args
+
+    @staticmethod
+    def _investments_request(
+            currency: Currency,
+            start_page: int = 1,
+            claims: bool = False,
+            sort_field: str = 'invested_amount',
+            countries: List[str] = None,
+            pending_payments: bool = None,
+            amortization_methods: List[str] = None,
+            claim_id: str = None,
+            isin: str = None,
+            late_loan_exposure: List[str] = None,
+            lending_companies: List[str] = None,
+            lender_statuses: List[str] = None,
+            listed_for_sale: bool = None,
+            max_interest_rate: float = None,
+            min_interest_rate: float = None,
+            loan_types: List[str] = None,
+            max_risk_score: float = 10,
+            min_risk_score: float = 0,
+            max_term: int = None,
+            min_term: int = None,
+            max_purchased_date: datetime = None,
+            min_purchased_date: datetime = None,
+            current: bool = True,
+            ascending_sort: bool = False,
+    ) -> dict:
+        """
+        Builds the paginated request used by get_investments (See get_investments for the arguments).
+        :return: Keyword arguments of the POST request for the first page
+        """
+
         currency_iso_code = CONSTANTS.get_currency_iso(currency)
 
         if claims:
@@ -319,17 +2052,6 @@ class MintosApi:
 
             investment_params['minLendingCompanyRiskScore'] = min_risk_score
 
-        if isinstance(strategies, list):
-            available_strategies = list(
-                map(lambda strat: strat['label'], self.get_investment_filters(current)['autoInvestDefinitions'])
-            )
-
-            for strategy in strategies:
-                if strategy not in available_strategies:
-                    raise ValueError(
-                        f'{strategy} must be one of the following strategies: {", ".join(available_strategies)}'
-                    )
-
         if isinstance(isin, str):
             if len(isin) != 12:
                 raise ValueError('ISIN must be 12 characters long.')
@@ -390,8 +2112,6 @@ class MintosApi:
         if isinstance(min_purchased_date, datetime):
             investment_params['investmentDateFrom'] = min_purchased_date.strftime('%d.%m.%Y')
 
-        total_retrieved = 0
-
         request_args = {'url': url}
 
         if claims:
@@ -400,78 +2120,94 @@ class MintosApi:
         else:
             request_args['json'] = investment_params
 
-        response = self.scraper.post(**request_args).json()
-
-        total_retrieved += CONSTANTS.MAX_RESULTS
-
-        responses = [response]
-
-        while total_retrieved < quantity:
-            if response['pagination']['total'] < total_retrieved:
-                break
+        return request_args
+
+    @classmethod
+    def _investments_result(
+            cls,
+            responses: List[dict],
+            quantity: int,
+            claims: bool,
+            raw: bool,
+            timer: CallTimer = None,
+            typed: bool = False,
+    ) -> Union['pd.DataFrame', List[dict]]:
+        """
+        :param responses: Responses of every fetched page, in page order
+        :param quantity: Quantity of investments requested
+        :param claims: Whether the responses contain claims or notes
+        :param raw: Return raw JSON if set to True, or returns pandas dataframe if set to False
+        :param timer: Timer of the call the investments are parsed for
+        :param typed: Return a dataframe with typed columns instead of filling missing values with "N/A"
+        :return: Pandas DataFrame or raw JSON of the investments
+        """
 
-            if response.get('errors'):
-                raise MintosException(response['errors'][0])
+        items = []
 
-            if claims:
-                investment_params['page'] += 1
+        for resp in responses:
+            items.extend(cls._investment_items(resp, claims))
 
-            else:
-                investment_params['pagination']['page'] += 1
+        items = items[0:quantity]
 
-            response = self.scraper.post(**request_args).json()
+        return items if raw else cls._investments_frame(items, claims, timer, typed)
 
-            responses.append(response)
+    @staticmethod
+    def _investment_items(response: dict, claims: bool) -> List[dict]:
+        """
+        :param response: Response of a page of investments
+        :param claims: Whether the response contains claims or notes
+        :return: Investments in the page
+        """
 
-            total_retrieved += CONSTANTS.MAX_RESULTS
+        if len(response) == 0:
+            return []
 
-        items = []
+        try:
+            resp_data, resp_items = response.get('data'), response.get('items')
 
-        for resp in responses:
-            if len(resp) == 0:
-                continue
+        except AttributeError:
+            return []
 
-            try:
-                resp_data, resp_items = resp.get('data'), resp.get('items')
+        if claims and resp_data:
+            return resp_data
 
-            except AttributeError:
-                continue
+        return resp_items or []
 
-            if claims and resp_data:
-                items.extend(resp_data)
+    @staticmethod
+    def _investments_frame(
+            items: List[dict],
+            claims: bool,
+            timer: CallTimer = None,
+            typed: bool = False,
+    ) -> 'pd.DataFrame':
+        """
+        :param items: Raw investments
+        :param claims: Whether the items are claims or notes
+        :param timer: Timer of the call the investments are parsed for
+        :param typed: Return a dataframe with typed columns instead of filling missing values with "N/A"
+        :return: Pandas DataFrame of the parsed investments
+        """
 
-            elif resp_items:
-                items.extend(resp_items)
+        import pandas as pd
 
-        items = items[0:quantity]
+        if len(items) == 0:
+            return pd.DataFrame(items)
 
-        if raw or len(items) == 0:
-            return items if raw else pd.DataFrame(items)
+        timer = timer or CallTimer()
 
         row_index = 'ID' if claims else 'ISIN'
 
-        response = pd.DataFrame.from_records(Utils.parse_investments(items)).set_index(row_index).fillna('N/A')
-
-        return response
-
-    def get_investment_filters(self, current: bool = False) -> dict:
-        """
-        This seems to only work in a sequence of API calls, so it's not recommended to call it alone!
-        :param current: Set to True to get filters for current investments, else set to False
-        :return: Investment filters provided by Mintos
-        """
+        with timer.stage('parse'):
+            investments_df = Utils.parse_investments_frame(items)
 
-        response = self.scraper.get(
-            url=ENDPOINTS.API_INVESTMENTS_FILTER_URI,
-            params={'status': 0 if current else 1},
-        ).json()
+        with timer.stage('frame'):
+            investments_df = investments_df.set_index(row_index)
 
-        return response
+            return Utils.typed_frame(investments_df) if typed else investments_df.fillna('N/A')
 
-    def get_loans(
-            self,
+    @staticmethod
+    def _loans_request(
             currencies: List[Currency],
-            quantity: int = 30,
             start_page: int = 1,
             sort_field: str = 'interest_rate',
             secondary_market: bool = False,
@@ -488,53 +2224,15 @@ class MintosApi:
             loan_types: List[str] = None,
             max_risk_score: float = 10,
             min_risk_score: float = 0,
-            strategies: List[str] = None,
             max_term: int = None,
             min_term: int = None,
             direct_investment_structure: bool = None,
             min_investment_amount: float = None,
-            current: bool = True,
             ascending_sort: bool = False,
-            raw: bool = False,
-    ) -> Union[pd.DataFrame, List[dict]]:
+    ) -> dict:
         """
-        :param currencies: Currencies that investments are denominated in
-        :param quantity: Quantity of investments to get
-        :param start_page: Page to start getting investments from (Gets from first page by default)
-        :param sort_field: Field to sort by (
-        Sort fields:
-        isin -> Sort by Notes' International Securities Identification Number (ISIN) alphabetically;
-        risk_score -> Sort by risk score;
-        lending_company -> Sort by lending company alphabetically;
-        remaining_term -> Sort by remaining term;
-        initial_principal -> Sort by initial principal / remaining;
-        interest_rate -> Sort by interest rate;
-        available_for_investment -> Sort by amount available for investment;
-        )
-        :param secondary_market: If True, loans will be retrieved from the secondary market, else from the primary
-        :param countries: What countries notes should be issued from
-        :param pending_payments: If payments for notes should be pending or not
-        :param amortization_methods: Amortization type of notes (Full, partial, interest-only, or bullet)
-        :param isin: International Securities Identification Number (ISIN) of security to filter by
-        :param late_loan_exposure: Late loan exposure of notes (0_20 for 0-20%, 20_40 for 20-40%, and so on)
-        :param lending_companies: Only return notes issued by specified lending companies
-        :param lender_statuses: Only return notes from lenders in a certain state (Active, suspended, or in default)
-        :param listed_for_sale: Specify whether to return notes that are on sale in the secondary market or not
-        :param max_interest_rate: Only return notes up to this maximum interest rate
-        :param min_interest_rate: Only return notes up to this minimum interest rate
-        :param loan_types: Only return notes composed of certain loan types
-        (agricultural, business, car, invoice_financing, mortgage, pawnbroking, personal, short_term)
-        :param max_risk_score: Only returns notes below this risk score (1-10 or "SW" for notes with suspended rating)
-        :param min_risk_score: Only returns notes above this risk score (1-10 or "SW" for notes with suspended rating)
-        :param strategies: Only return notes that were invested in with certain strategies
-        :param max_term: Only return notes up to a maximum term
-        :param min_term: Only return notes up to a minimum term
-        :param direct_investment_structure: Only returns notes with a direct or indirect structure
-        :param min_investment_amount: Minimum investment amount for a Note
-        :param current: Returns current notes in portfolio if set to true, otherwise returns finished investments
-        :param ascending_sort: Sort notes in ascending order based on "sort" argument if True, otherwise sort descending
-        :param raw: Return raw notes JSON if set to True, or returns pandas dataframe of notes if set to False
-        :return: Pandas DataFrame or raw JSON of notes (Chosen in the "raw" argument)
+        Builds the paginated request used by get_loans (See get_loans for the arguments).
+        :return: Keyword arguments of the POST request for the first page
         """
 
         if sort_field not in CONSTANTS.LOANS_SORT_FIELDS:
@@ -603,17 +2301,6 @@ class MintosApi:
 
             investment_params['minLendingCompanyRiskScore'] = min_risk_score
 
-        if isinstance(strategies, list):
-            available_strategies = list(
-                map(lambda strat: strat['label'], self.get_investment_filters(current)['autoInvestDefinitions'])
-            )
-
-            for strategy in strategies:
-                if strategy not in available_strategies:
-                    raise ValueError(
-                        f'{strategy} must be one of the following strategies: {", ".join(available_strategies)}'
-                    )
-
         if isinstance(isin, str):
             if len(isin) != 12:
                 raise ValueError('ISIN must be 12 characters long.')
@@ -667,309 +2354,408 @@ class MintosApi:
         if isinstance(min_investment_amount, float):
             investment_params['minAmount'] = min_investment_amount
 
-        total_retrieved = 0
+        return {
+            'url': f'{ENDPOINTS.API_LOANS_URI}/{"secondary" if secondary_market else "primary"}',
+            'json': investment_params,
+        }
 
-        response = self.scraper.post(
-            url=f'{ENDPOINTS.API_LOANS_URI}/{"secondary" if secondary_market else "primary"}',
-            json=investment_params,
-        ).json()
+    @staticmethod
+    def _split_currencies(request_args: dict) -> List[dict]:
+        """
+        :param request_args: Keyword arguments of a get_loans request
+        :return: One copy of the request per currency it queries
+        """
 
-        total_retrieved += CONSTANTS.MAX_RESULTS
+        queries = []
 
-        responses = [response]
+        for currency_iso_code in request_args['json']['currencies']:
+            query = copy.deepcopy(request_args)
 
-        while total_retrieved < quantity:
-            if response['pagination']['total'] < total_retrieved:
-                break
+            query['json']['currencies'] = [currency_iso_code]
 
-            if response.get('errors'):
-                raise MintosException(response['errors'][0])
+            queries.append(query)
 
-            investment_params['pagination']['page'] += 1
+        return queries
 
-            loans = self.scraper.post(
-                url=f'{ENDPOINTS.API_LOANS_URI}/{"secondary" if secondary_market else "primary"}',
-                json=investment_params,
-            ).json()
+    @classmethod
+    def _loans_result(
+            cls,
+            responses: List[List[dict]],
+            quantity: int,
+            sorting: dict,
+            raw: bool,
+            timer: CallTimer = None,
+            typed: bool = False,
+    ) -> Union['pd.DataFrame', List[dict]]:
+        """
+        :param responses: Responses of every fetched page of each query, in page order
+        :param quantity: Quantity of loans requested
+        :param sorting: Sorting of the queries, used to merge the results of several queries
+        :param raw: Return raw JSON if set to True, or returns pandas dataframe if set to False
+        :param timer: Timer of the call the loans are parsed for
+        :param typed: Return a dataframe with typed columns instead of filling missing values with "N/A"
+        :return: Pandas DataFrame or raw JSON of the loans
+        """
 
-            responses.append(loans)
+        item_lists = []
 
-            total_retrieved += CONSTANTS.MAX_RESULTS
+        for query_responses in responses:
+            items = []
 
-        items = []
+            for resp in query_responses:
+                items.extend(cls._loan_items(resp))
 
-        for resp in responses:
-            try:
-                items.extend(resp['items'])
+            item_lists.append(items)
 
-            except KeyError:
-                raise MintosException('Mintos had an issue processing the loan retrieval request.')
+        if len(item_lists) == 1:
+            items = item_lists[0]
 
-            except TypeError:
-                pass
+        else:
+            field, kind = CONSTANTS.LOANS_SORT_KEYS[sorting['sortField']]
+
+            # Each currency is already sorted by Mintos, so the pages only need to be merged
+            items = list(
+                heapq.merge(
+                    *item_lists,
+                    key=lambda item: Utils.sort_key(item.get(field), kind),
+                    reverse=sorting['sortOrder'] == 'DESC',
+                ),
+            )
 
         items = items[0:quantity]
 
-        if raw or len(items) == 0:
-            return items if raw else pd.DataFrame(items)
-
-        response = pd.DataFrame.from_records(Utils.parse_investments(items)).set_index('ISIN').fillna('N/A')
+        return items if raw else cls._loans_frame(items, timer, typed)
 
-        return response
-
-    def get_loan_filters(self) -> dict:
+    @staticmethod
+    def _claim_details_response(response: dict, claim_id: str) -> dict:
         """
-        :return: Loan filters provided by Mintos
+        :param response: Response of the claim's summary endpoint
+        :param claim_id: ID of claim
+        :return: Raw details of the claim
+        :raises ValueError: If Mintos didn't return the claim's details
+        :raises MintosException: If Mintos returns an error for the claim
         """
 
-        response = self.scraper.get(
-            url=ENDPOINTS.API_LOANS_FILTER_URI,
-        ).json()
+        if response is None:
+            raise ValueError(f'Could not get details for Claim with ID of {claim_id}.')
+
+        if response.get('errors'):
+            raise MintosException(response['errors'][0])
 
         return response
 
-    def get_note_loans(self, isin: str, raw: bool = False) -> Union[pd.DataFrame, List[dict]]:
+    @staticmethod
+    def _ordered_claim_details(
+            claim_ids: List[str],
+            cached_details: Dict[str, dict],
+            fetched_details: Dict[str, dict],
+    ) -> Dict[str, dict]:
         """
-        :param isin: ISIN of note
-        :param raw: Return raw details in JSON if set to True, or returns pandas dataframe of details if set to False
-        :return: Loans that compose the Note
+        :param claim_ids: IDs of claims, in the order they were requested
+        :param cached_details: Raw details from the local cache, mapped by claim ID (As a string)
+        :param fetched_details: Raw details fetched from Mintos, mapped by claim ID
+        :return: Raw details of every claim that has them, mapped by claim ID in the order they were requested
         """
 
-        response = self.scraper.get(url=f'{ENDPOINTS.API_NOTES_DETAILS_URI}/{isin}/loans').json()
+        details = {}
 
-        if response is None:
-            raise ValueError(f'Could not get loans for Note with ISIN of {isin}.')
+        for claim_id in dict.fromkeys(claim_ids):
+            if str(claim_id) in cached_details:
+                details[claim_id] = cached_details[str(claim_id)]
 
-        response = list(map(lambda item: Utils.parse_mintos_items(item), response.get('items')))
+            elif claim_id in fetched_details:
+                details[claim_id] = fetched_details[claim_id]
 
-        return response if raw else pd.DataFrame(response).set_index('identifier').fillna('N/A')
+        return details
 
-    def get_note_schedule(self, isin: str, raw: bool = False) -> Union[pd.DataFrame, List[dict]]:
+    @staticmethod
+    def _response_items(response: dict, key: str, description: str) -> List[dict]:
         """
-        :param isin: ISIN of note
-        :param raw: Return raw details in JSON if set to True, or returns pandas dataframe of details if set to False
-        :return: Schedule of all the loans in the Note
+        :param response: Response of a Note's details endpoint
+        :param key: Key of the items in the response
+        :param description: Description of the items, for the error
+        :return: Items of the response
+        :raises ValueError: If Mintos didn't return the items (Errors are answered with a body too, just without them)
         """
 
-        response = self.scraper.get(url=f'{ENDPOINTS.API_NOTES_DETAILS_URI}/{isin}/payment-schedule').json()
-
-        if response is None:
-            raise ValueError(f'Could not get loan schedules for Note with ISIN of {isin}.')
+        if response is None or response.get(key) is None:
+            raise ValueError(f'Could not get {description}.')
 
-        response = list(map(lambda item: Utils.parse_mintos_items(item), response.get('paymentSchedule')))
+        return response[key]
 
-        if raw:
-            return response
+    @staticmethod
+    def _loan_items(response: dict) -> List[dict]:
+        """
+        :param response: Response of a page of loans
+        :return: Loans in the page
+        :raises MintosException: If the response doesn't contain any loans
+        """
 
-        df_parsed_response = list(map(lambda item: Utils.parse_note_schedule(item), response))
+        try:
+            return response['items']
 
-        schedule_df = pd.DataFrame(df_parsed_response).set_index('identifier').fillna('N/A')
+        except KeyError:
+            raise MintosException('Mintos had an issue processing the loan retrieval request.')
 
-        return schedule_df
+        except TypeError:
+            return []
 
-    def get_claim_details(self, claim_id: str) -> dict:
+    @staticmethod
+    def _loans_frame(items: List[dict], timer: CallTimer = None, typed: bool = False) -> 'pd.DataFrame':
         """
-        :param claim_id: ID of claim
-        :return: Claim details provided by Mintos
+        :param items: Raw loans
+        :param timer: Timer of the call the loans are parsed for
+        :param typed: Return a dataframe with typed columns instead of filling missing values with "N/A"
+        :return: Pandas DataFrame of the parsed loans
         """
 
-        response = self.scraper.get(url=f'{ENDPOINTS.API_CLAIMS_DETAILS_URI}/{claim_id}/summary').json()
+        import pandas as pd
 
-        if response is None:
-            raise ValueError(f'Could not get details for Claim with ID of {claim_id}.')
+        if len(items) == 0:
+            return pd.DataFrame(items)
 
-        return Utils.parse_mintos_items(response)
+        timer = timer or CallTimer()
 
-    def login(self) -> None:
-        """
-        Logs in to Mintos Marketplace via headless Chromium browser
-        """
+        with timer.stage('parse'):
+            loans_df = Utils.parse_investments_frame(items)
 
-        self.driver.get(ENDPOINTS.LOGIN_URI)
+        with timer.stage('frame'):
+            loans_df = loans_df.set_index('ISIN')
 
-        try:
-            self._wait_for_element(
-                tag='id',
-                locator='login-username',
-                timeout=10,
-            ).send_keys(self.email)
+            return Utils.typed_frame(loans_df) if typed else loans_df.fillna('N/A')
 
-        except TimeoutException:
-            self._wait_for_element(tag='css selector', locator='h1[data-testid="page-title"]', timeout=5)
+    @staticmethod
+    def _note_loans_result(
+            response: dict,
+            isin: str,
+            raw: bool,
+            timer: CallTimer = None,
+            typed: bool = False,
+    ) -> Union['pd.DataFrame', List[dict]]:
+        """
+        :param response: Response of the Note's loans endpoint
+        :param isin: ISIN of note
+        :param raw: Return raw details in JSON if set to True, or returns pandas dataframe of details if set to False
+        :param timer: Timer of the call the loans are parsed for
+        :param typed: Return a dataframe with typed columns instead of filling missing values with "N/A"
+        :return: Loans that compose the Note
+        :raises ValueError: If Mintos didn't return the Note's loans
+        """
 
-            raise MintosException("Mintos' system is currently being updated. Try again later.")
+        if response is None:
+            raise ValueError(f'Could not get loans for Note with ISIN of {isin}.')
 
-        self.driver.find_element(by='id', value='login-password').send_keys(self.password)
+        timer = timer or CallTimer()
 
-        self.driver.find_element(by='xpath', value='//button[@type="submit"]').click()
+        if raw:
+            with timer.stage('parse'):
+                return list(map(lambda item: Utils.parse_mintos_items(item), response.get('items')))
 
-        try:
-            iframe = self._wait_for_element(
-                tag='xpath',
-                locator='//iframe[@title="recaptcha challenge expires in two minutes"]',
-                timeout=2,
-            )
+        with timer.stage('parse'):
+            loans_df = Utils.parse_items_frame(response.get('items'))
 
-            self.solver.solve_recaptcha_v2_challenge(iframe=iframe)
+        with timer.stage('frame'):
+            loans_df = loans_df.set_index('identifier')
 
-        except TimeoutException:
-            pass
+            return Utils.typed_frame(loans_df) if typed else loans_df.fillna('N/A')
 
-        finally:
-            try:
-                error_message = self.driver.find_element(by='class name', value='account-login-error').text.strip()
+    @staticmethod
+    def _note_schedule_result(
+            response: dict,
+            isin: str,
+            raw: bool,
+            timer: CallTimer = None,
+            typed: bool = False,
+            cash_flows: bool = False,
+    ) -> Union['pd.DataFrame', List[dict]]:
+        """
+        :param response: Response of the Note's payment schedule endpoint
+        :param isin: ISIN of note
+        :param raw: Return raw details in JSON if set to True, or returns pandas dataframe of details if set to False
+        :param timer: Timer of the call the schedule is parsed for
+        :param typed: Return a dataframe with typed columns instead of filling missing values with "N/A"
+        :param cash_flows: Return a long dataframe with a row per payment component instead
+        :return: Schedule of all the loans in the Note
+        :raises ValueError: If Mintos didn't return the Note's schedule
+        """
 
-                if error_message == 'Invalid username or password':
-                    raise ValueError('Invalid username or password.')
+        if response is None:
+            raise ValueError(f'Could not get loan schedules for Note with ISIN of {isin}.')
 
-            except selenium.common.exceptions.NoSuchElementException:
-                pass
+        timer = timer or CallTimer()
 
-        if self.tfa_secret is None:
-            try:
-                # Wait for overview page to be displayed to mark the end of the login process
-                self._wait_for_element(
-                    tag='id',
-                    locator='header-wrapper',
-                    timeout=30,
-                )
+        schedule = response.get('paymentSchedule')
 
-            except TimeoutException:
-                raise MintosException('Your account could not be fetched - Check your internet connection.')
+        if raw:
+            with timer.stage('parse'):
+                return list(map(lambda item: Utils.parse_mintos_items(item), schedule))
 
-            return
+        if cash_flows:
+            with timer.stage('frame'):
+                return Utils.note_cash_flows({isin: schedule})
 
-        self._wait_for_element(
-            tag='xpath',
-            locator='//label[text()=" 6-digit code "]',
-            timeout=20,
-        )
+        with timer.stage('parse'):
+            schedule_df = Utils.parse_note_schedule_frame(schedule)
 
-        self._wait_for_element(
-            tag='xpath',
-            locator='//label[normalize-space()="6-digit code"]',
-            timeout=20,
-        )
+        with timer.stage('frame'):
+            schedule_df = schedule_df.set_index('identifier')
 
-        self._wait_for_element(
-            tag='xpath',
-            locator='//input[@type="text"]',
-            timeout=5,
-        ).send_keys(self._gen_totp())
+            return Utils.typed_frame(schedule_df) if typed else schedule_df.fillna('N/A')
 
-        self.driver.find_element(
-            by='xpath',
-            value='//button[@type="submit"]',
-        ).click()
+    @staticmethod
+    def _dashboard_frame(results: Dict[Tuple[str, str], dict], timer: CallTimer = None) -> 'pd.DataFrame':
+        """
+        :param results: Results of the successful calls, mapped by currency and call, in call order
+        :param timer: Timer of the call the dashboard is built for
+        :return: Value and source of every metric, indexed by currency and metric
+        """
 
-        try:
-            loc = '//iframe[@title="recaptcha challenge expires in two minutes"][@style="width: 400px; height: 580px;"]'
+        import pandas as pd
 
-            iframe = self._wait_for_element(
-                tag='xpath',
-                locator=loc,
-                timeout=2,
-            )
+        with (timer or CallTimer()).stage('frame'):
+            rows = [
+                (currency, metric, value, call)
+                for (currency, call), result in results.items()
+                for metric, value in result.items()
+            ]
 
-            self.solver.solve_recaptcha_v2_challenge(iframe=iframe)
+            dashboard_df = pd.DataFrame(rows, columns=['currency', 'metric', 'value', 'source'])
 
-        except TimeoutException:
-            pass
+            return dashboard_df.drop_duplicates(['currency', 'metric']).set_index(['currency', 'metric'])
 
-        finally:
-            try:
-                error_message = self.driver.find_element(by='class name', value='m-u-color-r4--text').text.strip()
+    @staticmethod
+    def _claims_details_frame(
+            details: Dict[str, dict],
+            timer: CallTimer = None,
+            typed: bool = False,
+    ) -> 'pd.DataFrame':
+        """
+        :param details: Raw claim details, mapped by claim ID
+        :param timer: Timer of the call the details are parsed for
+        :param typed: Return a dataframe with typed columns instead of filling missing values with "N/A"
+        :return: Claim details, indexed by claim ID
+        """
 
-                if error_message.lower() == 'invalid two-factor code':
-                    raise ValueError('Invalid TFA secret.')
+        import pandas as pd
 
-            except selenium.common.exceptions.NoSuchElementException:
-                pass
+        timer = timer or CallTimer()
 
-            # Wait for overview page to be displayed to mark the end of the login process
-            self._wait_for_element(
-                tag='id',
-                locator='header-wrapper',
-                timeout=30,
-            )
+        with timer.stage('parse'):
+            details_df = Utils.parse_items_frame(list(details.values()))
 
-        self._save_cookies()
+        with timer.stage('frame'):
+            if len(details) == 0:
+                return pd.DataFrame()
 
-        self.driver.quit()
+            # The requested IDs are kept as they were passed, instead of the parsed (Float) IDs of the details
+            details_df = details_df.drop(columns='id', errors='ignore')
+            details_df.index = pd.Index(list(details), name='id')
 
-    def _save_cookies(self) -> None:
+            return Utils.typed_frame(details_df) if typed else details_df.fillna('N/A')
+
+    @staticmethod
+    def _notes_loans_frame(
+            loans: Dict[str, List[dict]],
+            timer: CallTimer = None,
+            typed: bool = False,
+    ) -> 'pd.DataFrame':
         """
-        Saves cookies from web driver and sets them on cloudscraper instance.
-        In the event of no web driver, saves the cloudscraper instance's cookies.
+        :param loans: Raw loans, mapped by ISIN
+        :param timer: Timer of the call the loans are parsed for
+        :param typed: Return a dataframe with typed columns instead of filling missing values with "N/A"
+        :return: Loans that compose the Notes, indexed by ISIN and loan identifier
         """
 
-        self.cookies = self.driver.get_cookies()
+        import pandas as pd
 
-        for cookie in self.cookies:
-            self.scraper.cookies.set(cookie['name'], cookie['value'])
+        timer = timer or CallTimer()
 
-        if not self.should_save or not self.email:
-            return
+        with timer.stage('parse'):
+            items = [item for note_loans in loans.values() for item in note_loans]
 
-        with open(f'{self.email}_cookies.json', 'w') as f:
-            payload = {
-                    'cookies': self.scraper.cookies.get_dict(),
-                    'expiry': int(time.time() + CONSTANTS.SESSION_EXPIRY_SECONDS),
-                }
+            loans_df = Utils.parse_items_frame(items)
 
-            json.dump(payload, f)
+        with timer.stage('frame'):
+            if len(items) == 0:
+                return pd.DataFrame()
 
-    def _gen_totp(self) -> str:
-        """
-        :return: TOTP used for Mintos TFA
-        """
+            loans_df.insert(0, 'isin', [isin for isin, note_loans in loans.items() for _ in note_loans])
 
-        return pyotp.TOTP(self.tfa_secret).now()
+            loans_df = loans_df.set_index(['isin', 'identifier'])
 
-    def _wait_for_element(
-            self,
-            tag: str,
-            locator: str,
-            timeout: int,
-            multiple: bool = False,
-    ) -> Union[WebElement, List[WebElement]]:
+            return Utils.typed_frame(loans_df) if typed else loans_df.fillna('N/A')
+
+    @staticmethod
+    def _note_schedules_frame(
+            schedules: Dict[str, List[dict]],
+            timer: CallTimer = None,
+            typed: bool = False,
+            cash_flows: bool = False,
+    ) -> 'pd.DataFrame':
         """
-        :param tag: Tag to get element by (id, class name, xpath, tag name, etc.)
-        :param locator: Value of the tag (Example: tag -> id, locator -> button-id)
-        :param timeout: Time to wait for element before raising TimeoutError
-        :param multiple: Specify whether to return multiple web elements that match tag and locator
-        :return: Web element specified by tag and locator
-        :raises TimeoutException: If the element is not located within the desired time span
+        :param schedules: Raw schedules, mapped by ISIN
+        :param timer: Timer of the call the schedules are parsed for
+        :param typed: Return a dataframe with typed columns instead of filling missing values with "N/A"
+        :param cash_flows: Return a long dataframe with a row per payment component instead
+        :return: Schedules of all the loans in the Notes, indexed by ISIN and loan identifier
         """
 
-        element_attributes = (tag, locator)
+        import pandas as pd
 
-        WebDriverWait(self.driver, timeout).until(ec.visibility_of_element_located(element_attributes))
+        timer = timer or CallTimer()
 
-        if multiple:
-            return self.driver.find_elements(by=tag, value=locator)
+        if cash_flows:
+            with timer.stage('frame'):
+                return Utils.note_cash_flows(schedules)
 
-        return self.driver.find_element(by=tag, value=locator)
+        with timer.stage('parse'):
+            items = [item for schedule in schedules.values() for item in schedule]
 
-    def _get_csrf_token(self) -> str:
-        content = self.scraper.get(ENDPOINTS.WEB_APP_URI).text
+            schedule_df = Utils.parse_note_schedule_frame(items)
 
-        parsed_content = BeautifulSoup(content, 'html.parser')
+        with timer.stage('frame'):
+            if len(items) == 0:
+                return pd.DataFrame()
 
-        # Extract CSRF token
-        csrf_token = parsed_content.select('meta[data-hid="csrf-token"]')[0]['content']
+            isins = [isin for isin, schedule in schedules.items() for _ in schedule]
 
-        if not isinstance(csrf_token, str):
-            raise ValueError('Failed to extract CSRF token.')
+            schedule_df.insert(0, 'isin', isins)
 
-        return csrf_token
+            schedule_df = schedule_df.set_index(['isin', 'identifier'])
+
+            return Utils.typed_frame(schedule_df) if typed else schedule_df.fillna('N/A')
 
-    def _js_click(self, element: WebElement) -> None:
+    @staticmethod
+    def _claim_details_result(response: dict, claim_id: str, timer: CallTimer = None) -> dict:
         """
-        :param element: Web element to perform click on via JavaScript
+        :param response: Response of the claim's summary endpoint
+        :param claim_id: ID of claim
+        :param timer: Timer of the call the details are parsed for
+        :return: Claim details provided by Mintos
+        :raises ValueError: If Mintos didn't return the claim's details
         """
 
-        self.driver.execute_script('arguments[0].click();', element)
+        if response is None:
+            raise ValueError(f'Could not get details for Claim with ID of {claim_id}.')
+
+        with (timer or CallTimer()).stage('parse'):
+            return Utils.parse_mintos_items(response)
+
+    @staticmethod
+    def _validate_strategies(strategies: List[str], investment_filters: dict) -> None:
+        """
+        :param strategies: Strategies to validate
+        :param investment_filters: Investment filters provided by Mintos
+        :raises ValueError: If any of the strategies isn't one of the account's strategies
+        """
+
+        available_strategies = list(map(lambda strat: strat['label'], investment_filters['autoInvestDefinitions']))
+
+        for strategy in strategies:
+            if strategy not in available_strategies:
+                raise ValueError(
+                    f'{strategy} must be one of the following strategies: {", ".join(available_strategies)}'
+                )
 
     @staticmethod
     def get_currencies() -> dict:
@@ -984,7 +2770,17 @@ class MintosApi:
         return CONSTANTS.get_lending_companies()
 
     @staticmethod
-    def _create_driver() -> webdriver.Chrome:
+    def _create_driver(profile: str = None, block_resources: bool = False) -> 'webdriver.Chrome':
+        """
+        :param profile: Directory of the browser profile to use (A temporary one by default)
+        :param block_resources: Block the resources in CONSTANTS.LOGIN_BLOCKED_URLS
+        :return: Headless Chrome driver
+        """
+
+        _import_browser()
+
+        import undetected_chromedriver as webdriver
+
         options = webdriver.ChromeOptions()
 
         user_agent = random.choice(CONSTANTS.USER_AGENTS)
@@ -996,7 +2792,11 @@ class MintosApi:
 
         options.add_argument('-no-sandbox')
 
-        driver = webdriver.Chrome(options=options, version_main=110)
+        driver = webdriver.Chrome(options=options, version_main=110, user_data_dir=profile)
+
+        if block_resources:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': CONSTANTS.LOGIN_BLOCKED_URLS})
 
         return driver
 
@@ -0,0 +1,801 @@
+from mintospy.hooks import CallTimer, RequestEvent, endpoint_of, emit
+from mintospy.exceptions import MintosException, NetworkException, RetryableException
+from mintospy.throttle import Throttle, backoff
+from mintospy.checkpoint import Checkpoint
+from mintospy.constants import CONSTANTS
+from mintospy.enums import Currency
+from mintospy.endpoints import ENDPOINTS
+from mintospy.utils import Utils
+from mintospy import codec
+from mintospy.api import MintosApi, BulkResult
+from typing import Union, List, Dict, Tuple, Iterable, Callable, Awaitable, TYPE_CHECKING
+from datetime import datetime
+import asyncio
+import time
+import json
+
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+class AsyncMintosApi:
+    def __init__(
+            self,
+            email: str = None,
+            password: str = None,
+            tfa_secret: str = None,
+            cookies: List[dict] = None,
+            save_cookies: bool = True,
+            client: MintosApi = None,
+            max_connections: int = CONSTANTS.MAX_WORKERS,
+    ):
+        """
+        Asyncio Mintos API wrapper with the same methods as MintosApi, sharing a pool of keep-alive connections.
+        Authentication is done by a MintosApi client (Which logs in on a worker thread before the first request),
+        whose cookies and CSRF token are then reused for every asynchronous request.
+        :param email: Account's email
+        :param password: Account's password
+        :param tfa_secret: Base32 secret used for two-factor authentication
+        :param cookies: Cookies to load in to web driver on boot
+        :param save_cookies: Set to false if you don't want your cookies to be saved locally for faster login
+        :param client: Already authenticated MintosApi client to take the session from (Ignores the arguments above)
+        :param max_connections: Maximum number of connections kept open to Mintos at the same time
+        """
+
+        self.client = client if client else MintosApi(
+            email=email,
+            password=password,
+            tfa_secret=tfa_secret,
+            cookies=cookies,
+            save_cookies=save_cookies,
+        )
+
+        import httpx
+
+        self.max_connections = max_connections
+
+        self.session = httpx.AsyncClient(
+            headers=dict(self.client.scraper.headers),
+            cookies=self.client.scraper.cookies.get_dict(),
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            timeout=CONSTANTS.REQUEST_TIMEOUT_SECONDS,
+        )
+
+        self._scraper = self.client.scraper
+        self._csrf_token = self.client.scraper.headers.get('anti-csrf-token')
+
+    async def __aenter__(self) -> 'AsyncMintosApi':
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """
+        Closes every connection in the pool
+        """
+
+        await self.session.aclose()
+
+    async def get_portfolio_data(self, currency: Currency) -> dict:
+        """
+        :param currency: Currency of portfolio to get data from
+        :return: Active/late funds, bad debt, defaulted debt, funds in recovery, count of active investments, and so on
+        """
+
+        currency_iso_code = await asyncio.to_thread(CONSTANTS.get_currency_iso, currency)
+
+        with CallTimer('get_portfolio_data', self.client.hooks) as timer:
+            with timer.stage('fetch'):
+                response = await self._get(
+                    url=f'{ENDPOINTS.API_PORTFOLIO_URI}/{currency_iso_code}/portfolio-data',
+                    timer=timer,
+                )
+
+            with timer.stage('parse'):
+                return Utils.parse_mintos_items(response)
+
+    async def get_net_annual_return(self, currency: Currency) -> dict:
+        """
+        :param currency: Currency of portfolio to get data from
+        :return: Net annual return of requested portfolio with and without campaign bonuses
+        """
+
+        currency_iso_code = await asyncio.to_thread(CONSTANTS.get_currency_iso, currency)
+
+        with CallTimer('get_net_annual_return', self.client.hooks) as timer:
+            with timer.stage('fetch'):
+                response = await self._get(
+                    url=ENDPOINTS.API_NAR_URI,
+                    params={'currencyIsoCode': currency_iso_code},
+                    timer=timer,
+                )
+
+            with timer.stage('parse'):
+                return Utils.parse_mintos_items(response)
+
+    async def get_aggregates_overview(self, currency: Currency) -> dict:
+        """
+        :param currency: Currency of portfolio to get data from
+        :return: Same data returned by get_portfolio_data, but with outstanding principals and pending payments
+        """
+
+        currency_iso_code = await asyncio.to_thread(CONSTANTS.get_currency_iso, currency)
+
+        with CallTimer('get_aggregates_overview', self.client.hooks) as timer:
+            with timer.stage('fetch'):
+                response = await self._get(
+                    url=ENDPOINTS.API_AGGREGATES_OVERVIEW_URI,
+                    params={'currencyIsoCode': currency_iso_code, 'lenderStatus': 'All'},
+                    timer=timer,
+                )
+
+            with timer.stage('parse'):
+                return Utils.parse_mintos_items(response)
+
+    async def get_dashboard(
+            self,
+            currencies: List[Currency],
+            raw: bool = False,
+            max_workers: int = None,
+    ) -> Union['pd.DataFrame', BulkResult]:
+        """
+        See MintosApi.get_dashboard for the arguments (Every call runs at the same time on the event loop).
+        :return: Value and source of every metric, indexed by currency and metric
+        """
+
+        calls = {
+            'portfolio_data': self.get_portfolio_data,
+            'net_annual_return': self.get_net_annual_return,
+            'aggregates_overview': self.get_aggregates_overview,
+        }
+
+        with CallTimer('get_dashboard', self.client.hooks) as timer:
+            return await self._map_bulk(
+                func=lambda key: calls[key[1]](key[0]),
+                keys=[(currency, call) for currency in currencies for call in calls],
+                max_workers=max_workers,
+                timer=timer,
+                raw=raw,
+                frame=lambda results: MintosApi._dashboard_frame(results, timer),
+                group=MintosApi._by_currency,
+            )
+
+    async def get_investments(
+            self,
+            currency: Currency,
+            quantity: int = 30,
+            start_page: int = 1,
+            claims: bool = False,
+            sort_field: str = 'invested_amount',
+            countries: List[str] = None,
+            pending_payments: bool = None,
+            amortization_methods: List[str] = None,
+            claim_id: str = None,
+            isin: str = None,
+            late_loan_exposure: List[str] = None,
+            lending_companies: List[str] = None,
+            lender_statuses: List[str] = None,
+            listed_for_sale: bool = None,
+            max_interest_rate: float = None,
+            min_interest_rate: float = None,
+            loan_types: List[str] = None,
+            max_risk_score: float = 10,
+            min_risk_score: float = 0,
+            strategies: List[str] = None,
+            max_term: int = None,
+            min_term: int = None,
+            max_purchased_date: datetime = None,
+            min_purchased_date: datetime = None,
+            current: bool = True,
+            ascending_sort: bool = False,
+            raw: bool = False,
+            max_workers: int = None,
+            checkpoint: str = None,
+            typed: bool = False,
+    ) -> Union['pd.DataFrame', List[dict]]:
+        """
+        See MintosApi.get_investments for the arguments.
+        :return: Pandas DataFrame or raw JSON of notes (Chosen in the "raw" argument)
+        """
+
+        if isinstance(strategies, list):
+            MintosApi._validate_strategies(strategies, await self.get_investment_filters(current))
+
+        request_args = await asyncio.to_thread(
+            MintosApi._investments_request,
+            currency=currency,
+            start_page=start_page,
+            claims=claims,
+            sort_field=sort_field,
+            countries=countries,
+            pending_payments=pending_payments,
+            amortization_methods=amortization_methods,
+            claim_id=claim_id,
+            isin=isin,
+            late_loan_exposure=late_loan_exposure,
+            lending_companies=lending_companies,
+            lender_statuses=lender_statuses,
+            listed_for_sale=listed_for_sale,
+            max_interest_rate=max_interest_rate,
+            min_interest_rate=min_interest_rate,
+            loan_types=loan_types,
+            max_risk_score=max_risk_score,
+            min_risk_score=min_risk_score,
+            max_term=max_term,
+            min_term=min_term,
+            max_purchased_date=max_purchased_date,
+            min_purchased_date=min_purchased_date,
+            current=current,
+            ascending_sort=ascending_sort,
+        )
+
+        with CallTimer('get_investments', self.client.hooks) as timer:
+            with timer.stage('fetch'), Checkpoint(checkpoint, [request_args], start_page, quantity) as pages:
+                responses = await self._fetch_pages([request_args], start_page, quantity, max_workers, timer, pages)
+
+            responses = responses[0]
+
+            return MintosApi._investments_result(responses, quantity, claims, raw, timer, typed)
+
+    async def get_investment_filters(self, current: bool = False, cached: bool = True) -> dict:
+        """
+        :param current: Set to True to get filters for current investments, else set to False
+        :param cached: Set to False to skip the local cache and always fetch the filters from Mintos
+        :return: Investment filters provided by Mintos
+        """
+
+        if cached:
+            return await asyncio.to_thread(self.client.get_investment_filters, current)
+
+        return await self._get(url=ENDPOINTS.API_INVESTMENTS_FILTER_URI, params={'status': 0 if current else 1})
+
+    async def get_loans(
+            self,
+            currencies: List[Currency],
+            quantity: int = 30,
+            start_page: int = 1,
+            sort_field: str = 'interest_rate',
+            secondary_market: bool = False,
+            countries: List[str] = None,
+            pending_payments: bool = None,
+            amortization_methods: List[str] = None,
+            isin: str = None,
+            late_loan_exposure: List[str] = None,
+            lending_companies: List[str] = None,
+            lender_statuses: List[str] = None,
+            listed_for_sale: bool = None,
+            max_interest_rate: float = None,
+            min_interest_rate: float = None,
+            loan_types: List[str] = None,
+            max_risk_score: float = 10,
+            min_risk_score: float = 0,
+            strategies: List[str] = None,
+            max_term: int = None,
+            min_term: int = None,
+            direct_investment_structure: bool = None,
+            min_investment_amount: float = None,
+            current: bool = True,
+            ascending_sort: bool = False,
+            raw: bool = False,
+            split_currencies: bool = False,
+            max_workers: int = None,
+            checkpoint: str = None,
+            typed: bool = False,
+    ) -> Union['pd.DataFrame', List[dict]]:
+        """
+        See MintosApi.get_loans for the arguments.
+        :return: Pandas DataFrame or raw JSON of notes (Chosen in the "raw" argument)
+        """
+
+        if isinstance(strategies, list):
+            MintosApi._validate_strategies(strategies, await self.get_investment_filters(current))
+
+        request_args = await asyncio.to_thread(
+            MintosApi._loans_request,
+            currencies=currencies,
+            start_page=start_page,
+            sort_field=sort_field,
+            secondary_market=secondary_market,
+            countries=countries,
+            pending_payments=pending_payments,
+            amortization_methods=amortization_methods,
+            isin=isin,
+            late_loan_exposure=late_loan_exposure,
+            lending_companies=lending_companies,
+            lender_statuses=lender_statuses,
+            listed_for_sale=listed_for_sale,
+            max_interest_rate=max_interest_rate,
+            min_interest_rate=min_interest_rate,
+            loan_types=loan_types,
+            max_risk_score=max_risk_score,
+            min_risk_score=min_risk_score,
+            max_term=max_term,
+            min_term=min_term,
+            direct_investment_structure=direct_investment_structure,
+            min_investment_amount=min_investment_amount,
+            ascending_sort=ascending_sort,
+        )
+
+        queries = MintosApi._split_currencies(request_args) if split_currencies else [request_args]
+
+        with CallTimer('get_loans', self.client.hooks) as timer:
+            with timer.stage('fetch'), Checkpoint(checkpoint, queries, start_page, quantity) as pages:
+                responses = await self._fetch_pages(queries, start_page, quantity, max_workers, timer, pages)
+
+            return MintosApi._loans_result(responses, quantity, request_args['json']['sorting'], raw, timer, typed)
+
+    async def get_loan_filters(self, cached: bool = True) -> dict:
+        """
+        :param cached: Set to False to skip the local cache and always fetch the filters from Mintos
+        :return: Loan filters provided by Mintos
+        """
+
+        if cached:
+            return await asyncio.to_thread(self.client.get_loan_filters)
+
+        return await self._get(url=ENDPOINTS.API_LOANS_FILTER_URI)
+
+    async def get_note_loans(
+            self,
+            isin: str,
+            raw: bool = False,
+            typed: bool = False,
+    ) -> Union['pd.DataFrame', List[dict]]:
+        """
+        :param isin: ISIN of note
+        :param raw: Return raw details in JSON if set to True, or returns pandas dataframe of details if set to False
+        :param typed: Return a dataframe with typed columns instead of filling missing values with "N/A"
+        (See MintosApi.get_investments)
+        :return: Loans that compose the Note
+        """
+
+        with CallTimer('get_note_loans', self.client.hooks) as timer:
+            with timer.stage('fetch'):
+                response = await self._get(url=f'{ENDPOINTS.API_NOTES_DETAILS_URI}/{isin}/loans', timer=timer)
+
+            return MintosApi._note_loans_result(response, isin, raw, timer, typed)
+
+    async def get_notes_loans(
+            self,
+            isins: List[str],
+            raw: bool = False,
+            max_workers: int = None,
+            typed: bool = False,
+    ) -> Union['pd.DataFrame', BulkResult]:
+        """
+        See MintosApi.get_notes_loans for the arguments (Notes are fetched at the same time on the event loop).
+        :return: Loans that compose the Notes, indexed by ISIN and loan identifier
+        """
+
+        with CallTimer('get_notes_loans', self.client.hooks) as timer:
+            return await self._map_bulk(
+                func=lambda isin: self._fetch_note_loans(isin, timer),
+                keys=isins,
+                max_workers=max_workers,
+                timer=timer,
+                raw=raw,
+                parse=lambda items: [Utils.parse_mintos_items(item) for item in items],
+                frame=lambda loans: MintosApi._notes_loans_frame(loans, timer, typed),
+            )
+
+    async def get_note_schedule(
+            self,
+            isin: str,
+            raw: bool = False,
+            typed: bool = False,
+            cash_flows: bool = False,
+    ) -> Union['pd.DataFrame', List[dict]]:
+        """
+        :param isin: ISIN of note
+        :param raw: Return raw details in JSON if set to True, or returns pandas dataframe of details if set to False
+        :param typed: Return a dataframe with typed columns instead of filling missing values with "N/A"
+        (See MintosApi.get_investments)
+        :param cash_flows: Return a long dataframe with a row per payment component instead
+        (See MintosApi.get_note_schedule)
+        :return: Schedule of all the loans in the Note
+        """
+
+        with CallTimer('get_note_schedule', self.client.hooks) as timer:
+            with timer.stage('fetch'):
+                response = await self._get(
+                    url=f'{ENDPOINTS.API_NOTES_DETAILS_URI}/{isin}/payment-schedule',
+                    timer=timer,
+                )
+
+            return MintosApi._note_schedule_result(response, isin, raw, timer, typed, cash_flows)
+
+    async def get_note_schedules(
+            self,
+            isins: List[str],
+            raw: bool = False,
+            max_workers: int = None,
+            typed: bool = False,
+            cash_flows: bool = False,
+    ) -> Union['pd.DataFrame', BulkResult]:
+        """
+        See MintosApi.get_note_schedules for the arguments (Schedules are fetched at the same time on the event loop).
+        :return: Schedules of all the loans in the Notes, indexed by ISIN and loan identifier
+        """
+
+        with CallTimer('get_note_schedules', self.client.hooks) as timer:
+            return await self._map_bulk(
+                func=lambda isin: self._fetch_note_schedule(isin, timer),
+                keys=isins,
+                max_workers=max_workers,
+                timer=timer,
+                raw=raw,
+                parse=lambda schedule: [Utils.parse_mintos_items(item) for item in schedule],
+                frame=lambda schedules: MintosApi._note_schedules_frame(schedules, timer, typed, cash_flows),
+            )
+
+    async def get_claim_details(self, claim_id: str, cached: bool = True, finished: bool = False) -> dict:
+        """
+        See MintosApi.get_claim_details for the arguments.
+        :return: Claim details provided by Mintos
+        """
+
+        with CallTimer('get_claim_details', self.client.hooks) as timer:
+            with timer.stage('fetch'):
+                cached_details = await asyncio.to_thread(self.client._cached_claim_details, finished, cached)
+
+                if str(claim_id) in cached_details:
+                    response = cached_details[str(claim_id)]
+
+                else:
+                    response = await self._fetch_claim_details(claim_id, timer)
+
+                    if finished:
+                        await asyncio.to_thread(self.client._cache_claim_details, {claim_id: response})
+
+            return MintosApi._claim_details_result(response, claim_id, timer)
+
+    async def get_claims_details(
+            self,
+            claim_ids: List[str],
+            raw: bool = False,
+            max_workers: int = None,
+            typed: bool = False,
+            cached: bool = True,
+            finished: bool = False,
+    ) -> Union['pd.DataFrame', BulkResult]:
+        """
+        See MintosApi.get_claims_details for the arguments (Details are fetched at the same time on the event loop).
+        :return: Claim details provided by Mintos, indexed by claim ID
+        """
+
+        with CallTimer('get_claims_details', self.client.hooks) as timer:
+            with timer.stage('fetch'):
+                cached_details = await asyncio.to_thread(self.client._cached_claim_details, finished, cached)
+
+                details, errors = await self._map_concurrently(
+                    func=lambda claim_id: self._fetch_claim_details(claim_id, timer),
+                    keys=[claim_id for claim_id in claim_ids if str(claim_id) not in cached_details],
+                    max_workers=max_workers,
+                )
+
+                if finished and details:
+                    await asyncio.to_thread(self.client._cache_claim_details, details)
+
+            return MintosApi._bulk_result(
+                results=MintosApi._ordered_claim_details(claim_ids, cached_details, details),
+                errors=errors,
+                timer=timer,
+                raw=raw,
+                parse=Utils.parse_mintos_items,
+                frame=lambda results: MintosApi._claims_details_frame(results, timer, typed),
+            )
+
+    async def _fetch_claim_details(self, claim_id: str, timer: CallTimer = None) -> dict:
+        """
+        :param claim_id: ID of claim
+        :param timer: Timer of the call the details are fetched for
+        :return: Raw details of the claim
+        """
+
+        response = await self._get(url=f'{ENDPOINTS.API_CLAIMS_DETAILS_URI}/{claim_id}/summary', timer=timer)
+
+        return MintosApi._claim_details_response(response, claim_id)
+
+    async def _fetch_note_loans(self, isin: str, timer: CallTimer = None) -> List[dict]:
+        """
+        :param isin: ISIN of note
+        :param timer: Timer of the call the loans are fetched for
+        :return: Raw loans of the Note
+        """
+
+        response = await self._get(url=f'{ENDPOINTS.API_NOTES_DETAILS_URI}/{isin}/loans', timer=timer)
+
+        return MintosApi._response_items(response, 'items', f'loans for Note with ISIN of {isin}')
+
+    async def _fetch_note_schedule(self, isin: str, timer: CallTimer = None) -> List[dict]:
+        """
+        :param isin: ISIN of note
+        :param timer: Timer of the call the schedule is fetched for
+        :return: Raw schedule of all the loans in the Note
+        """
+
+        response = await self._get(url=f'{ENDPOINTS.API_NOTES_DETAILS_URI}/{isin}/payment-schedule', timer=timer)
+
+        return MintosApi._response_items(response, 'paymentSchedule', f'loan schedules for Note with ISIN of {isin}')
+
+    async def _map_concurrently(
+            self,
+            func: Callable[[any], Awaitable[any]],
+            keys: Iterable[any],
+            max_workers: int = None,
+    ) -> Tuple[Dict[any, any], Dict[any, Exception]]:
+        """
+        Asynchronous MintosApi._map_concurrently, running the calls on the event loop.
+        :param func: Coroutine function to call with each key
+        :param keys: Keys to call the function with (Duplicates are only called once)
+        :param max_workers: Maximum number of calls running at the same time (max_connections by default)
+        :return: Results of the keys that succeeded and errors of the keys that failed, both mapped by key
+        """
+
+        keys = list(dict.fromkeys(keys))
+
+        semaphore = asyncio.Semaphore(max_workers or self.max_connections)
+
+        async def call(key: any) -> any:
+            async with semaphore:
+                return await func(key)
+
+        outcomes = await asyncio.gather(*(call(key) for key in keys), return_exceptions=True)
+
+        results, errors = {}, {}
+
+        for key, outcome in zip(keys, outcomes):
+            if isinstance(outcome, Exception):
+                errors[key] = outcome
+
+            else:
+                results[key] = outcome
+
+        return results, errors
+
+    async def _map_bulk(
+            self,
+            func: Callable[[any], Awaitable[any]],
+            keys: Iterable[any],
+            max_workers: int,
+            timer: CallTimer,
+            raw: bool,
+            frame: Callable[[dict], 'pd.DataFrame'],
+            parse: Callable[[any], any] = None,
+            group: Callable[[dict], dict] = None,
+    ) -> Union['pd.DataFrame', BulkResult]:
+        """
+        Asynchronous MintosApi._map_bulk (See MintosApi._bulk_result for the arguments).
+        """
+
+        with timer.stage('fetch'):
+            results, errors = await self._map_concurrently(func, keys, max_workers)
+
+        return MintosApi._bulk_result(results, errors, timer, raw, frame, parse, group)
+
+    async def _get(self, url: str, timer: CallTimer = None, **kwargs) -> any:
+        """
+        :param url: URL to send GET request to
+        :param timer: Timer of the call the request is made for
+        :param kwargs: Extra arguments for the request (params, headers, etc.)
+        :return: Decoded JSON response
+        """
+
+        return await self._request(method='GET', url=url, timer=timer, **kwargs)
+
+    async def _request(self, method: str, url: str, page: int = None, timer: CallTimer = None, **kwargs) -> any:
+        """
+        Sends a request through the connection pool, retrying it like MintosApi._request does.
+        :param method: HTTP method of the request
+        :param url: URL to send the request to
+        :param page: Page requested, if the request is paginated
+        :param timer: Timer of the call the request is made for (JSON decoding time is added to it)
+        :param kwargs: Extra arguments for the request (params, json, data, etc.)
+        :return: Decoded JSON response
+        :raises NetworkException: If the request still fails after CONSTANTS.MAX_RETRIES retries
+        """
+
+        import httpx
+
+        if not self.client._session_started:
+            # Logging in or fetching the CSRF token blocks, so it's done outside of the event loop
+            await asyncio.get_running_loop().run_in_executor(None, self.client._ensure_session)
+
+        cache = self.client.response_cache
+
+        cache_key = cache.key(method, url, kwargs, self.client._cache_namespace) if cache else None
+
+        if cache_key is not None:
+            body = cache.get(cache_key)
+
+            if body is not None:
+                with (timer or CallTimer()).stage('decode'):
+                    return codec.loads(body)
+
+        for attempt in range(CONSTANTS.MAX_RETRIES + 1):
+            try:
+                return await self._send(method, url, page, timer, cache_key, **kwargs)
+
+            except (RetryableException, httpx.TransportError, json.decoder.JSONDecodeError) as e:
+                if attempt == CONSTANTS.MAX_RETRIES:
+                    raise NetworkException(
+                        f'{method} {endpoint_of(url)} failed after {attempt + 1} attempts: {e}',
+                    ) from e
+
+                await asyncio.sleep(
+                    backoff(
+                        attempt=attempt,
+                        base=CONSTANTS.RETRY_BACKOFF_SECONDS,
+                        cap=CONSTANTS.RETRY_BACKOFF_MAX_SECONDS,
+                        retry_after=getattr(e, 'retry_after', None),
+                    ),
+                )
+
+    async def _send(
+            self,
+            method: str,
+            url: str,
+            page: int,
+            timer: CallTimer,
+            cache_key: str = None,
+            **kwargs,
+    ) -> any:
+        """
+        Sends a request through the connection pool once the throttle of the client allows it, and reports it to the
+        hooks of the client. See _request for the arguments.
+        :param cache_key: Key to save the response under in the response cache of the client, if its endpoint is cached
+        :return: Decoded JSON response
+        :raises RetryableException: If Mintos throttled the request or answered with a server error
+        """
+
+        self._follow_session()
+
+        await self.client.throttle.acquire_async()
+
+        start, throttled, retry_after = time.perf_counter(), None, None
+
+        try:
+            response = await self.session.request(method, url, **kwargs)
+
+            throttled = Throttle.is_throttled(response.status_code, response.headers)
+
+            retry_after = Throttle.retry_after(response.headers) if throttled else None
+
+        finally:
+            self.client.throttle.release(throttled, retry_after)
+
+        latency = time.perf_counter() - start
+
+        start = time.perf_counter()
+
+        try:
+            if throttled or response.status_code in CONSTANTS.RETRY_STATUSES:
+                raise RetryableException(f'Mintos answered with {response.status_code}.', retry_after)
+
+            result = codec.loads(response.content)
+
+            if cache_key is not None and response.status_code == 200:
+                self.client.response_cache.set(cache_key, url, response.content, self.client._cache_namespace)
+
+            return result
+
+        finally:
+            decode_time = time.perf_counter() - start
+
+            if timer is not None:
+                timer.add('decode', decode_time)
+
+            if self.client.hooks:
+                event = RequestEvent(
+                    endpoint=endpoint_of(url),
+                    method=method,
+                    status=response.status_code,
+                    bytes=len(response.content),
+                    latency=latency,
+                    decode=decode_time,
+                    page=page,
+                )
+
+                emit(self.client.hooks, 'on_request', event)
+
+    def _follow_session(self) -> None:
+        """
+        Takes the session of the client again if it was refreshed or replaced since (See MintosApi.refresh_session).
+        """
+
+        scraper = self.client.scraper
+
+        csrf_token = scraper.headers.get('anti-csrf-token')
+
+        if scraper is self._scraper and csrf_token == self._csrf_token:
+            return
+
+        self.session.headers.update(dict(scraper.headers))
+        self.session.cookies.update(scraper.cookies.get_dict())
+
+        self._scraper, self._csrf_token = scraper, csrf_token
+
+    async def _fetch_pages(
+            self,
+            queries: List[dict],
+            start_page: int,
+            quantity: int,
+            max_workers: int = None,
+            timer: CallTimer = None,
+            checkpoint: Checkpoint = None,
+    ) -> List[List[dict]]:
+        """
+        Fetches the first page of every query, then every remaining page of all queries concurrently.
+        :param queries: Keyword arguments of each paginated POST request (Query under "json" or "data")
+        :param start_page: Page to start fetching each query from
+        :param quantity: Quantity of items to fetch for each query
+        :param max_workers: Maximum number of pages fetched at the same time (Size of the connection pool by default)
+        :param timer: Timer of the call the pages are fetched for
+        :param checkpoint: Checkpoint the pages are saved to, and pages already fetched are taken from
+        :return: Responses of each query, in page order
+        :raises MintosException: If Mintos returns an error for any of the pages
+        """
+
+        checkpoint = checkpoint or Checkpoint(None, queries, start_page, quantity)
+
+        semaphore = asyncio.Semaphore(max_workers or self.max_connections)
+
+        async def fetch_page(idx: int, page: int) -> dict:
+            response = checkpoint.get(idx, page)
+
+            if response is None:
+                async with semaphore:
+                    response = await self._post_page(queries[idx], page, timer)
+
+                checkpoint.save(idx, page, response)
+
+            return response
+
+        first_pages = await asyncio.gather(*(fetch_page(idx, start_page) for idx in range(len(queries))))
+
+        remaining = [
+            (idx, page)
+            for idx, response in enumerate(first_pages)
+            for page in MintosApi._remaining_pages(response, start_page, quantity)
+        ]
+
+        remaining_pages = await asyncio.gather(*(fetch_page(idx, page) for idx, page in remaining))
+
+        responses = [[response] for response in first_pages]
+
+        for (idx, _), response in zip(remaining, remaining_pages):
+            responses[idx].append(response)
+
+        return responses
+
+    async def _post_page(self, request_args: dict, page: int, timer: CallTimer = None) -> dict:
+        """
+        :param request_args: Keyword arguments of the paginated POST request (Query under "json" or "data")
+        :param page: Page to request
+        :param timer: Timer of the call the page is fetched for
+        :return: Response of the requested page
+        :raises MintosException: If Mintos returns an error for the page
+        """
+
+        request_args = MintosApi._with_page(request_args, page)
+
+        response = await self._request(method='POST', page=page, timer=timer, **request_args)
+
+        if isinstance(response, dict) and response.get('errors'):
+            raise MintosException(response['errors'][0])
+
+        return response
+
+    @staticmethod
+    async def get_currencies() -> dict:
+        return await asyncio.to_thread(CONSTANTS.get_currencies)
+
+    @staticmethod
+    async def get_countries() -> dict:
+        return await asyncio.to_thread(CONSTANTS.get_countries)
+
+    @staticmethod
+    async def get_lending_companies() -> dict:
+        return await asyncio.to_thread(CONSTANTS.get_lending_companies)
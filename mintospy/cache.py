@@ -0,0 +1,360 @@
+from mintospy.hooks import endpoint_of
+from mintospy.endpoints import ENDPOINTS
+from collections import OrderedDict
+from typing import Union, Callable, Dict, Tuple
+import threading
+import hashlib
+import tempfile
+import warnings
+import time
+import json
+import os
+
+
+class DiskCache:
+    def __init__(self, directory: str = None):
+        """
+        JSON file cache shared by every process on the machine.
+        Stale entries are still returned while a background thread refreshes them, so only a missing entry makes the
+        caller wait for the network.
+        :param directory: Directory to keep the cache files in
+        (MINTOSPY_CACHE_DIR environment variable, or ~/.cache/mintospy by default)
+        """
+
+        self.directory = directory or os.getenv(
+            key='MINTOSPY_CACHE_DIR',
+            default=os.path.join(os.path.expanduser('~'), '.cache', 'mintospy'),
+        )
+
+        self._refreshing = set()
+
+        self._lock = threading.Lock()
+
+    def get(self, key: str, loader: Callable[[], any], ttl: int) -> any:
+        """
+        :param key: Key of the cached value
+        :param loader: Function that loads the value when it's missing or stale
+        :param ttl: Seconds the loaded value stays fresh for
+        :return: Cached value (Loaded and saved first if it isn't cached yet)
+        """
+
+        entry = self._read(key)
+
+        if entry is None:
+            return self.set(key, loader(), ttl)
+
+        if time.time() > entry['expiry']:
+            self._refresh(key, loader, ttl)
+
+        return entry['data']
+
+    def set(self, key: str, value: any, ttl: int) -> any:
+        """
+        Saves a value atomically, so other processes never read a partially written file.
+        :param key: Key of the cached value
+        :param value: JSON serializable value to cache
+        :param ttl: Seconds the value stays fresh for
+        :return: Cached value
+        """
+
+        self._write(key, {'data': value, 'expiry': time.time() + ttl})
+
+        return value
+
+    def get_items(self, key: str) -> Dict[str, any]:
+        """
+        :param key: Key of the cached items (See set_items)
+        :return: Items that haven't expired yet, mapped by their key (Never loads or refreshes them)
+        """
+
+        return self._live_items(self._read(key))[0]
+
+    def set_items(self, key: str, items: Dict[str, any], ttl: int) -> Dict[str, any]:
+        """
+        Merges items into a single cached entry, each with its own expiry, so many values are kept in one file instead
+        of a file each. Expired items are pruned every time the entry is written, so it doesn't grow unbounded.
+        The entry is read and written while holding a lock file next to it, so processes caching items at the same
+        time don't overwrite each other's.
+        :param key: Key of the cached items
+        :param items: JSON serializable values to cache, mapped by their key (Keys are saved as strings)
+        :param ttl: Seconds the items stay fresh for
+        :return: Cached items
+        """
+
+        # The session module imports the constants, which import this one
+        from mintospy.session import _file_lock
+
+        expiry = time.time() + ttl
+
+        lock = _file_lock(f'{self._path(key)}.lock')
+
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+
+            lock.acquire()
+
+        except OSError as e:
+            warnings.warn(f'Could not write to the cache in {self.directory}: {e}')
+
+            return items
+
+        try:
+            data, expiries = self._live_items(self._read(key))
+
+            data.update(items)
+            expiries.update(dict.fromkeys(items, expiry))
+
+            self._write(key, {'data': data, 'expiry': expiries})
+
+        finally:
+            lock.release()
+
+        return items
+
+    def invalidate(self, key: str = None) -> None:
+        """
+        :param key: Key of the cached value to remove (Removes every cached value if not provided)
+        """
+
+        if key:
+            paths = [self._path(key)]
+
+        elif os.path.isdir(self.directory):
+            names = [name for name in os.listdir(self.directory) if name.endswith('.json')]
+
+            paths = [os.path.join(self.directory, name) for name in names]
+
+        else:
+            paths = []
+
+        for path in paths:
+            try:
+                os.remove(path)
+
+            except FileNotFoundError:
+                pass
+
+    def _refresh(self, key: str, loader: Callable[[], any], ttl: int) -> None:
+        """
+        Reloads a stale value in a background thread, unless it's already being reloaded.
+        :param key: Key of the cached value
+        :param loader: Function that loads the value
+        :param ttl: Seconds the loaded value stays fresh for
+        """
+
+        with self._lock:
+            if key in self._refreshing:
+                return
+
+            self._refreshing.add(key)
+
+        def refresh() -> None:
+            try:
+                self.set(key, loader(), ttl)
+
+            except Exception as e:
+                warnings.warn(f'Could not refresh cached {key}: {e}')
+
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=refresh, daemon=True).start()
+
+    def _read(self, key: str) -> dict:
+        """
+        :param key: Key of the cached value
+        :return: Cached entry with its data and expiry, or None if it's missing or invalid
+        """
+
+        try:
+            with open(self._path(key), 'r') as f:
+                entry = json.load(f)
+
+        except (OSError, json.decoder.JSONDecodeError):
+            return
+
+        if not isinstance(entry, dict) or 'data' not in entry or 'expiry' not in entry:
+            return
+
+        return entry
+
+    def _write(self, key: str, payload: dict) -> None:
+        """
+        :param key: Key of the cached value
+        :param payload: Entry with its data and expiry
+        """
+
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+
+            with tempfile.NamedTemporaryFile('w', dir=self.directory, suffix='.tmp', delete=False) as f:
+                json.dump(payload, f)
+
+            os.replace(f.name, self._path(key))
+
+        except OSError as e:
+            warnings.warn(f'Could not write to the cache in {self.directory}: {e}')
+
+    @staticmethod
+    def _live_items(entry: Union[dict, None]) -> Tuple[Dict[str, any], Dict[str, float]]:
+        """
+        :param entry: Cached entry of items, with the expiry of each item (See set_items)
+        :return: Items that haven't expired yet and their expiries, both mapped by the items' keys
+        """
+
+        if entry is None or not isinstance(entry['data'], dict) or not isinstance(entry['expiry'], dict):
+            return {}, {}
+
+        now = time.time()
+
+        expiries = {k: expiry for k, expiry in entry['expiry'].items() if k in entry['data'] and expiry >= now}
+
+        return {k: entry['data'][k] for k in expiries}, expiries
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f'{key}.json')
+
+
+class ResponseCache:
+    def __init__(self, ttls: Dict[str, float] = None, max_bytes: int = None):
+        """
+        In-memory cache of Mintos responses, keyed by account, endpoint and the canonical form of the request's query
+        and body, so repeated calls with the same arguments don't reach Mintos until the response expires, and
+        clients of different accounts sharing the cache never get each other's responses.
+        Only endpoints with a TTL are cached, and the least recently used responses are evicted first once the bodies
+        cached take more than max_bytes.
+        :param ttls: Seconds responses stay fresh for, by endpoint path under ENDPOINTS.BASE_URI with IDs and ISINs
+        replaced by placeholders, e.g. /en/webapp-api/user/overview-aggregates
+        (CONSTANTS.RESPONSE_CACHE_TTLS by default)
+        :param max_bytes: Maximum size of the cached bodies (CONSTANTS.RESPONSE_CACHE_MAX_BYTES by default)
+        """
+
+        from mintospy.constants import CONSTANTS
+
+        self.ttls = dict(CONSTANTS.RESPONSE_CACHE_TTLS if ttls is None else ttls)
+        self.max_bytes = CONSTANTS.RESPONSE_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes = 0
+
+        # Key -> (endpoint, expiry, body, namespace), from least to most recently used
+        self._entries = OrderedDict()
+
+        self._lock = threading.Lock()
+
+    def key(self, method: str, url: str, kwargs: dict, namespace: str = None) -> Union[str, None]:
+        """
+        :param method: HTTP method of the request
+        :param url: URL of the request
+        :param kwargs: Extra arguments of the request (params, json and data are part of the key)
+        :param namespace: Namespace of the client sending the request, e.g. its account, so responses are only shared
+        between clients of the same namespace
+        :return: Key of the request's response, or None if its endpoint isn't cached
+        """
+
+        if self._endpoint(url) not in self.ttls:
+            return
+
+        query = {k: kwargs.get(k) for k in ('params', 'json', 'data')}
+
+        canonical = json.dumps([namespace, method.upper(), url, query], sort_keys=True, default=str)
+
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    def get(self, key: str) -> Union[bytes, None]:
+        """
+        :param key: Key of the response (See key)
+        :return: Body of the cached response, or None if it's missing or expired
+        """
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None or time.monotonic() > entry[1]:
+                if entry is not None:
+                    self._remove(key)
+
+                self.misses += 1
+
+                return
+
+            self._entries.move_to_end(key)
+
+            self.hits += 1
+
+            return entry[2]
+
+    def set(self, key: str, url: str, body: bytes, namespace: str = None) -> None:
+        """
+        :param key: Key of the response (See key)
+        :param url: URL of the request, whose endpoint sets the TTL
+        :param body: Body of the response
+        :param namespace: Namespace the key was made in (See key)
+        """
+
+        endpoint = self._endpoint(url)
+
+        if len(body) > self.max_bytes or not self.ttls.get(endpoint):
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = (endpoint, time.monotonic() + self.ttls[endpoint], body, namespace)
+
+            self.bytes += len(body)
+
+            while self.bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+                self.evictions += 1
+
+    def invalidate(self, endpoint: str = None, namespace: str = None) -> None:
+        """
+        :param endpoint: Endpoint whose responses to remove, in the format of the TTLs (Removes every response if not
+        provided)
+        :param namespace: Namespace whose responses to remove (Removes the responses of every namespace if not
+        provided)
+        """
+
+        with self._lock:
+            for key, entry in list(self._entries.items()):
+                if (endpoint is None or entry[0] == endpoint) and (namespace is None or entry[3] == namespace):
+                    self._remove(key)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        :return: Hits, misses, evictions, and the quantity and size of the cached responses
+        """
+
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self.bytes,
+            }
+
+    def _remove(self, key: str) -> None:
+        """
+        Removes a response (Must be called while holding the lock).
+        :param key: Key of the response
+        """
+
+        self.bytes -= len(self._entries.pop(key)[2])
+
+    @staticmethod
+    def _endpoint(url: str) -> str:
+        """
+        :param url: URL of a request
+        :return: Endpoint of the request, relative to ENDPOINTS.BASE_URI
+        """
+
+        endpoint = endpoint_of(url)
+
+        return endpoint[len(ENDPOINTS.BASE_URI):] if endpoint.startswith(ENDPOINTS.BASE_URI) else endpoint
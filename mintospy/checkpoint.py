@@ -0,0 +1,120 @@
+from mintospy import codec
+from typing import Union, List
+import threading
+import warnings
+import hashlib
+import json
+import os
+
+
+class Checkpoint:
+    def __init__(self, path: Union[str, None], queries: List[dict], start_page: int, quantity: int):
+        """
+        File that keeps every page fetched for a paginated pull, so an interrupted pull can continue where it stopped.
+        Pages are appended to the file (JSON lines) as they arrive, and the file is removed once the pull completes.
+        A checkpoint of a different pull found at the same path is discarded.
+        Without a path it doesn't keep anything, so it can be passed around unconditionally.
+        :param path: Path of the checkpoint file
+        :param queries: Keyword arguments of each paginated request of the pull
+        :param start_page: Page the pull starts from
+        :param quantity: Quantity of items the pull gets for each query
+        """
+
+        self.path = path
+
+        self.key = hashlib.sha256(
+            json.dumps([queries, start_page, quantity], sort_keys=True, default=str).encode(),
+        ).hexdigest()
+
+        self.pages = self._load() if path else {}
+
+        self._file = None
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> 'Checkpoint':
+        return self
+
+    def __exit__(self, exc_type, *args) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+
+                self._file = None
+
+        if exc_type is None and self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
+    def get(self, query_idx: int, page: int) -> Union[dict, None]:
+        """
+        :param query_idx: Index of the query the page belongs to
+        :param page: Page number
+        :return: Response of the page if it was already fetched, otherwise None
+        """
+
+        return self.pages.get((query_idx, page))
+
+    def save(self, query_idx: int, page: int, response: dict) -> None:
+        """
+        :param query_idx: Index of the query the page belongs to
+        :param page: Page number
+        :param response: Response of the page
+        """
+
+        if not self.path:
+            return
+
+        with self._lock:
+            if self._file is None:
+                # Rewritten from the pages loaded so far, which drops an incomplete last line
+                self._file = open(self.path, 'w')
+
+                self._file.write(json.dumps({'key': self.key}) + '\n')
+
+                for (loaded_idx, loaded_page), loaded_response in self.pages.items():
+                    self._file.write(self._line(loaded_idx, loaded_page, loaded_response))
+
+            self._file.write(self._line(query_idx, page, response))
+            self._file.flush()
+
+            self.pages[(query_idx, page)] = response
+
+    @staticmethod
+    def _line(query_idx: int, page: int, response: dict) -> str:
+        return codec.dumps({'query': query_idx, 'page': page, 'response': response}) + '\n'
+
+    def _load(self) -> dict:
+        """
+        :return: Responses already fetched for this pull, by query index and page
+        """
+
+        try:
+            with open(self.path, 'r') as f:
+                lines = f.read().splitlines()
+
+        except FileNotFoundError:
+            return {}
+
+        try:
+            header = json.loads(lines[0])
+
+        except (IndexError, json.decoder.JSONDecodeError):
+            header = {}
+
+        if header.get('key') != self.key:
+            warnings.warn(f'Ignoring checkpoint {self.path}, which belongs to another pull.')
+
+            return {}
+
+        pages = {}
+
+        for line in lines[1:]:
+            # The last line is incomplete if the pull was interrupted while it was being written
+            try:
+                entry = codec.loads(line)
+
+            except json.decoder.JSONDecodeError:
+                break
+
+            pages[(entry['query'], entry['page'])] = entry['response']
+
+        return pages
@@ -0,0 +1,54 @@
+from typing import Union
+import json
+
+try:
+    import orjson
+
+except ImportError:
+    orjson = None
+
+
+# Decoder used for every response, orjson when it's installed (pip install "mintospy[fast]")
+BACKEND = 'orjson' if orjson is not None else 'json'
+
+
+def use(backend: str) -> None:
+    """
+    :param backend: JSON backend to decode responses with (orjson or json)
+    :raises ImportError: If orjson is chosen but isn't installed
+    """
+
+    global BACKEND
+
+    if backend not in {'orjson', 'json'}:
+        raise ValueError('JSON backend must be one of the following: orjson, json')
+
+    if backend == 'orjson' and orjson is None:
+        raise ImportError('The orjson backend requires the fast extra: pip install "mintospy[fast]"')
+
+    BACKEND = backend
+
+
+def loads(content: Union[bytes, str]) -> any:
+    """
+    :param content: JSON document
+    :return: Decoded document
+    :raises json.JSONDecodeError: If the document isn't valid JSON (orjson's error is a subclass of it)
+    """
+
+    if BACKEND == 'orjson':
+        return orjson.loads(content)
+
+    return json.loads(content)
+
+
+def dumps(value: any) -> str:
+    """
+    :param value: JSON serializable value
+    :return: Compact JSON document
+    """
+
+    if BACKEND == 'orjson':
+        return orjson.dumps(value).decode()
+
+    return json.dumps(value, separators=(',', ':'))
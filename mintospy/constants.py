@@ -1,4 +1,6 @@
 from mintospy.endpoints import ENDPOINTS
+from mintospy.throttle import Throttle
+from mintospy.cache import DiskCache
 from mintospy.enums import Currency
 import requests
 
@@ -88,10 +90,102 @@ class CONSTANTS:
         'available_for_investment': 'availableForInvestmentAmount',
     }
 
+    # Item field each loans sort field orders by, and the type it's compared as (number, date or text)
+    LOANS_SORT_KEYS = {
+        'isin': ('isin', 'text'),
+        'mintosRiskScoreDecimal': ('mintosRiskScore', 'number'),
+        'lender': ('lender', 'text'),
+        'maturityDate': ('loanDtEnd', 'date'),
+        'aggregateNominalValue': ('aggregateNominalValue', 'number'),
+        'interestRate': ('interestRate', 'number'),
+        'availableForInvestmentAmount': ('availableForInvestmentAmount', 'number'),
+    }
+
     SESSION_EXPIRY_SECONDS = 900
 
+    SESSION_REFRESH_SECONDS = 300
+
     MAX_RESULTS = 300
 
+    MAX_WORKERS = 8
+
+    REQUEST_TIMEOUT_SECONDS = 30
+
+    STREAM_CHUNK_BYTES = 16384
+
+    REQUESTS_PER_SECOND = 10
+
+    REQUESTS_BURST = 10
+
+    MAX_RETRIES = 4
+
+    RETRY_STATUSES = {500, 502, 503, 504}
+
+    RETRY_BACKOFF_SECONDS = 0.5
+
+    RETRY_BACKOFF_MAX_SECONDS = 30
+
+    CATALOGUE_TTL_SECONDS = 86400
+
+    FILTERS_TTL_SECONDS = 3600
+
+    # Details of finished claims don't change anymore, so they're kept in the disk cache
+    FINISHED_CLAIM_TTL_SECONDS = 30 * 86400
+
+    # Seconds responses stay fresh in a ResponseCache, by endpoint (Endpoints not listed aren't cached)
+    RESPONSE_CACHE_TTLS = {
+        '/marketplace-api/v1/user/overview/currency/{id}/portfolio-data': 60,
+        '/en/webapp-api/user/overview-net-annual-returns': 300,
+        '/en/webapp-api/user/overview-aggregates': 60,
+        '/marketplace-api/v1/note-series/primary': 30,
+        '/marketplace-api/v1/note-series/secondary': 30,
+    }
+
+    RESPONSE_CACHE_MAX_BYTES = 64 * 2 ** 20
+
+    LOGIN_TIMEOUT_SECONDS = 30
+
+    # Elements of the login pages, as (By, locator) pairs
+    LOGIN_ELEMENTS = {
+        'username': ('id', 'login-username'),
+        'password': ('id', 'login-password'),
+        'submit': ('xpath', '//button[@type="submit"]'),
+        'maintenance': ('css selector', 'h1[data-testid="page-title"]'),
+        'recaptcha': ('xpath', '//iframe[@title="recaptcha challenge expires in two minutes"]'),
+        'login_error': ('class name', 'account-login-error'),
+        'tfa_label': ('xpath', '//label[normalize-space()="6-digit code"]'),
+        'tfa_code': ('xpath', '//input[@type="text"]'),
+        'tfa_error': ('class name', 'm-u-color-r4--text'),
+        'overview': ('id', 'header-wrapper'),
+    }
+
+    # Resources the browser doesn't load during a fast login (ReCAPTCHA challenges have no file extension)
+    LOGIN_BLOCKED_URLS = [
+        '*.png',
+        '*.jpg',
+        '*.jpeg',
+        '*.gif',
+        '*.webp',
+        '*.svg',
+        '*.ico',
+        '*.woff',
+        '*.woff2',
+        '*.ttf',
+        '*.otf',
+        '*.mp4',
+        '*google-analytics.com*',
+        '*googletagmanager.com*',
+        '*doubleclick.net*',
+        '*facebook.net*',
+        '*hotjar.com*',
+        '*intercom.io*',
+        '*intercomcdn.com*',
+    ]
+
+    CACHE = DiskCache()
+
+    THROTTLE = Throttle(rate=REQUESTS_PER_SECOND, burst=REQUESTS_BURST, max_concurrency=MAX_WORKERS)
+
     USER_AGENTS = [
         'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/109.0.0.0 Safari/537.36',
         'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/109.0.0.0 Safari/537.36',
@@ -109,14 +203,7 @@ class CONSTANTS:
         """
 
         if cls.CURRENCIES is None:
-            raw_currencies = requests.get(ENDPOINTS.API_CURRENCIES_URI).json()
-
-            cls.CURRENCIES = dict(
-                map(
-                    lambda data: (data['abbreviation'], {k: v for k, v in data.items() if k != 'abbreviation'}),
-                    raw_currencies['items'],
-                )
-            )
+            cls.CURRENCIES = cls.CACHE.get('currencies', cls._load_currencies, cls.CATALOGUE_TTL_SECONDS)
 
         return cls.CURRENCIES
 
@@ -127,9 +214,7 @@ class CONSTANTS:
         """
 
         if cls.COUNTRIES is None:
-            raw_countries = requests.get(ENDPOINTS.API_COUNTRIES_URI).json()
-
-            cls.COUNTRIES = dict(map(lambda data: (data['name'], data['id']), raw_countries['countries']))
+            cls.COUNTRIES = cls.CACHE.get('countries', cls._load_countries, cls.CATALOGUE_TTL_SECONDS)
 
         return cls.COUNTRIES
 
@@ -140,13 +225,8 @@ class CONSTANTS:
         """
 
         if cls.LENDING_COMPANIES is None:
-            raw_companies = requests.get(ENDPOINTS.API_LENDING_COMPANIES_URI).json()
-
-            cls.LENDING_COMPANIES = dict(
-                map(
-                    lambda data: (data['name'], {k: v for k, v in data.items() if k != 'name'}),
-                    raw_companies['items']
-                )
+            cls.LENDING_COMPANIES = cls.CACHE.get(
+                'lending_companies', cls._load_lending_companies, cls.CATALOGUE_TTL_SECONDS,
             )
 
         return cls.LENDING_COMPANIES
@@ -213,3 +293,31 @@ class CONSTANTS:
             )
 
         return cls.AMORTIZATION_METHODS[method]
+
+    @classmethod
+    def _load_currencies(cls) -> dict:
+        raw_currencies = requests.get(ENDPOINTS.API_CURRENCIES_URI, timeout=cls.REQUEST_TIMEOUT_SECONDS).json()
+
+        return dict(
+            map(
+                lambda data: (data['abbreviation'], {k: v for k, v in data.items() if k != 'abbreviation'}),
+                raw_currencies['items'],
+            )
+        )
+
+    @classmethod
+    def _load_countries(cls) -> dict:
+        raw_countries = requests.get(ENDPOINTS.API_COUNTRIES_URI, timeout=cls.REQUEST_TIMEOUT_SECONDS).json()
+
+        return dict(map(lambda data: (data['name'], data['id']), raw_countries['countries']))
+
+    @classmethod
+    def _load_lending_companies(cls) -> dict:
+        raw_companies = requests.get(ENDPOINTS.API_LENDING_COMPANIES_URI, timeout=cls.REQUEST_TIMEOUT_SECONDS).json()
+
+        return dict(
+            map(
+                lambda data: (data['name'], {k: v for k, v in data.items() if k != 'name'}),
+                raw_companies['items']
+            )
+        )
@@ -1,5 +1,9 @@
 class ENDPOINTS:
-    BASE_URI = 'https://www.mintos.com/webapp/api'
+    _DEFAULT_BASE_URI = 'https://www.mintos.com/webapp/api'
+
+    _DEFAULT_WEB_APP_URI = 'https://www.mintos.com/en'
+
+    BASE_URI = _DEFAULT_BASE_URI
 
     API_LOGIN_URI = f'{BASE_URI}/auth/login'
 
@@ -33,8 +37,31 @@ class ENDPOINTS:
 
     API_NOTES_DETAILS_URI = f'{BASE_URI}/marketplace-api/v1/note-series'
 
-    WEB_APP_URI = 'https://www.mintos.com/en'
+    WEB_APP_URI = _DEFAULT_WEB_APP_URI
 
     LOGIN_URI = f'{WEB_APP_URI}/login'
 
     OVERVIEW_URI = f'{WEB_APP_URI}/overview'
+
+    @classmethod
+    def configure(cls, base_uri: str = None, web_app_uri: str = None) -> None:
+        """
+        Points every endpoint to another host, e.g. a local stand-in of Mintos (Restores Mintos' own if not provided).
+        :param base_uri: URI the API endpoints are under
+        :param web_app_uri: URI the web app pages are under
+        """
+
+        base_uri = (base_uri or cls._DEFAULT_BASE_URI).rstrip('/')
+        web_app_uri = (web_app_uri or cls._DEFAULT_WEB_APP_URI).rstrip('/')
+
+        for name, uri in list(vars(cls).items()):
+            if not name.endswith('_URI') or name.startswith('_') or name in {'BASE_URI', 'WEB_APP_URI'}:
+                continue
+
+            if uri.startswith(cls.BASE_URI):
+                setattr(cls, name, base_uri + uri[len(cls.BASE_URI):])
+
+            elif uri.startswith(cls.WEB_APP_URI):
+                setattr(cls, name, web_app_uri + uri[len(cls.WEB_APP_URI):])
+
+        cls.BASE_URI, cls.WEB_APP_URI = base_uri, web_app_uri
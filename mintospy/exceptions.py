@@ -8,3 +8,10 @@ class InvalidCredentials(MintosException):
 
 class NetworkException(MintosException):
     pass
+
+
+class RetryableException(NetworkException):
+    def __init__(self, message: str, retry_after: float = None):
+        super().__init__(message)
+
+        self.retry_after = retry_after
@@ -0,0 +1,292 @@
+from typing import Dict, List, Tuple, TYPE_CHECKING
+import os
+
+
+if TYPE_CHECKING:
+    import pyarrow.parquet as pq
+    import pandas as pd
+    import pyarrow as pa
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+    except ImportError as e:
+        raise ImportError(
+            'Exporting to Arrow or Parquet requires the arrow extra: pip install "mintospy[arrow]"',
+        ) from e
+
+    return pa, pq
+
+
+class ArrowExport:
+    def __init__(self):
+        """
+        Base class of the destinations pages of investments, loans or schedules are exported to, one page at a time.
+        Every partition starts with the schema of the first page written to it, and widens it as later pages arrive:
+        columns that were empty on every page so far (Which have no type yet) take the type of the first page that has
+        values in them, integers become floats once a page has fractions, types that can't be unified become text,
+        and columns the first pages didn't have are added, empty on those pages. Columns a page is missing are left
+        empty.
+        """
+
+        self.pa, self.pq = _import_pyarrow()
+
+        self.rows: Dict[Tuple[Tuple[str, str], ...], int] = {}
+
+        self._schemas: Dict[Tuple[Tuple[str, str], ...], 'pa.Schema'] = {}
+
+    def __enter__(self) -> 'ArrowExport':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def write(self, frame: 'pd.DataFrame', partition: Dict[str, str]) -> int:
+        """
+        :param frame: Typed dataframe of a page (See Utils.typed_frame)
+        :param partition: Partition the page belongs to, mapping partition column to value
+        :return: Quantity of rows written
+        """
+
+        if len(frame) == 0:
+            return 0
+
+        key = tuple(partition.items())
+
+        table = self._table(frame, partition)
+
+        if key not in self._schemas:
+            self._schemas[key] = table.schema
+
+        else:
+            schema = self._widen(self._schemas[key], table.schema)
+
+            if not schema.equals(self._schemas[key]):
+                self._schemas[key] = schema
+
+                self._widened(key, schema)
+
+            table = self._conform(table, schema)
+
+        self._write(table, key)
+
+        self.rows[key] = self.rows.get(key, 0) + table.num_rows
+
+        return table.num_rows
+
+    def close(self) -> None:
+        pass
+
+    def _table(self, frame: 'pd.DataFrame', partition: Dict[str, str]) -> 'pa.Table':
+        raise NotImplementedError
+
+    def _write(self, table: 'pa.Table', key: Tuple[Tuple[str, str], ...]) -> None:
+        raise NotImplementedError
+
+    def _widened(self, key: Tuple[Tuple[str, str], ...], schema: 'pa.Schema') -> None:
+        """
+        Called when the schema of a partition is widened, before the page that widened it is written.
+        :param key: Key of the partition
+        :param schema: New schema of the partition
+        """
+
+        pass
+
+    def _widen(self, schema: 'pa.Schema', page_schema: 'pa.Schema') -> 'pa.Schema':
+        """
+        :param schema: Schema of a partition
+        :param page_schema: Schema of a page written to the partition
+        :return: Schema of the partition, widened to hold the page (See ArrowExport)
+        """
+
+        for page_field in page_schema:
+            idx = schema.get_field_index(page_field.name)
+
+            if idx == -1:
+                schema = schema.append(page_field)
+
+                continue
+
+            field = schema.field(idx)
+
+            if field.type == page_field.type:
+                continue
+
+            try:
+                unified = self.pa.unify_schemas(
+                    [self.pa.schema([field]), self.pa.schema([page_field])],
+                    promote_options='permissive',
+                )
+
+                schema = schema.set(idx, unified.field(0))
+
+            except (self.pa.ArrowInvalid, self.pa.ArrowTypeError, self.pa.ArrowNotImplementedError):
+                schema = schema.set(idx, field.with_type(self.pa.string()))
+
+        return schema
+
+    def _to_arrow(self, frame: 'pd.DataFrame') -> 'pa.Table':
+        """
+        :param frame: Typed dataframe of a page
+        :return: Arrow table of the page, with the index as regular columns
+        """
+
+        import pandas as pd
+
+        frame = frame.reset_index()
+
+        for k in frame.columns:
+            column = frame[k]
+
+            # Categories differ from page to page, and Parquet dictionary-encodes repeated strings on its own anyway
+            if isinstance(column.dtype, pd.CategoricalDtype):
+                frame[k] = column.astype(column.cat.categories.dtype)
+
+            # Columns mixing numbers and labels are kept as text, which is the only type that holds both
+            elif column.dtype == object and pd.api.types.infer_dtype(column, skipna=True) not in {'string', 'empty'}:
+                frame[k] = column.map(lambda v: v if pd.isna(v) else str(v))
+
+        return self.pa.Table.from_pandas(frame, preserve_index=False)
+
+    def _conform(self, table: 'pa.Table', schema: 'pa.Schema') -> 'pa.Table':
+        """
+        :param table: Arrow table of a page
+        :param schema: Schema of the partition the page is written to
+        :return: Table with the columns and types of the schema
+        """
+
+        columns = [
+            table.column(field.name).cast(field.type) if field.name in table.column_names
+            else self.pa.nulls(table.num_rows, field.type)
+            for field in schema
+        ]
+
+        return self.pa.Table.from_arrays(columns, schema=schema)
+
+
+class TableExport(ArrowExport):
+    """
+    Collects the exported pages into a single in-memory Arrow table, with the partition values as columns.
+    """
+
+    def __init__(self):
+        super().__init__()
+
+        self._tables: List[Tuple[Tuple[Tuple[str, str], ...], 'pa.Table']] = []
+
+    @property
+    def table(self) -> 'pa.Table':
+        """
+        :return: Every page written so far (Pages of different partitions are unified by column name)
+        """
+
+        if not self._tables:
+            return self.pa.table({})
+
+        return self.pa.concat_tables([table for _, table in self._tables], promote_options='permissive')
+
+    def _table(self, frame: 'pd.DataFrame', partition: Dict[str, str]) -> 'pa.Table':
+        table = self._to_arrow(frame)
+
+        for k, v in partition.items():
+            values = self.pa.array([v] * table.num_rows, self.pa.string())
+
+            if k in table.column_names:
+                table = table.set_column(table.column_names.index(k), k, values)
+
+            else:
+                table = table.append_column(k, values)
+
+        return table
+
+    def _write(self, table: 'pa.Table', key: Tuple[Tuple[str, str], ...]) -> None:
+        self._tables.append((key, table))
+
+    def _widened(self, key: Tuple[Tuple[str, str], ...], schema: 'pa.Schema') -> None:
+        """
+        Casts the pages already collected from the partition to its new schema.
+        """
+
+        self._tables = [(k, self._conform(table, schema) if k == key else table) for k, table in self._tables]
+
+
+class ParquetExport(ArrowExport):
+    def __init__(self, path: str, compression: str = 'zstd'):
+        """
+        Writes the exported pages to a Hive-partitioned Parquet dataset as they arrive (For example
+        path/currency=EUR/portfolio=current/part-0.parquet), so only one page is in memory at a time.
+        Partition columns are only stored in the directory names. Existing files of a partition are overwritten.
+        :param path: Directory of the dataset
+        :param compression: Parquet compression codec
+        """
+
+        super().__init__()
+
+        self.path = path
+        self.compression = compression
+
+        self._writers = {}
+
+    def close(self) -> None:
+        """
+        Finishes every Parquet file (They're only readable once closed).
+        """
+
+        writers, self._writers = self._writers, {}
+
+        for writer in writers.values():
+            writer.close()
+
+    def _table(self, frame: 'pd.DataFrame', partition: Dict[str, str]) -> 'pa.Table':
+        return self._to_arrow(frame.drop(columns=[k for k in partition if k in frame.columns]))
+
+    def _write(self, table: 'pa.Table', key: Tuple[Tuple[str, str], ...]) -> None:
+        writer = self._writers.get(key)
+
+        if writer is None:
+            writer = self._open(key, table.schema)
+
+        writer.write_table(table)
+
+    def _widened(self, key: Tuple[Tuple[str, str], ...], schema: 'pa.Schema') -> None:
+        """
+        Rewrites what was already written to the partition with its new schema, since a Parquet file can't change
+        schema once it's started (This only happens when a page widens the schema, see ArrowExport).
+        """
+
+        writer = self._writers.pop(key, None)
+
+        if writer is None:
+            return
+
+        writer.close()
+
+        written = self.pq.read_table(self._file(key), partitioning=None)
+
+        self._open(key, schema).write_table(self._conform(written, schema))
+
+    def _open(self, key: Tuple[Tuple[str, str], ...], schema: 'pa.Schema') -> 'pq.ParquetWriter':
+        """
+        :param key: Key of the partition
+        :param schema: Schema of the partition
+        :return: Writer of the partition's file (Overwriting the file if it exists)
+        """
+
+        os.makedirs(os.path.dirname(self._file(key)), exist_ok=True)
+
+        writer = self.pq.ParquetWriter(where=self._file(key), schema=schema, compression=self.compression)
+
+        self._writers[key] = writer
+
+        return writer
+
+    def _file(self, key: Tuple[Tuple[str, str], ...]) -> str:
+        """
+        :param key: Key of the partition
+        :return: Path of the partition's Parquet file
+        """
+
+        return os.path.join(self.path, *(f'{k}={v}' for k, v in key), 'part-0.parquet')
@@ -0,0 +1,202 @@
+from typing import Union, List, Dict, Iterable, Iterator, NamedTuple
+from contextlib import contextmanager
+from collections import defaultdict
+import threading
+import warnings
+import math
+import time
+import re
+
+
+class RequestEvent(NamedTuple):
+    endpoint: str
+    method: str
+    status: int
+    bytes: int
+    latency: float
+    decode: float
+    page: Union[int, None]
+
+
+class StageEvent(NamedTuple):
+    call: str
+    stage: str
+    duration: float
+
+
+class Hook:
+    """
+    Base class of instrumentation hooks, which get every event of the clients they're added to.
+    Hooks may be called from several threads at the same time, and shouldn't block.
+    """
+
+    def on_request(self, event: RequestEvent) -> None:
+        """
+        Called after every HTTP request to Mintos.
+        :param event: Endpoint (URL without query string, ISINs or IDs), HTTP method, status code, size of the body
+        in bytes, seconds until the body was received, seconds spent decoding its JSON, and page requested (If any)
+        """
+
+    def on_stage(self, event: StageEvent) -> None:
+        """
+        Called once per stage at the end of every call of a client method.
+        :param event: Client method called, stage (fetch, decode, parse or frame), and seconds spent in it
+        (Decode time is summed over every request of the call, so it can exceed the fetch stage's wall time)
+        """
+
+
+class MetricsCollector(Hook):
+    def __init__(self, percentiles: Iterable[float] = (50, 90, 99)):
+        """
+        Hook that keeps every event in memory and summarises them.
+        :param percentiles: Percentiles reported in the summaries
+        """
+
+        self.percentiles = list(percentiles)
+
+        self.requests: List[RequestEvent] = []
+        self.stages: List[StageEvent] = []
+
+        self._lock = threading.Lock()
+
+    def on_request(self, event: RequestEvent) -> None:
+        with self._lock:
+            self.requests.append(event)
+
+    def on_stage(self, event: StageEvent) -> None:
+        with self._lock:
+            self.stages.append(event)
+
+    def request_summary(self) -> Dict[str, dict]:
+        """
+        :return: Count, error count, total bytes and latency percentiles (In seconds) of the requests to each endpoint
+        """
+
+        with self._lock:
+            requests = list(self.requests)
+
+        by_endpoint = defaultdict(list)
+
+        for event in requests:
+            by_endpoint[f'{event.method} {event.endpoint}'].append(event)
+
+        return {
+            endpoint: {
+                'count': len(events),
+                'errors': sum(1 for event in events if event.status >= 400),
+                'bytes': sum(event.bytes for event in events),
+                **self._percentiles([event.latency for event in events], 'latency'),
+                **self._percentiles([event.decode for event in events], 'decode'),
+            }
+            for endpoint, events in by_endpoint.items()
+        }
+
+    def stage_summary(self) -> Dict[str, Dict[str, dict]]:
+        """
+        :return: Count, total seconds and duration percentiles of each stage of each client method
+        """
+
+        with self._lock:
+            stages = list(self.stages)
+
+        by_call = defaultdict(lambda: defaultdict(list))
+
+        for event in stages:
+            by_call[event.call][event.stage].append(event.duration)
+
+        return {
+            call: {
+                stage: {'count': len(durations), 'total': sum(durations), **self._percentiles(durations, 'duration')}
+                for stage, durations in call_stages.items()
+            }
+            for call, call_stages in by_call.items()
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self.requests.clear()
+            self.stages.clear()
+
+    def _percentiles(self, values: List[float], name: str) -> Dict[str, float]:
+        """
+        :param values: Values to get percentiles of
+        :param name: Name the percentiles are prefixed with
+        :return: Nearest-rank percentiles of the values
+        """
+
+        values = sorted(values)
+
+        return {
+            f'{name}_p{percentile:g}': values[max(math.ceil(percentile / 100 * len(values)) - 1, 0)]
+            for percentile in self.percentiles
+        }
+
+
+class CallTimer:
+    def __init__(self, call: str = None, hooks: List[Hook] = None):
+        """
+        Adds up the time spent in each stage of a client method call, then reports it to the hooks.
+        Without hooks it only measures, so it can be passed around unconditionally.
+        :param call: Client method being timed
+        :param hooks: Hooks to report the stages to
+        """
+
+        self.call = call
+        self.hooks = hooks or []
+
+        self.durations = defaultdict(float)
+
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, stage: str) -> Iterator[None]:
+        start = time.perf_counter()
+
+        try:
+            yield
+
+        finally:
+            self.add(stage, time.perf_counter() - start)
+
+    def add(self, stage: str, duration: float) -> None:
+        with self._lock:
+            self.durations[stage] += duration
+
+    def __enter__(self) -> 'CallTimer':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.emit()
+
+    def emit(self) -> None:
+        for stage, duration in self.durations.items():
+            emit(self.hooks, 'on_stage', StageEvent(self.call, stage, duration))
+
+
+def endpoint_of(url: str) -> str:
+    """
+    :param url: URL of a request
+    :return: URL without query string, with ISINs and numeric IDs in the path replaced by placeholders
+    """
+
+    path = url.split('?', 1)[0]
+
+    path = re.sub(r'/[A-Z]{2}[A-Z0-9]{9}[0-9](?=/|$)', '/{isin}', path)
+
+    return re.sub(r'/[0-9]+(?=/|$)', '/{id}', path)
+
+
+def emit(hooks: List[Hook], method: str, event: Union[RequestEvent, StageEvent]) -> None:
+    """
+    Sends an event to every hook. A failing hook is reported with a warning instead of failing the call.
+    :param hooks: Hooks to send the event to
+    :param method: Hook method to call (on_request or on_stage)
+    :param event: Event to send
+    """
+
+    for hook in hooks:
+        try:
+            getattr(hook, method)(event)
+
+        except Exception as e:
+            warnings.warn(f'{type(hook).__name__}.{method} failed: {e}')
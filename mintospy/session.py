@@ -0,0 +1,253 @@
+from mintospy.constants import CONSTANTS
+from contextlib import contextmanager
+from typing import Dict, Iterator, Union, TYPE_CHECKING
+import threading
+import warnings
+import time
+import json
+import os
+
+try:
+    import fcntl
+
+except ImportError:
+    # Windows
+    fcntl = None
+    import msvcrt
+
+
+if TYPE_CHECKING:
+    from mintospy.api import MintosApi
+
+
+class SessionKeeper:
+    def __init__(self, client: 'MintosApi', interval: float = None):
+        """
+        Keeps the session of a client alive from a background thread, so long-running services never have to log in
+        again in front of a request. Every interval, the session is checked with a cheap authenticated request and its
+        CSRF token renewed, or, if it already expired, a new session is logged in to and swapped into the client.
+        :param client: Client whose session to keep alive
+        :param interval: Seconds between checks (CONSTANTS.SESSION_REFRESH_SECONDS by default, which has to be
+        shorter than CONSTANTS.SESSION_EXPIRY_SECONDS for the session to never expire)
+        """
+
+        self.client = client
+        self.interval = interval or CONSTANTS.SESSION_REFRESH_SECONDS
+
+        self.refreshes = 0
+        self.logins = 0
+
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self) -> 'SessionKeeper':
+        if self._thread is not None and self._thread.is_alive():
+            return self
+
+        self._stopped.clear()
+
+        self._thread = threading.Thread(target=self._run, name='mintospy-session-keeper', daemon=True)
+        self._thread.start()
+
+        return self
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+        if self._thread is not None:
+            self._thread.join()
+
+            self._thread = None
+
+    def __enter__(self) -> 'SessionKeeper':
+        return self.start()
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            try:
+                if self.client.refresh_session():
+                    self.refreshes += 1
+
+                else:
+                    self.logins += 1
+
+            except Exception as e:
+                # The next check tries again, the session may still be valid until then
+                warnings.warn(f'Could not refresh the Mintos session: {e}')
+
+
+class _FileLock:
+    def __init__(self, path: str):
+        """
+        Exclusive lock on a file, held across processes (flock on POSIX, locking on Windows) and reentrant within the
+        thread holding it. Threads of the same process wait on each other before they wait on other processes.
+        :param path: Path of the lock file (Created if missing, never removed)
+        """
+
+        self.path = path
+
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._file = None
+
+    def acquire(self) -> None:
+        self._lock.acquire()
+
+        self._depth += 1
+
+        if self._depth > 1:
+            return
+
+        try:
+            self._file = open(self.path, 'a+b')
+
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+
+            else:
+                self._file.seek(0)
+
+                # LK_LOCK gives up after 10 seconds, a login can take longer than that
+                while True:
+                    try:
+                        msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK, 1)
+                        break
+
+                    except OSError:
+                        continue
+
+        except BaseException:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+            self._depth -= 1
+            self._lock.release()
+
+            raise
+
+    def release(self) -> None:
+        self._depth -= 1
+
+        if self._depth == 0:
+            try:
+                if fcntl is not None:
+                    fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+
+                else:
+                    self._file.seek(0)
+                    msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+
+            finally:
+                self._file.close()
+                self._file = None
+
+        self._lock.release()
+
+
+# One lock per lock file, so clients of the same account in a process share it
+_LOCKS: Dict[str, _FileLock] = {}
+_LOCKS_LOCK = threading.Lock()
+
+
+def _file_lock(path: str) -> _FileLock:
+    """
+    :param path: Path of the lock file
+    :return: Lock of the file, shared by every user of it in the process
+    """
+
+    path = os.path.abspath(path)
+
+    with _LOCKS_LOCK:
+        return _LOCKS.setdefault(path, _FileLock(path))
+
+
+class SessionVault:
+    def __init__(self, path: str):
+        """
+        Session (cookies, CSRF token and expiry) shared by every client of an account, across threads and processes.
+        Clients that find no valid session take the vault's lock before logging in and check the vault again once
+        they hold it, so only the first of them opens a browser, and the others wait for it and reuse its session.
+        The file is replaced atomically, so it's never read half-written, and it's only removed while locked.
+        :param path: Path of the session file (The lock file is the same path with .lock appended)
+        """
+
+        self.path = path
+
+        self._lock = _file_lock(f'{path}.lock')
+
+    @contextmanager
+    def lock(self) -> Iterator['SessionVault']:
+        """
+        Holds the vault exclusively, for as long as a login and saving its session take.
+        """
+
+        self._lock.acquire()
+
+        try:
+            yield self
+
+        finally:
+            self._lock.release()
+
+    def load(self) -> Union[dict, None]:
+        """
+        :return: Stored session (cookies, csrf_token and expiry), or None if there's none or it has expired
+        """
+
+        try:
+            with open(self.path, 'r') as f:
+                session = json.load(f)
+
+        except FileNotFoundError:
+            return
+
+        except (OSError, ValueError):
+            warnings.warn('Ignoring cookies file due to invalid format.')
+
+            return
+
+        if not isinstance(session, dict) or not isinstance(session.get('cookies'), dict) or 'expiry' not in session:
+            warnings.warn('Ignoring cookies file due to invalid format.')
+
+            return
+
+        if time.time() > session['expiry']:
+            return
+
+        session.setdefault('csrf_token', None)
+
+        return session
+
+    def save(self, cookies: dict, csrf_token: str, expiry: float) -> None:
+        """
+        :param cookies: Cookies of the session
+        :param csrf_token: CSRF token of the session
+        :param expiry: Unix timestamp the session expires at
+        """
+
+        payload = {
+            'cookies': cookies,
+            'csrf_token': csrf_token,
+            'expiry': int(expiry),
+        }
+
+        temp_path = f'{self.path}.{os.getpid()}.{threading.get_ident()}.tmp'
+
+        with self.lock():
+            with open(temp_path, 'w') as f:
+                json.dump(payload, f)
+
+            os.replace(temp_path, self.path)
+
+    def clear(self) -> None:
+        """
+        Removes the stored session.
+        """
+
+        with self.lock():
+            if os.path.exists(self.path):
+                os.remove(self.path)
@@ -0,0 +1,293 @@
+from mintospy.enums import Currency
+from mintospy.api import MintosApi
+from mintospy import codec
+from datetime import datetime, timedelta
+from typing import Union, List, Dict, Iterator, TYPE_CHECKING
+import sqlite3
+import time
+
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS investments (
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    currency TEXT NOT NULL,
+    status TEXT NOT NULL,
+    purchased_at REAL,
+    finished_at REAL,
+    synced_at REAL NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (kind, key)
+);
+
+CREATE INDEX IF NOT EXISTS investments_by_purchase ON investments (kind, currency, purchased_at);
+
+CREATE TABLE IF NOT EXISTS completed_syncs (
+    kind TEXT NOT NULL,
+    currency TEXT NOT NULL,
+    status TEXT NOT NULL,
+    completed_at REAL NOT NULL,
+    PRIMARY KEY (kind, currency, status)
+);
+'''
+
+UPSERT = '''
+INSERT INTO investments (kind, key, currency, status, purchased_at, finished_at, synced_at, data)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (kind, key) DO UPDATE SET
+    status = excluded.status,
+    purchased_at = excluded.purchased_at,
+    finished_at = excluded.finished_at,
+    synced_at = excluded.synced_at,
+    data = excluded.data
+'''
+
+# Raw fields of each kind of investment: key, purchase date and finish date
+FIELDS = {
+    'note': ('isin', 'createdAt', 'deletedAt'),
+    'claim': ('id', 'purchased_at', 'finished_at'),
+}
+
+
+class PortfolioSync:
+    def __init__(self, client: MintosApi, path: str = 'mintos.sqlite3'):
+        """
+        Keeps a local SQLite copy of the notes and claims of a portfolio, fetching only what changed since last sync.
+        Current investments are fetched from the most recently purchased, starting from the last purchase date
+        already stored, and finished investments from the most recently finished. Both stop at the first investment
+        that's already stored, so outstanding amounts of investments that are still current aren't refreshed.
+        Until a sync of the investments has gone through every page once, they're fetched in full instead, so a first
+        sync that's interrupted doesn't leave the older investments it never reached out of every later sync.
+        :param client: Client to fetch the investments with
+        :param path: Path of the SQLite database
+        """
+
+        self.client = client
+        self.path = path
+
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.executescript(SCHEMA)
+
+    def __enter__(self) -> 'PortfolioSync':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def sync(self, currency: Currency, claims: bool = False) -> Dict[str, int]:
+        """
+        :param currency: Currency that investments are denominated in
+        :param claims: Sync claims if set to True, otherwise sync notes
+        :return: Quantity of current and finished investments added or updated
+        """
+
+        kind = 'claim' if claims else 'note'
+
+        filters = {'sort_field': 'purchase_date', 'ascending_sort': False}
+
+        current_completed = self._completed(kind, currency, 'current')
+
+        watermark = self._watermark(kind, currency) if current_completed else None
+
+        if watermark is not None:
+            # Mintos filters by day, so the day before also covers any difference in timezones
+            filters['min_purchased_date'] = datetime.fromtimestamp(watermark) - timedelta(days=1)
+
+        current = self.client.iter_investments(currency, claims=claims, current=True, frames=True, raw=True, **filters)
+
+        stored = {'current': self._store(current, kind, currency, 'current', stop_at_known=current_completed)}
+
+        finished = self.client.iter_investments(
+            currency=currency,
+            claims=claims,
+            current=False,
+            frames=True,
+            raw=True,
+            sort_field='finished_date',
+            ascending_sort=False,
+        )
+
+        stored['finished'] = self._store(
+            pages=finished,
+            kind=kind,
+            currency=currency,
+            status='finished',
+            stop_at_known=self._completed(kind, currency, 'finished'),
+        )
+
+        return stored
+
+    def investments(
+            self,
+            currency: Currency = None,
+            claims: bool = False,
+            current: bool = None,
+            raw: bool = False,
+            typed: bool = False,
+    ) -> Union['pd.DataFrame', List[dict]]:
+        """
+        :param currency: Only return investments denominated in this currency (Returns every currency by default)
+        :param claims: Return claims if set to True, otherwise return notes
+        :param current: Only return current investments if set to True, or finished investments if set to False
+        (Returns both by default)
+        :param raw: Return raw JSON if set to True, or returns pandas dataframe if set to False
+        :param typed: Return a dataframe with typed columns instead of filling missing values with "N/A"
+        (See MintosApi.get_investments)
+        :return: Stored investments, most recently purchased first
+        """
+
+        query, params = 'SELECT data FROM investments WHERE kind = ?', ['claim' if claims else 'note']
+
+        if currency is not None:
+            query += ' AND currency = ?'
+            params.append(currency)
+
+        if current is not None:
+            query += ' AND status = ?'
+            params.append('current' if current else 'finished')
+
+        rows = self.connection.execute(f'{query} ORDER BY purchased_at DESC', params).fetchall()
+
+        items = [codec.loads(data) for (data,) in rows]
+
+        return items if raw else MintosApi._investments_frame(items, claims, typed=typed)
+
+    def _store(
+            self,
+            pages: Iterator[List[dict]],
+            kind: str,
+            currency: Currency,
+            status: str,
+            stop_at_known: bool = True,
+    ) -> int:
+        """
+        Stores the pages, and records that the investments were synced completely once they're all stored.
+        :param pages: Pages of raw investments, ordered from the most recent
+        :param kind: Kind of the investments (note or claim)
+        :param currency: Currency that investments are denominated in
+        :param status: Status of the investments (current or finished)
+        :param stop_at_known: Stop at the first investment that's already stored, otherwise store every page
+        :return: Quantity of investments added or updated (Before reaching one that's already stored, if stopping)
+        """
+
+        key_field, purchase_field, finish_field = FIELDS[kind]
+
+        stored = 0
+
+        for items in pages:
+            known = self._known_keys(kind, status, [str(item.get(key_field)) for item in items])
+
+            new_items = []
+
+            for item in items:
+                if stop_at_known and str(item.get(key_field)) in known:
+                    break
+
+                new_items.append(item)
+
+            synced_at = time.time()
+
+            with self.connection:
+                self.connection.executemany(
+                    UPSERT,
+                    [
+                        (
+                            kind,
+                            str(item.get(key_field)),
+                            currency,
+                            status,
+                            self._timestamp(item.get(purchase_field)),
+                            self._timestamp(item.get(finish_field)),
+                            synced_at,
+                            codec.dumps(item),
+                        )
+                        for item in new_items
+                    ],
+                )
+
+            stored += len(new_items)
+
+            # Stopping the iteration stops the pages from being requested
+            if len(new_items) < len(items):
+                break
+
+        with self.connection:
+            self.connection.execute(
+                'INSERT OR REPLACE INTO completed_syncs (kind, currency, status, completed_at) VALUES (?, ?, ?, ?)',
+                [kind, currency, status, time.time()],
+            )
+
+        return stored
+
+    def _completed(self, kind: str, currency: Currency, status: str) -> bool:
+        """
+        :param kind: Kind of the investments (note or claim)
+        :param currency: Currency that investments are denominated in
+        :param status: Status of the investments (current or finished)
+        :return: Whether a sync of the investments has stored every page at least once
+        """
+
+        row = self.connection.execute(
+            'SELECT 1 FROM completed_syncs WHERE kind = ? AND currency = ? AND status = ?',
+            [kind, currency, status],
+        ).fetchone()
+
+        return row is not None
+
+    def _known_keys(self, kind: str, status: str, keys: List[str]) -> set:
+        """
+        :param kind: Kind of the investments (note or claim)
+        :param status: Status the investments must be stored with
+        :param keys: Keys (ISINs or IDs) to look for
+        :return: Keys that are already stored with the status
+        """
+
+        placeholders = ', '.join('?' * len(keys))
+
+        rows = self.connection.execute(
+            f'SELECT key FROM investments WHERE kind = ? AND status = ? AND key IN ({placeholders})',
+            [kind, status, *keys],
+        )
+
+        return {key for (key,) in rows}
+
+    def _watermark(self, kind: str, currency: Currency) -> Union[float, None]:
+        """
+        :param kind: Kind of the investments (note or claim)
+        :param currency: Currency that investments are denominated in
+        :return: Latest purchase date (Unix timestamp) of the stored current investments, if any
+        """
+
+        (watermark,) = self.connection.execute(
+            "SELECT MAX(purchased_at) FROM investments WHERE kind = ? AND currency = ? AND status = 'current'",
+            [kind, currency],
+        ).fetchone()
+
+        return watermark
+
+    @staticmethod
+    def _timestamp(value: any) -> Union[float, None]:
+        """
+        :param value: Date of an investment (Unix timestamp in milliseconds, or date string)
+        :return: Unix timestamp in seconds, or None if the value isn't a date
+        """
+
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return value / 1000
+
+        if not isinstance(value, str):
+            return
+
+        for date_format in ('%Y-%m-%dT%H:%M:%S%z', '%Y-%m-%d %H:%M:%S', '%Y-%m-%d', '%d.%m.%Y'):
+            try:
+                return datetime.strptime(value, date_format).timestamp()
+
+            except ValueError:
+                continue
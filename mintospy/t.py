@@ -1,7 +1,5 @@
 from mintospy.api import MintosApi
 from mintospy.enums import Currency
-from mintospy.utils import Utils
-import pandas as pd
 import os
 
 
@@ -19,13 +17,6 @@ mintos_client = MintosApi(
 kzt_investments = mintos_client.get_investments(currency=Currency.KZT, quantity=1000, current=False)
 eur_investments = mintos_client.get_investments(currency=Currency.EUR, quantity=1000, current=False)
 
-schedules = []
-
-for isin in [*eur_investments.index, *kzt_investments.index]:
-    schedules.append(mintos_client.get_note_schedule(isin, raw=True))
-
-df_parsed_response = list(map(lambda item: Utils.parse_note_schedule(item[0]), schedules))
-
-schedule_df = pd.DataFrame(df_parsed_response).set_index('identifier').fillna('N/A')
+schedule_df = mintos_client.get_note_schedules([*eur_investments.index, *kzt_investments.index])
 
 schedule_df.to_csv('sample_loans.csv')
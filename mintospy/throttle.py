@@ -0,0 +1,166 @@
+from typing import Union, Mapping
+import threading
+import asyncio
+import random
+import time
+
+
+class Throttle:
+    def __init__(
+            self,
+            rate: float,
+            burst: int,
+            max_concurrency: int,
+            min_concurrency: int = 1,
+            cooldown: float = 1,
+    ):
+        """
+        Token bucket rate limiter combined with an adaptive (AIMD) concurrency limit, safe to share between threads,
+        clients and event loops of the same process.
+        The concurrency limit is halved whenever Mintos throttles a request (429, 403 or a Cloudflare challenge), and
+        grows back by one request for every window of healthy requests.
+        :param rate: Requests started per second on average
+        :param burst: Requests that can be started at once after being idle
+        :param max_concurrency: Maximum (And initial) number of requests in flight at the same time
+        :param min_concurrency: Number of requests in flight the concurrency limit never goes below
+        :param cooldown: Seconds new requests wait after a throttled response without a Retry-After header
+        """
+
+        self.rate = rate
+        self.burst = burst
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.cooldown = cooldown
+
+        self.limit = float(max_concurrency)
+        self.in_flight = 0
+        self.throttled = 0
+
+        self._tokens = float(burst)
+        self._refilled_at = time.monotonic()
+        self._paused_until = 0
+        self._decreased_at = 0
+
+        self._condition = threading.Condition()
+
+    def acquire(self) -> None:
+        """
+        Blocks until a request can be started.
+        """
+
+        with self._condition:
+            while True:
+                wait = self._reserve()
+
+                if wait == 0:
+                    return
+
+                self._condition.wait(wait)
+
+    async def acquire_async(self) -> None:
+        """
+        Waits without blocking the event loop until a request can be started.
+        """
+
+        while True:
+            with self._condition:
+                wait = self._reserve()
+
+            if wait == 0:
+                return
+
+            await asyncio.sleep(min(wait, 0.05))
+
+    def release(self, throttled: bool = None, retry_after: float = None) -> None:
+        """
+        Marks a request as finished and adapts the concurrency limit to its outcome.
+        :param throttled: True if Mintos throttled the request, False if it succeeded,
+        or None if it failed for another reason (Doesn't change the concurrency limit)
+        :param retry_after: Seconds Mintos asked to wait before sending new requests
+        """
+
+        with self._condition:
+            self.in_flight -= 1
+
+            now = time.monotonic()
+
+            if throttled:
+                self.throttled += 1
+
+                self._paused_until = max(self._paused_until, now + (retry_after or self.cooldown))
+
+                # Requests that were already in flight when the limit was decreased don't decrease it again
+                if now - self._decreased_at > self.cooldown:
+                    self.limit = max(self.limit / 2, self.min_concurrency)
+
+                    self._decreased_at = now
+
+            elif throttled is False:
+                self.limit = min(self.limit + 1 / self.limit, self.max_concurrency)
+
+            self._condition.notify_all()
+
+    def _reserve(self) -> float:
+        """
+        Takes a slot and a token if both are available (Must be called while holding the condition).
+        :return: 0 if a request can be started, otherwise the seconds to wait before trying again
+        """
+
+        now = time.monotonic()
+
+        if now < self._paused_until:
+            return self._paused_until - now
+
+        self._tokens = min(self._tokens + (now - self._refilled_at) * self.rate, self.burst)
+        self._refilled_at = now
+
+        if self.in_flight >= int(self.limit):
+            # Woken up by release() before the timeout whenever a slot is freed
+            return 1
+
+        if self._tokens < 1:
+            return (1 - self._tokens) / self.rate
+
+        self._tokens -= 1
+        self.in_flight += 1
+
+        return 0
+
+    @staticmethod
+    def is_throttled(status: int, headers: Mapping[str, str]) -> Union[bool, None]:
+        """
+        :param status: Status code of a response
+        :param headers: Headers of the response
+        :return: True if the response means Mintos (Or Cloudflare in front of it) is throttling the client,
+        None if it's a server error (Which says nothing about throttling), otherwise False
+        """
+
+        if status in {403, 429} or headers.get('cf-mitigated') == 'challenge':
+            return True
+
+        return None if status >= 500 else False
+
+    @staticmethod
+    def retry_after(headers: Mapping[str, str]) -> Union[float, None]:
+        """
+        :param headers: Headers of a response
+        :return: Seconds the Retry-After header asks to wait for, if it has any
+        """
+
+        try:
+            return float(headers.get('Retry-After'))
+
+        except (TypeError, ValueError):
+            return
+
+
+def backoff(attempt: int, base: float, cap: float, retry_after: float = None) -> float:
+    """
+    :param attempt: Number of attempts that already failed, minus one
+    :param base: Seconds the first backoff is at most
+    :param cap: Seconds a backoff is never longer than
+    :param retry_after: Seconds Mintos asked to wait for (The backoff is never shorter)
+    :return: Seconds to wait before the next attempt (Exponential backoff with full jitter)
+    """
+
+    return max(retry_after or 0, random.uniform(0, min(cap, base * 2 ** attempt)))
@@ -1,17 +1,42 @@
 from mintospy.constants import CONSTANTS
-from typing import Union
-from datetime import datetime, date
-from typing import List
+from typing import Union, TYPE_CHECKING
+from datetime import datetime, date, timezone
+from typing import List, Dict, Iterable
+from operator import itemgetter, methodcaller
 import warnings
-import time
+import html
+import math
 import json
-import os
+import re
+
+
+if TYPE_CHECKING:
+    import pandas as pd
+    import numpy as np
 
 
 CURRENCIES = CONSTANTS.CURRENCY_SYMBOLS
 
+CSRF_META_TAG = re.compile(rb'<meta\s[^>]*data-hid=["\']csrf-token["\'][^>]*>', re.IGNORECASE)
+
+CONTENT_ATTRIBUTE = re.compile(rb'\scontent=(?:"([^"]*)"|\'([^\']*)\')', re.IGNORECASE)
+
 
 class Utils:
+    _SCALAR_TYPES = {'string', 'integer', 'floating', 'mixed-integer-float', 'boolean', 'empty'}
+
+    # Columns holding dates, either already parsed or as millisecond timestamps
+    _DATE_COLUMNS = {'createdAt', 'deletedAt', 'loanDtEnd', 'date', 'purchased_at', 'finished_at'}
+
+    # Payment components of Note schedules, and the key of their scheduled amount
+    _SCHEDULE_COMPONENTS = {
+        'total': 'scheduled',
+        'principal': 'scheduled',
+        'interest': 'scheduled',
+        'delayedInterest': 'accumulated',
+        'latePaymentFee': 'accumulated',
+    }
+
     @classmethod
     def parse_investments(cls, investments: List[dict]) -> List[dict]:
         new_items = []
@@ -55,6 +80,172 @@ class Utils:
 
         return new_items
 
+    @classmethod
+    def parse_investments_frame(cls, investments: List[dict]) -> 'pd.DataFrame':
+        """
+        Columnar equivalent of parse_investments, which parses every field of the investments at once.
+        :param investments: Raw investments (Notes, claims, or loans)
+        :return: Pandas DataFrame with the same columns and values as the records returned by parse_investments
+        """
+
+        import pandas as pd
+        import numpy as np
+
+        raw_frame = pd.DataFrame(investments, dtype=object)
+
+        # Parsed columns and the first row they're set in (Used to order columns like parse_investments does)
+        columns, first_rows = {}, {}
+
+        currency = pd.Series(np.nan, index=raw_frame.index, dtype=object)
+
+        for k in raw_frame.columns:
+            column = raw_frame[k]
+
+            if k == 'isin' or k == 'id':
+                columns[k.upper()], first_rows[k.upper()] = column.infer_objects(), cls._first_row(investments, k)
+
+                continue
+
+            # Skipped like parse_investments does
+            if k == 'contracts':
+                continue
+
+            values = column.to_numpy(dtype=object)
+
+            # Columns of a single scalar type can't contain the nested amount and score dictionaries
+            if pd.api.types.infer_dtype(values, skipna=True) in cls._SCALAR_TYPES:
+                is_dict = np.zeros(len(values), dtype=bool)
+
+            else:
+                is_dict = np.fromiter((isinstance(v, dict) for v in values), dtype=bool, count=len(values))
+
+            if is_dict.any():
+                amount = cls._truthy(
+                    pd.Series([v.get('amount') if d else None for v, d in zip(values, is_dict)], index=raw_frame.index)
+                )
+
+                has_value = amount.notna().to_numpy() | (~is_dict & column.notna().to_numpy())
+
+                if has_value.any():
+                    columns[k] = cls._to_float_column(column.where(~is_dict, amount))
+
+                    first_rows[k] = has_value.argmax()
+
+                    dict_currency = pd.Series(
+                        [v.get('currency') if d else None for v, d in zip(values, is_dict)],
+                        index=raw_frame.index,
+                        dtype=object,
+                    ).where(amount.notna())
+
+                    currency = currency.where(currency.notna(), dict_currency)
+
+                    if dict_currency.notna().any():
+                        columns.setdefault('currency', currency)
+
+                        first_rows['currency'] = min(
+                            first_rows.get('currency', len(raw_frame)),
+                            dict_currency.notna().to_numpy().argmax(),
+                        )
+
+                score = cls._truthy(
+                    pd.Series([v.get('score') if d else None for v, d in zip(values, is_dict)], index=raw_frame.index)
+                )
+
+                if score.notna().any():
+                    has_score = score.notna().to_numpy()
+
+                    score_frame = pd.DataFrame.from_records(
+                        [v.get('subscores') or {} for v in values[has_score]],
+                        index=raw_frame.index[has_score],
+                    ).reindex(raw_frame.index)
+
+                    if 'score' not in score_frame.columns:
+                        score_frame.insert(0, 'score', score)
+
+                    for score_column in score_frame.columns:
+                        columns[score_column] = cls._to_float_column(score_frame[score_column])
+
+                        first_rows[score_column] = score_frame[score_column].notna().to_numpy().argmax()
+
+                continue
+
+            if k in {'createdAt', 'deletedAt', 'loanDtEnd'}:
+                columns[k] = cls._timestamps_to_dates(column)
+
+            elif k == 'currency':
+                currency = cls._to_float_column(column).where(column.notna(), currency)
+
+                columns[k] = currency
+
+                first_rows[k] = min(first_rows.get(k, len(raw_frame)), cls._first_row(investments, k))
+
+                continue
+
+            else:
+                columns[k] = cls._to_float_column(column)
+
+            first_rows[k] = cls._first_row(investments, k)
+
+        if 'currency' in columns:
+            columns['currency'] = currency
+
+        # parse_investments builds one record per item, so columns appear in the order of the first item they're in
+        order = sorted(enumerate(columns), key=lambda col: (first_rows[col[1]], col[0]))
+
+        return pd.DataFrame({k: columns[k].to_numpy() for _, k in order}, index=raw_frame.index)
+
+    @classmethod
+    def typed_frame(cls, frame: 'pd.DataFrame') -> 'pd.DataFrame':
+        """
+        Gives a parsed dataframe a compact schema instead of filling its gaps with "N/A" strings.
+        Dates become datetime64 (NaT when missing), booleans nullable booleans, integers nullable integers,
+        other numbers (Including numeric strings) floats (NaN when missing), and strings categories when they're
+        repeated across rows.
+        :param frame: Dataframe of parsed Mintos items (Before fillna)
+        :return: Dataframe with the same values, with typed columns
+        """
+
+        import pandas as pd
+
+        columns = {}
+
+        for k in frame.columns:
+            column = frame[k]
+
+            kind = pd.api.types.infer_dtype(column, skipna=True)
+
+            if kind == 'string':
+                numeric = pd.to_numeric(column, errors='coerce')
+
+                # Amounts some endpoints send as strings are numbers too
+                if numeric.notna().sum() == column.notna().sum():
+                    column, kind = numeric, 'floating'
+
+            if k in cls._DATE_COLUMNS and kind != 'string':
+                if kind in {'integer', 'floating', 'mixed-integer-float'}:
+                    column = cls._timestamps_to_dates(column)
+
+                is_date = column.map(lambda v: isinstance(v, date)).to_numpy(bool)
+
+                columns[k] = pd.to_datetime(column.where(is_date))
+
+            elif kind == 'boolean':
+                columns[k] = column.astype('boolean')
+
+            elif kind == 'integer':
+                columns[k] = column.astype('Int64')
+
+            elif kind in {'floating', 'mixed-integer-float', 'empty'}:
+                columns[k] = column.astype(float)
+
+            elif kind == 'string' and column.nunique() <= len(column) // 2:
+                columns[k] = column.astype('category')
+
+            else:
+                columns[k] = column
+
+        return pd.DataFrame(columns, index=frame.index)
+
     @staticmethod
     def dict_to_form_data(__obj: dict) -> str:
         form_data = ''
@@ -118,49 +309,170 @@ class Utils:
         return parsed_item
 
     @classmethod
-    def import_cookies(cls, file_path: str) -> Union[dict, None]:
+    def parse_note_schedule_frame(cls, schedule: List[dict]) -> 'pd.DataFrame':
         """
-        :param file_path: File path to unpickle cookies from
-        :return: True if imported successfully, otherwise False
+        Columnar equivalent of parse_mintos_items followed by parse_note_schedule, which normalises the nested
+        amounts of every payment at once.
+        :param schedule: Raw payment schedule items (Of one or more Notes)
+        :return: Pandas DataFrame with the same columns and values as the records returned by parse_note_schedule
         """
 
-        try:
-            with open(file_path, 'r') as f:
-                try:
-                    cookies = json.load(f)
+        import pandas as pd
+        import numpy as np
 
-                except json.decoder.JSONDecodeError:
-                    warnings.warn('Ignoring cookies file due to invalid format.')
+        raw_columns = cls._columns(schedule)
 
-                    f.close()
+        columns = {}
 
-                    os.remove(file_path)
+        for k, values in raw_columns.items():
+            types = set(map(type, values))
 
-                    return
+            # Nested values are only read from the loan, currency and payment components below
+            if types == {dict}:
+                continue
 
-                try:
-                    expiry = cookies['expiry']
+            if dict in types:
+                values = [None if v.__class__ is dict else v for v in values]
 
-                except KeyError:
-                    warnings.warn('Ignoring cookies file due to invalid format.')
+            columns[k] = cls._to_float_column(pd.Series(values, dtype=object)).to_numpy()
 
-                    f.close()
+        loans = raw_columns.get('loan', [None] * len(schedule))
 
-                    os.remove(file_path)
+        columns['id'], columns['identifier'] = cls._nested_values(loans, 'id'), cls._nested_values(loans, 'identifier')
 
-                    return
+        prepaid = np.zeros(len(schedule), dtype=bool)
 
-                if time.time() > expiry:
-                    f.close()
+        if 'isPrepaid' in columns:
+            prepaid = cls._truthy(pd.Series(columns['isPrepaid'])).notna().to_numpy()
 
-                    os.remove(file_path)
+        # Prepaid payments are parsed without their currency and components
+        if not prepaid.all():
+            def not_prepaid(key: str) -> list:
+                values = raw_columns[key]
 
-                    return
+                return [None if p else v for v, p in zip(values, prepaid)] if prepaid.any() else values
 
-                return cookies.get('cookies')
+            columns['currency'] = cls._nested_values(not_prepaid('currency'), 'abbreviation')
 
-        except (FileNotFoundError, EOFError):
-            return
+            for component, scheduled_key in cls._SCHEDULE_COMPONENTS.items():
+                amounts = not_prepaid(component)
+
+                columns[f'{component}Scheduled'] = cls._nested_values(amounts, scheduled_key)
+                columns[f'{component}Received'] = cls._nested_values(amounts, 'received')
+                columns[f'{component}HasRemainder'] = cls._nested_values(amounts, 'hasRemainder')
+
+        return pd.DataFrame(columns)
+
+    @classmethod
+    def parse_items_frame(cls, items: List[dict]) -> 'pd.DataFrame':
+        """
+        Columnar equivalent of parse_mintos_items, which converts every numeric field of the items at once.
+        :param items: Raw items (Like the loans of Notes)
+        :return: Pandas DataFrame with the same columns and values as the records returned by parse_mintos_items
+        """
+
+        import pandas as pd
+
+        columns = {}
+
+        for k, values in cls._columns(items).items():
+            # Nested values are kept as they are, which only a few columns have
+            if dict in set(map(type, values)):
+                columns[k] = [cls._str_to_float(v) for v in values]
+
+                continue
+
+            columns[k] = cls._to_float_column(pd.Series(values, dtype=object)).to_numpy()
+
+        return pd.DataFrame(columns)
+
+    @classmethod
+    def note_cash_flows(cls, schedules: Dict[str, List[dict]]) -> 'pd.DataFrame':
+        """
+        Long form of the payment schedules of Notes, with one row per payment component of each loan's payment, for
+        cash flow forecasts. Components a payment doesn't have (Missing or null in the raw schedule) have no row.
+        :param schedules: Raw payment schedule items, mapped by ISIN
+        :return: Pandas DataFrame with the isin, loan (Identifier), date, component, scheduled and received columns
+        """
+
+        import pandas as pd
+        import numpy as np
+
+        components = list(cls._SCHEDULE_COMPONENTS)
+
+        items = [item for schedule in schedules.values() for item in schedule]
+
+        isins = np.repeat(np.array(list(schedules), dtype=object), [len(schedule) for schedule in schedules.values()])
+
+        loans = np.array(cls._nested_values([item.get('loan') for item in items], 'identifier'), dtype=object)
+
+        dates = cls._local_days(np.array([item.get('date') for item in items], dtype=float) / 1000)
+
+        shape = (len(items), len(components))
+
+        scheduled, received, present = np.full(shape, np.nan), np.full(shape, np.nan), np.zeros(shape, dtype=bool)
+
+        for idx, (component, scheduled_key) in enumerate(cls._SCHEDULE_COMPONENTS.items()):
+            amounts = [item.get(component) for item in items]
+
+            present[:, idx] = np.fromiter((v.__class__ is dict for v in amounts), dtype=bool, count=len(amounts))
+
+            scheduled[:, idx] = cls._to_numbers(cls._nested_values(amounts, scheduled_key))
+            received[:, idx] = cls._to_numbers(cls._nested_values(amounts, 'received'))
+
+        # Rows follow the payments, with the components of each payment next to each other
+        keep = present.ravel()
+
+        return pd.DataFrame({
+            'isin': pd.Categorical(np.repeat(isins, len(components))[keep]),
+            'loan': pd.Categorical(np.repeat(loans, len(components))[keep]),
+            'date': np.repeat(dates, len(components))[keep],
+            'component': pd.Categorical(np.tile(components, len(items))[keep], categories=components),
+            'scheduled': scheduled.ravel()[keep],
+            'received': received.ravel()[keep],
+        })
+
+    @classmethod
+    def import_cookies(cls, file_path: str) -> Union[dict, None]:
+        """
+        :param file_path: File path to unpickle cookies from
+        :return: Cookies of the stored session, or None if there's none or it has expired (See SessionVault)
+        """
+
+        from mintospy.session import SessionVault
+
+        session = SessionVault(file_path).load()
+
+        return None if session is None else session['cookies']
+
+    @classmethod
+    def read_csrf_token(cls, chunks: Iterable[bytes]) -> Union[str, None]:
+        """
+        :param chunks: Chunks of the web app page, as they're downloaded
+        :return: Content of the CSRF token meta tag, as soon as a chunk completes it, or None if the page has none
+        """
+
+        content, searched = b'', 0
+
+        for chunk in chunks:
+            content += chunk
+
+            # A tag that was cut between chunks starts after the last "<" that was already searched
+            start = content.rfind(b'<', 0, searched) if searched else 0
+
+            match = CSRF_META_TAG.search(content, max(start, 0))
+
+            searched = len(content)
+
+            if match is None:
+                continue
+
+            attribute = CONTENT_ATTRIBUTE.search(match.group())
+
+            if attribute is None:
+                return
+
+            return html.unescape((attribute.group(1) or attribute.group(2) or b'').decode())
 
     @classmethod
     def str_to_date(cls, __str: str) -> Union[date, str]:
@@ -188,6 +500,230 @@ class Utils:
         except json.decoder.JSONDecodeError:
             return s
 
+    @staticmethod
+    def sort_key(value: any, kind: str = 'number') -> tuple:
+        """
+        :param value: Value of the field a Mintos item is sorted by
+        :param kind: Type the field is sorted as (number, date or text, see CONSTANTS.LOANS_SORT_KEYS)
+        :return: Key that orders values the way Mintos does, regardless of their type
+        (Dates are compared as millisecond timestamps, whether they're timestamps or date strings)
+        """
+
+        if isinstance(value, dict):
+            value = value.get('amount', value.get('score'))
+
+        if value is None:
+            return 0, 0
+
+        if kind == 'text':
+            return 2, str(value)
+
+        if kind == 'date' and isinstance(value, str):
+            for date_format in ('%Y-%m-%dT%H:%M:%S%z', '%Y-%m-%d %H:%M:%S', '%Y-%m-%d', '%d.%m.%Y'):
+                try:
+                    return 1, datetime.strptime(value, date_format).timestamp() * 1000
+
+                except ValueError:
+                    continue
+
+        try:
+            return 1, float(value)
+
+        except (TypeError, ValueError):
+            return 2, str(value)
+
+    @classmethod
+    def _timestamps_to_dates(cls, column: 'pd.Series') -> 'pd.Series':
+        """
+        :param column: Column with millisecond timestamps (Values that aren't timestamps are parsed as floats)
+        :return: Column with the local dates of the timestamps
+        """
+
+        import pandas as pd
+        import numpy as np
+
+        if pd.api.types.infer_dtype(column, skipna=True) in {'integer', 'floating', 'mixed-integer-float'}:
+            is_timestamp = column.notna().to_numpy()
+
+        else:
+            is_timestamp = column.map(lambda v: isinstance(v, (float, int)) and not cls._is_missing(v)).to_numpy(bool)
+
+        parsed = cls._to_float_column(column[~is_timestamp]).astype(object)
+
+        local_times = pd.DatetimeIndex(cls._local_times(column[is_timestamp].to_numpy(dtype=float) / 1000))
+
+        dates = pd.Series(local_times.date, index=column.index[is_timestamp], dtype=object)
+
+        return pd.concat([parsed, dates]).reindex(column.index)
+
+    @staticmethod
+    def _local_times(seconds: 'np.ndarray') -> 'np.ndarray':
+        """
+        :param seconds: Unix timestamps
+        :return: Local times of the timestamps (NaT for NaN)
+        """
+
+        import numpy as np
+
+        local_times = np.full(len(seconds), np.datetime64('NaT'), dtype='datetime64[us]')
+
+        is_timestamp = ~np.isnan(seconds)
+
+        # UTC offsets only change on quarter-hour boundaries, so they're looked up once per quarter-hour
+        quarters, inverse = np.unique(seconds[is_timestamp] // 900 * 900, return_inverse=True)
+
+        offsets = np.array(
+            [
+                (
+                    datetime.fromtimestamp(q) - datetime.fromtimestamp(q, timezone.utc).replace(tzinfo=None)
+                ).total_seconds()
+                for q in quarters
+            ],
+            dtype=float,
+        )
+
+        local_seconds = seconds[is_timestamp] + offsets[inverse.reshape(-1)]
+
+        local_times[is_timestamp] = (local_seconds * 1e6).round().astype('datetime64[us]')
+
+        return local_times
+
+    @classmethod
+    def _local_days(cls, seconds: 'np.ndarray') -> 'np.ndarray':
+        """
+        :param seconds: Unix timestamps
+        :return: Local dates of the timestamps, as midnight datetimes (NaT for NaN)
+        """
+
+        return cls._local_times(seconds).astype('datetime64[D]').astype('datetime64[us]')
+
+    @staticmethod
+    def _to_float_column(column: 'pd.Series') -> 'pd.Series':
+        """
+        Columnar equivalent of _str_to_float.
+        :param column: Column to convert
+        :return: Column with every value that can be converted to float rounded to 2 decimal places
+        """
+
+        import pandas as pd
+        import numpy as np
+
+        try:
+            numeric = column.astype(float)
+
+        except (TypeError, ValueError):
+            # Columns that aren't fully numeric are mostly repeated labels, so only their unique values are converted
+            codes, uniques = pd.factorize(column)
+
+            numeric_uniques = pd.to_numeric(pd.Series(uniques, dtype=object), errors='coerce').astype(float)
+
+            numeric = pd.Series(
+                np.where(codes >= 0, numeric_uniques.to_numpy()[codes], np.nan),
+                index=column.index,
+            )
+
+        scaled = numeric.to_numpy() * 100
+
+        # NumPy rounds halfway cases differently from round(), so those few values are rounded one by one
+        near_half = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+
+        rounded = numeric.round(2)
+
+        if near_half.any():
+            rounded[near_half] = [round(v, 2) for v in numeric[near_half]]
+
+        numeric = rounded
+
+        not_numeric = numeric.isna() & column.notna()
+
+        if not_numeric.any():
+            return numeric.astype(object).where(~not_numeric, column)
+
+        return numeric
+
+    @staticmethod
+    def _columns(items: List[dict]) -> Dict[str, list]:
+        """
+        :param items: Items to split into columns
+        :return: Values of every key, in the order keys first appear in the items (None where an item lacks the key)
+        """
+
+        keys = dict.fromkeys(items[0]) if items else {}
+
+        # Items of an endpoint mostly have the same keys, so only the others are looked through
+        for item in items:
+            if item.keys() != keys.keys():
+                keys.update(dict.fromkeys(item))
+
+        columns = {}
+
+        for k in keys:
+            try:
+                columns[k] = list(map(itemgetter(k), items))
+
+            except KeyError:
+                columns[k] = [item.get(k) for item in items]
+
+        return columns
+
+    @staticmethod
+    def _nested_values(values: list, key: str) -> list:
+        """
+        :param values: Nested dictionaries
+        :param key: Key to get from each dictionary
+        :return: Value of the key in each dictionary (None for missing keys, and values that aren't dictionaries)
+        """
+
+        if set(map(type, values)) == {dict}:
+            try:
+                return list(map(itemgetter(key), values))
+
+            except KeyError:
+                return list(map(methodcaller('get', key), values))
+
+        return [v.get(key) if v.__class__ is dict else None for v in values]
+
+    @staticmethod
+    def _to_numbers(values: list) -> 'np.ndarray':
+        """
+        :param values: Numbers or numeric strings
+        :return: Float array of the values (NaN for missing values and values that aren't numbers)
+        """
+
+        import pandas as pd
+        import numpy as np
+
+        try:
+            return np.array(values, dtype=float)
+
+        except (TypeError, ValueError):
+            return pd.to_numeric(pd.Series(values, dtype=object), errors='coerce').to_numpy(dtype=float)
+
+    @staticmethod
+    def _truthy(column: 'pd.Series') -> 'pd.Series':
+        """
+        :param column: Column to filter
+        :return: Column with every falsy value replaced by NaN
+        """
+
+        column = column.astype(object)
+
+        return column.where(column.notna().to_numpy() & column.to_numpy().astype(bool))
+
+    @staticmethod
+    def _first_row(items: List[dict], key: str) -> int:
+        """
+        :param items: Items to search
+        :param key: Key to search for
+        :return: Index of the first item that contains the key
+        """
+
+        return next((idx for idx, item in enumerate(items) if key in item), len(items))
+
+    @staticmethod
+    def _is_missing(value: any) -> bool:
+        return value is None or (isinstance(value, float) and math.isnan(value))
+
     @staticmethod
     def _str_to_float(__str: str) -> any:
         try:
@@ -7,19 +7,29 @@ setup(
     license='MIT',
     author='Tomás Perestrelo',
     author_email='tomasperestrelo21@gmail.com',
-    packages=find_packages(exclude=('tests*', 'testing*')),
+    packages=find_packages(exclude=('tests*', 'testing*', 'benchmarks*')),
     url='https://github.com/thicccat688/mintospy',
     download_url='https://pypi.org/project/mintospy',
     keywords='python, api, api-wrapper, mintos',
     long_description=open('README.rst', 'r').read(),
     long_description_content_type='text/markdown',
     install_requires=[
-        'selenium-recaptcha-solver',
-        'undetected-chromedriver',
-        'selenium',
         'cloudscraper',
+        'httpx',
         'pandas',
-        'pyotp',
-        'bs4',
     ],
+    extras_require={
+        'browser': [
+            'selenium-recaptcha-solver',
+            'undetected-chromedriver',
+            'selenium',
+            'pyotp',
+        ],
+        'arrow': [
+            'pyarrow',
+        ],
+        'fast': [
+            'orjson',
+        ],
+    },
 )
@@ -0,0 +1 @@
+from testing.server import MintosStandIn
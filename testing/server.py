@@ -0,0 +1,594 @@
+from mintospy.endpoints import ENDPOINTS
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+from http.cookies import SimpleCookie
+from datetime import datetime
+from typing import Tuple, List
+import threading
+import math
+import random
+import time
+import json
+import re
+
+
+CURRENCIES = {'EUR': 978, 'KZT': 398, 'PLN': 985, 'GBP': 826}
+
+LENDERS = ['Mogo', 'Wowwo', 'Kviku', 'Creditstar', 'IuteCredit', 'Eleving']
+
+COUNTRIES = ['Latvia', 'Kazakhstan', 'Poland', 'Mexico', 'Moldova']
+
+PAGE_TEMPLATE = (
+    '<html><head><meta data-hid="csrf-token" name="csrf-token" content="{token}"></head><body></body></html>'
+)
+
+PURCHASE_EPOCH_MS = 1650000000000
+
+HOUR_MS = 3_600_000
+
+LOGIN_TEMPLATE = '''<html><head><link rel="preload" href="/en/assets/inter.woff2" as="font" crossorigin></head><body>
+<img src="/en/assets/logo.png">
+<form method="post" action="{action}">{fields}<button type="submit">Log in</button></form>
+</body></html>'''
+
+CREDENTIALS_FIELDS = (
+    '{error}<input id="login-username" name="username" type="email">'
+    '<input id="login-password" name="password" type="password">'
+)
+
+TFA_FIELDS = '{error}<label> 6-digit code </label><input name="code" type="text">'
+
+OVERVIEW_TEMPLATE = '<html><body><img src="/en/assets/logo.png"><div id="header-wrapper">Overview</div></body></html>'
+
+# How the stand-in orders loans by each sort field of the loans endpoints
+LOAN_SORT_KEYS = {
+    'isin': lambda loan: loan['isin'],
+    'mintosRiskScoreDecimal': lambda loan: float(loan['mintosRiskScore']['score']),
+    'lender': lambda loan: loan['lender'],
+    'maturityDate': lambda loan: loan['loanDtEnd'],
+    'aggregateNominalValue': lambda loan: float(loan['aggregateNominalValue']['amount']),
+    'interestRate': lambda loan: float(loan['interestRate']),
+    'availableForInvestmentAmount': lambda loan: float(loan['availableForInvestmentAmount']['amount']),
+}
+
+ERROR_TEMPLATE = '<html><head><title>Just a moment...</title></head><body>Error {status}</body></html>'
+
+
+class MintosStandIn:
+    def __init__(
+            self,
+            investments: int = 1_000,
+            claims: int = 1_000,
+            loans: int = 1_000,
+            schedule_loans: int = 20,
+            latency: float = 0,
+            fail_every: int = 0,
+            fail_status: int = 503,
+            seed: int = 0,
+            email: str = 'investor@example.com',
+            password: str = 'password',
+            tfa_secret: str = None,
+    ):
+        """
+        Local HTTP stand-in of the Mintos endpoints used by MintosApi, serving synthetic but realistically shaped data.
+        Used as a context manager, it points ENDPOINTS to itself on entry and back to Mintos on exit.
+        Investments are purchased an hour apart, in index order, and are returned ordered by purchase date (Ascending
+        or descending as requested, whatever the sort field). The minimum purchase date filter is applied to them.
+        Loans are sorted by the requested sort field and order, like Mintos sorts them.
+        User endpoints answer 401 unless the MW_SESSION cookie matches the session attribute, which can be changed to
+        expire the sessions of existing clients.
+        The login pages are plain HTML forms with the elements MintosApi.login looks for (Without any ReCAPTCHA), so a
+        browser can log in to the session. They reference an image and a font, whose requests are counted in assets.
+        :param investments: Current (and finished) notes in the portfolio, per currency
+        :param claims: Current (and finished) claims in the portfolio, per currency
+        :param loans: Loans on each market, per currency
+        :param schedule_loans: Loans in each Note (Rows of each payment schedule and list of Note loans)
+        :param latency: Seconds every response is delayed by
+        :param fail_every: Answer every nth API request with an HTML error page instead of its data (Never if 0)
+        :param fail_status: Status code of the error pages (429 responses ask to retry right away)
+        :param seed: Seed of the synthetic data (Same seed and sizes always serve the same data)
+        :param email: Email the login page accepts
+        :param password: Password the login page accepts
+        :param tfa_secret: Base32 secret of the two-factor codes the login page asks for (No code is asked if None)
+        """
+
+        self.investments = investments
+        self.claims = claims
+        self.loans = loans
+        self.schedule_loans = schedule_loans
+        self.latency = latency
+        self.fail_every = fail_every
+        self.fail_status = fail_status
+        self.seed = seed
+        self.email = email
+        self.password = password
+        self.tfa_secret = tfa_secret
+
+        self.session = 'stand-in'
+        self.requests = 0
+        self.pages = 0
+        self.assets = 0
+
+        self._server = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+        self._loans_cache = {}
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+
+        return f'http://{host}:{port}'
+
+    @property
+    def cookies(self) -> dict:
+        """
+        :return: Cookies to create a MintosApi client with, which skip the browser login
+        """
+
+        return {'MW_SESSION': self.session}
+
+    def start(self) -> 'MintosStandIn':
+        handler = type('Handler', (_Handler,), {'stand_in': self})
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        self._server.daemon_threads = True
+
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+        self._thread.join()
+
+    def __enter__(self) -> 'MintosStandIn':
+        self.start()
+
+        ENDPOINTS.configure(base_uri=f'{self.url}/webapp/api', web_app_uri=f'{self.url}/en')
+
+        return self
+
+    def __exit__(self, *args) -> None:
+        ENDPOINTS.configure()
+
+        self.stop()
+
+    def handle(self, method: str, path: str, query: dict, body: dict, session: str = None) -> Tuple[int, any]:
+        """
+        :param method: HTTP method of the request
+        :param path: Path of the request, relative to the API base URI
+        :param query: Query string parameters of the request
+        :param body: JSON or form body of the request
+        :param session: Session cookie of the request
+        :return: Status code and JSON serializable response (None for an error page)
+        """
+
+        with self._lock:
+            self.requests += 1
+
+            failing = self.fail_every and self.requests % self.fail_every == 0
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        if failing:
+            return self.fail_status, None
+
+        if '/user/' in path and session != self.session:
+            return 401, {'errors': [{'message': 'Unauthorized'}]}
+
+        for pattern, route_method, route in self._routes():
+            match = re.fullmatch(pattern, path)
+
+            if match and method == route_method:
+                return 200, route(*match.groups(), query=query, body=body)
+
+        return 404, {'errors': [{'message': f'No route for {method} {path}'}]}
+
+    def _routes(self) -> List[tuple]:
+        return [
+            (r'/marketplace-api/v1/currencies', 'GET', self._currencies),
+            (r'/marketplace-api/v1/countries', 'GET', self._countries),
+            (r'/marketplace-api/v1/lender-companies', 'GET', self._lending_companies),
+            (r'/marketplace-api/v1/user/overview/currency/(\d+)/portfolio-data', 'GET', self._portfolio_data),
+            (r'/en/webapp-api/user/overview-net-annual-returns', 'GET', self._net_annual_return),
+            (r'/en/webapp-api/user/overview-aggregates', 'GET', self._aggregates_overview),
+            (r'/marketplace-api/v1/user/note-series/investments/(current|finished)', 'POST', self._investments),
+            (r'/en/webapp-api/user/investments/filters', 'GET', self._investment_filters),
+            (r'/en/webapp-api/user/investments', 'POST', self._claims),
+            (r'/en/webapp-api/loans/(\d+)/summary', 'GET', self._claim_summary),
+            (r'/marketplace-api/v1/note-series/(primary|secondary)', 'POST', self._loans),
+            (r'/en/webapp-api/market/primary/filters', 'GET', self._loan_filters),
+            (r'/marketplace-api/v1/note-series/(\w{12})/loans', 'GET', self._note_loans),
+            (r'/marketplace-api/v1/note-series/(\w{12})/payment-schedule', 'GET', self._note_schedule),
+        ]
+
+    @staticmethod
+    def _currencies(**_) -> dict:
+        return {
+            'items': [
+                {'abbreviation': abbreviation, 'isoCode': iso_code, 'name': abbreviation}
+                for abbreviation, iso_code in CURRENCIES.items()
+            ],
+        }
+
+    @staticmethod
+    def _countries(**_) -> dict:
+        return {'countries': [{'name': name, 'id': idx + 1} for idx, name in enumerate(COUNTRIES)]}
+
+    @staticmethod
+    def _lending_companies(**_) -> dict:
+        return {'items': [{'name': name, 'id': idx + 1, 'status': 'active'} for idx, name in enumerate(LENDERS)]}
+
+    def _portfolio_data(self, currency_iso_code: str, **_) -> dict:
+        rng = random.Random(f'{self.seed}-portfolio-{currency_iso_code}')
+
+        return {
+            'activeFunds': f'{rng.uniform(1_000, 10_000):.2f}',
+            'lateFunds': f'{rng.uniform(0, 500):.2f}',
+            'badDebt': f'{rng.uniform(0, 100):.2f}',
+            'defaultedFunds': f'{rng.uniform(0, 100):.2f}',
+            'inRecovery': f'{rng.uniform(0, 100):.2f}',
+            'activeInvestmentsCount': self.investments,
+        }
+
+    def _net_annual_return(self, query: dict, **_) -> dict:
+        rng = random.Random(f'{self.seed}-nar-{query.get("currencyIsoCode")}')
+
+        return {
+            'netAnnualReturn': f'{rng.uniform(5, 15):.2f}',
+            'netAnnualReturnWithBonuses': f'{rng.uniform(5, 15):.2f}',
+        }
+
+    def _aggregates_overview(self, query: dict, **_) -> dict:
+        rng = random.Random(f'{self.seed}-aggregates-{query.get("currencyIsoCode")}')
+
+        return {
+            'outstandingPrincipal': f'{rng.uniform(1_000, 10_000):.2f}',
+            'pendingPayments': f'{rng.uniform(0, 100):.2f}',
+            'activeFunds': f'{rng.uniform(1_000, 10_000):.2f}',
+        }
+
+    def _investments(self, status: str, body: dict, **_) -> dict:
+        page, max_results = body['pagination']['page'], body['pagination']['maxResults']
+
+        currency = self._currency(body['currency'])
+
+        indices = self._purchased_since(self.investments, body.get('investmentDateFrom'))
+
+        if body['sorting']['sortOrder'] == 'DESC':
+            indices = indices[::-1]
+
+        items = [
+            self._note(f'{status}-{currency}', idx, currency, finished=status == 'finished')
+            for idx in self._page(indices, page, max_results)
+        ]
+
+        return {'items': items, 'pagination': {'total': len(indices), 'page': page, 'maxResults': max_results}}
+
+    def _claims(self, body: dict, **_) -> dict:
+        page, max_results = int(body['page']), int(body['max_results'])
+
+        currency, finished = self._currency(body['currency']), str(body.get('status')) == '1'
+
+        indices = self._purchased_since(self.claims, body.get('investmentDateFrom'))
+
+        if body.get('sort_order') == 'DESC':
+            indices = indices[::-1]
+
+        data = [self._claim(currency, idx, finished) for idx in self._page(indices, page, max_results)]
+
+        return {'data': data, 'pagination': {'total': len(indices), 'page': page, 'maxResults': max_results}}
+
+    def _loans(self, market: str, body: dict, **_) -> dict:
+        page, max_results = body['pagination']['page'], body['pagination']['maxResults']
+
+        currencies = [self._currency(iso_code) for iso_code in body['currencies']]
+
+        total = self.loans * len(currencies)
+
+        sorting = body['sorting']
+
+        loans = self._sorted_loans(market, tuple(currencies), sorting['sortField'], sorting['sortOrder'])
+
+        items = [loans[idx] for idx in self._page(range(total), page, max_results)]
+
+        return {'items': items, 'pagination': {'total': total, 'page': page, 'maxResults': max_results}}
+
+    def _sorted_loans(self, market: str, currencies: Tuple[str, ...], sort_field: str, sort_order: str) -> List[dict]:
+        """
+        :param market: Market of the loans (primary or secondary)
+        :param currencies: Currencies of the loans
+        :param sort_field: Field the loans are sorted by
+        :param sort_order: ASC or DESC
+        :return: Every loan of the market in the currencies, sorted (Built once per query)
+        """
+
+        key = (market, currencies, sort_field, sort_order)
+
+        with self._lock:
+            loans = self._loans_cache.get(key)
+
+        if loans is not None:
+            return loans
+
+        loans = []
+
+        # Each currency has the same loans whichever other currencies are queried with it
+        for currency, idx in ((currency, idx) for currency in currencies for idx in range(self.loans)):
+            loan = self._note(f'{market}-{currency}', idx, currency)
+
+            rng = random.Random(f'{self.seed}-{market}-loan-{currency}-{idx}')
+
+            loan['aggregateNominalValue'] = {'amount': f'{rng.uniform(1_000, 100_000):.2f}', 'currency': currency}
+            loan['availableForInvestmentAmount'] = {'amount': f'{rng.uniform(0, 1_000):.2f}', 'currency': currency}
+
+            loans.append(loan)
+
+        loans.sort(key=LOAN_SORT_KEYS[sort_field], reverse=sort_order == 'DESC')
+
+        with self._lock:
+            self._loans_cache[key] = loans
+
+        return loans
+
+    @staticmethod
+    def _investment_filters(**_) -> dict:
+        return {'autoInvestDefinitions': [{'id': 1, 'label': 'Stand-in strategy'}]}
+
+    @staticmethod
+    def _loan_filters(**_) -> dict:
+        return {'lenderCompanies': [{'id': idx + 1, 'name': name} for idx, name in enumerate(LENDERS)]}
+
+    def _claim_summary(self, claim_id: str, **_) -> dict:
+        rng = random.Random(f'{self.seed}-summary-{claim_id}')
+
+        return {
+            'id': int(claim_id),
+            'lender': rng.choice(LENDERS),
+            'interestRate': f'{rng.uniform(5, 20):.2f}',
+            'amount': f'{rng.uniform(1, 500):.2f}',
+            'receivedAmount': f'{rng.uniform(0, 50):.2f}',
+            'status': rng.choice(['current', 'late', 'finished']),
+        }
+
+    def _note_loans(self, isin: str, **_) -> dict:
+        rng = random.Random(f'{self.seed}-note-loans-{isin}')
+
+        return {
+            'items': [
+                {
+                    'id': idx + 1,
+                    'identifier': f'{isin}-{idx + 1}',
+                    'lender': rng.choice(LENDERS),
+                    'country': rng.choice(COUNTRIES),
+                    'interestRate': f'{rng.uniform(5, 20):.2f}',
+                    'amount': f'{rng.uniform(10, 5_000):.2f}',
+                    'term': rng.randint(1, 60),
+                }
+                for idx in range(self.schedule_loans)
+            ],
+        }
+
+    def _note_schedule(self, isin: str, **_) -> dict:
+        rng = random.Random(f'{self.seed}-schedule-{isin}')
+
+        def component(*keys: str) -> dict:
+            scheduled = rng.uniform(0, 50)
+
+            return {
+                keys[0]: f'{scheduled:.2f}',
+                'received': f'{scheduled * rng.choice([0, 1]):.2f}',
+                'hasRemainder': rng.choice([True, False]),
+            }
+
+        schedule = []
+
+        for idx in range(self.schedule_loans):
+            schedule.append({
+                'loan': {'id': idx + 1, 'identifier': f'{isin}-{idx + 1}'},
+                'currency': {'abbreviation': 'EUR', 'isoCode': CURRENCIES['EUR']},
+                'date': 1690000000000 + idx * 86_400_000,
+                'number': idx + 1,
+                'isPrepaid': False,
+                'total': component('scheduled'),
+                'principal': component('scheduled'),
+                'interest': component('scheduled'),
+                'delayedInterest': component('accumulated'),
+                'latePaymentFee': component('accumulated'),
+            })
+
+        return {'paymentSchedule': schedule}
+
+    def _note(self, kind: str, idx: int, currency: str, finished: bool = False) -> dict:
+        rng = random.Random(f'{self.seed}-{kind}-{idx}')
+
+        note = {
+            'isin': f'LV{rng.randrange(10 ** 10):010d}',
+            'lender': rng.choice(LENDERS),
+            'country': rng.choice(COUNTRIES),
+            'interestRate': f'{rng.uniform(5, 20):.2f}',
+            'initialAmount': {'amount': f'{rng.uniform(10, 500):.2f}', 'currency': currency},
+            'amount': {'amount': f'{0 if finished else rng.uniform(0, 500):.2f}', 'currency': currency},
+            'pendingPayments': {'amount': f'{rng.uniform(0, 5):.2f}', 'currency': currency},
+            'mintosRiskScore': {
+                'score': f'{rng.uniform(1, 9):.1f}',
+                'subscores': {'buyback': f'{rng.uniform(1, 10):.1f}', 'structure': f'{rng.uniform(1, 10):.1f}'},
+            },
+            'createdAt': PURCHASE_EPOCH_MS + idx * HOUR_MS,
+            'loanDtEnd': 1690000000000 + rng.randrange(10 ** 10),
+            'term': rng.randint(1, 60),
+            'status': 'finished' if finished else rng.choice(['current', 'late']),
+            'isListed': rng.choice([True, False]),
+        }
+
+        if finished:
+            note['deletedAt'] = note['createdAt'] + 30 * 24 * HOUR_MS
+
+        return note
+
+    def _claim(self, currency: str, idx: int, finished: bool) -> dict:
+        rng = random.Random(f'{self.seed}-claim-{currency}-{finished}-{idx}')
+
+        claim = {
+            'id': 10 ** 8 + idx,
+            'lender_group': rng.choice(LENDERS),
+            'interest_rate': f'{rng.uniform(5, 20):.2f}',
+            'initial_amount': {'amount': f'{rng.uniform(10, 500):.2f}', 'currency': currency},
+            'amount': {'amount': f'{0 if finished else rng.uniform(0, 500):.2f}', 'currency': currency},
+            'received_amount': {'amount': f'{rng.uniform(0, 50):.2f}', 'currency': currency},
+            'term': rng.randint(1, 60),
+            'status': 'finished' if finished else rng.choice(['current', 'late']),
+            'purchased_at': PURCHASE_EPOCH_MS + idx * HOUR_MS,
+            'contracts': [],
+        }
+
+        if finished:
+            claim['finished_at'] = claim['purchased_at'] + 30 * 24 * HOUR_MS
+
+        return claim
+
+    @staticmethod
+    def _page(indices: range, page: int, max_results: int) -> range:
+        return indices[(page - 1) * max_results:page * max_results]
+
+    @staticmethod
+    def _purchased_since(total: int, date_from: str = None) -> range:
+        """
+        :param total: Investments in the portfolio
+        :param date_from: Minimum purchase date (dd.mm.yyyy), if filtered by it
+        :return: Indices of the investments purchased since the date
+        """
+
+        if not date_from:
+            return range(total)
+
+        date_from_ms = datetime.strptime(date_from, '%d.%m.%Y').timestamp() * 1000
+
+        first = math.ceil((date_from_ms - PURCHASE_EPOCH_MS) / HOUR_MS)
+
+        return range(min(max(first, 0), total), total)
+
+    @staticmethod
+    def _currency(iso_code: any) -> str:
+        for abbreviation, code in CURRENCIES.items():
+            if str(code) == str(iso_code):
+                return abbreviation
+
+        return 'EUR'
+
+
+class _Handler(BaseHTTPRequestHandler):
+    stand_in: MintosStandIn
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self) -> None:
+        self._respond('GET')
+
+    def do_POST(self) -> None:
+        self._respond('POST')
+
+    def _respond(self, method: str) -> None:
+        url = urlsplit(self.path)
+
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+
+        if url.path.startswith('/en/login') or url.path.startswith('/en/overview') or url.path.startswith('/en/assets'):
+            return self._login(method, url.path)
+
+        if url.path.rstrip('/') == '/en':
+            self.stand_in.pages += 1
+
+            return self._send(200, PAGE_TEMPLATE.format(token='stand-in-csrf-token'), 'text/html')
+
+        if not url.path.startswith('/webapp/api/'):
+            return self._send(404, json.dumps({'errors': [{'message': 'Not found'}]}))
+
+        cookies = SimpleCookie(self.headers.get('Cookie', ''))
+
+        session = cookies['MW_SESSION'].value if 'MW_SESSION' in cookies else None
+
+        status, response = self.stand_in.handle(method, url.path[len('/webapp/api'):], query, self._body(), session)
+
+        if response is None:
+            return self._send(status, ERROR_TEMPLATE.format(status=status), 'text/html', {'Retry-After': '0'})
+
+        self._send(status, json.dumps(response))
+
+    def _login(self, method: str, path: str) -> None:
+        stand_in = self.stand_in
+
+        if path.startswith('/en/assets'):
+            stand_in.assets += 1
+
+            return self._send(200, '', 'application/octet-stream')
+
+        if path.startswith('/en/overview'):
+            return self._send(200, OVERVIEW_TEMPLATE, 'text/html')
+
+        body = self._body() if method == 'POST' else {}
+
+        if path.rstrip('/') == '/en/login/otp':
+            import pyotp
+
+            if method == 'POST' and pyotp.TOTP(stand_in.tfa_secret).verify(body.get('code', '')):
+                return self._logged_in()
+
+            error = '<p class="m-u-color-r4--text">Invalid two-factor code</p>' if method == 'POST' else ''
+
+            fields = TFA_FIELDS.format(error=error)
+
+            return self._send(200, LOGIN_TEMPLATE.format(action=path, fields=fields), 'text/html')
+
+        if method == 'POST' and (body.get('username'), body.get('password')) == (stand_in.email, stand_in.password):
+            if stand_in.tfa_secret is None:
+                return self._logged_in()
+
+            return self._send(303, '', 'text/html', {'Location': '/en/login/otp'})
+
+        error = '<div class="account-login-error">Invalid username or password</div>' if method == 'POST' else ''
+
+        fields = CREDENTIALS_FIELDS.format(error=error)
+
+        self._send(200, LOGIN_TEMPLATE.format(action='/en/login', fields=fields), 'text/html')
+
+    def _logged_in(self) -> None:
+        headers = {'Location': '/en/overview', 'Set-Cookie': f'MW_SESSION={self.stand_in.session}; Path=/'}
+
+        self._send(303, '', 'text/html', headers)
+
+    def _body(self) -> dict:
+        length = int(self.headers.get('Content-Length') or 0)
+
+        if length == 0:
+            return {}
+
+        content = self.rfile.read(length).decode()
+
+        if self.headers.get('Content-Type', '').startswith('application/json'):
+            return json.loads(content)
+
+        return {k: v[0] if len(v) == 1 else v for k, v in parse_qs(content).items()}
+
+    def _send(self, status: int, content: str, content_type: str = 'application/json', headers: dict = None) -> None:
+        encoded = content.encode()
+
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(encoded)))
+
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+
+        self.end_headers()
+
+        self.wfile.write(encoded)
+
+    def log_message(self, *args) -> None:
+        pass
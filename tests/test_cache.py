@@ -0,0 +1,155 @@
+from mintospy.cache import DiskCache, ResponseCache
+from mintospy.endpoints import ENDPOINTS
+import multiprocessing
+import json
+import time
+import os
+
+
+def _set_items(directory: str, process: int) -> None:
+    cache = DiskCache(directory)
+
+    for item in range(10):
+        cache.set_items('claim_details', {f'{process}_{item}': item}, ttl=60)
+
+
+def test_missing_entry_is_loaded_and_saved(tmp_path):
+    cache = DiskCache(str(tmp_path))
+
+    assert cache.get('currencies', lambda: {'EUR': {'isoCode': 978}}, ttl=60) == {'EUR': {'isoCode': 978}}
+    assert cache.get('currencies', lambda: {}, ttl=60) == {'EUR': {'isoCode': 978}}
+    assert os.listdir(tmp_path) == ['currencies.json']
+
+
+def test_stale_entry_is_returned_and_refreshed(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    cache.set('countries', {'Latvia': 1}, ttl=-1)
+
+    assert cache.get('countries', lambda: {'Latvia': 2}, ttl=60) == {'Latvia': 1}
+
+    for _ in range(100):
+        if not cache._refreshing:
+            break
+
+        time.sleep(0.01)
+
+    assert cache.get('countries', lambda: {}, ttl=60) == {'Latvia': 2}
+
+
+def test_corrupt_entry_is_reloaded(tmp_path):
+    cache = DiskCache(str(tmp_path))
+
+    with open(tmp_path / 'loan_filters.json', 'w') as f:
+        f.write('{"data": ')
+
+    assert cache.get('loan_filters', lambda: {'strategies': []}, ttl=60) == {'strategies': []}
+
+    with open(tmp_path / 'loan_filters.json') as f:
+        assert json.load(f)['data'] == {'strategies': []}
+
+
+def test_items(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    cache.set_items('claim_details', {'1': {'id': 1}, '2': {'id': 2}}, ttl=60)
+    cache.set_items('claim_details', {'3': {'id': 3}}, ttl=-1)
+
+    assert cache.get_items('claim_details') == {'1': {'id': 1}, '2': {'id': 2}}
+    assert cache.get_items('claim_summaries') == {}
+    assert sorted(os.listdir(tmp_path)) == ['claim_details.json', 'claim_details.json.lock']
+    assert not cache._refreshing
+
+
+def test_expired_items_are_pruned(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    cache.set_items('claim_details', {'1': {'id': 1}}, ttl=-1)
+    cache.set_items('claim_details', {'2': {'id': 2}}, ttl=60)
+
+    with open(tmp_path / 'claim_details.json') as f:
+        assert list(json.load(f)['data']) == ['2']
+
+
+def test_items_across_processes(tmp_path):
+    processes = [multiprocessing.Process(target=_set_items, args=(str(tmp_path), process)) for process in range(4)]
+
+    for process in processes:
+        process.start()
+
+    for process in processes:
+        process.join()
+
+    assert len(DiskCache(str(tmp_path)).get_items('claim_details')) == 40
+
+
+def test_invalidate(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    cache.set('currencies', {}, ttl=60)
+    cache.set('countries', {}, ttl=60)
+
+    cache.invalidate('currencies')
+    assert os.listdir(tmp_path) == ['countries.json']
+
+    cache.invalidate()
+    assert os.listdir(tmp_path) == []
+
+
+def test_response_cache_key():
+    cache = ResponseCache(ttls={'/en/webapp-api/user/overview-aggregates': 60})
+
+    url = ENDPOINTS.API_AGGREGATES_OVERVIEW_URI
+
+    key = cache.key('GET', url, {'params': {'currencyIsoCode': 978, 'lenderStatus': 'All'}, 'timeout': 30})
+
+    assert key == cache.key('get', url, {'params': {'lenderStatus': 'All', 'currencyIsoCode': 978}})
+    assert key != cache.key('GET', url, {'params': {'currencyIsoCode': 398, 'lenderStatus': 'All'}})
+    assert cache.key('GET', ENDPOINTS.API_NAR_URI, {}) is None
+
+
+def test_response_cache_namespaces():
+    cache = ResponseCache(ttls={'/en/webapp-api/user/overview-aggregates': 60})
+
+    url, kwargs = ENDPOINTS.API_AGGREGATES_OVERVIEW_URI, {'params': {'currencyIsoCode': 978}}
+
+    first, second = cache.key('GET', url, kwargs, 'first'), cache.key('GET', url, kwargs, 'second')
+
+    assert first != second
+
+    cache.set(first, url, b'{}', 'first')
+    cache.set(second, url, b'{}', 'second')
+
+    cache.invalidate(namespace='first')
+
+    assert cache.get(first) is None and cache.get(second) == b'{}'
+
+
+def test_response_cache_expiry_and_invalidation():
+    cache = ResponseCache(ttls={'/en/webapp-api/user/overview-aggregates': 60, '/en/webapp-api/loans/{id}/summary': -1})
+
+    aggregates_url, summary_url = ENDPOINTS.API_AGGREGATES_OVERVIEW_URI, f'{ENDPOINTS.API_CLAIMS_DETAILS_URI}/1/summary'
+
+    cache.set('aggregates', aggregates_url, b'{}')
+    cache.set('summary', summary_url, b'{}')
+
+    assert cache.get('aggregates') == b'{}'
+    assert cache.get('summary') is None
+
+    cache.invalidate('/en/webapp-api/user/overview-aggregates')
+
+    assert cache.get('aggregates') is None
+    assert cache.stats() == {'hits': 1, 'misses': 2, 'evictions': 0, 'entries': 0, 'bytes': 0}
+
+
+def test_response_cache_eviction():
+    cache = ResponseCache(ttls={'/en/webapp-api/user/overview-aggregates': 60}, max_bytes=10)
+
+    url = ENDPOINTS.API_AGGREGATES_OVERVIEW_URI
+
+    cache.set('first', url, b'1234')
+    cache.set('second', url, b'1234')
+
+    # Reading the first response makes the second one the least recently used
+    cache.get('first')
+    cache.set('third', url, b'1234')
+
+    assert cache.get('second') is None
+    assert cache.get('first') == cache.get('third') == b'1234'
+    assert cache.stats()['evictions'] == 1 and cache.bytes == 8
@@ -0,0 +1,76 @@
+from mintospy.export import TableExport, ParquetExport
+import pandas as pd
+import pytest
+
+
+PAGES = [
+    pd.DataFrame({'isin': ['LV0000000001', 'LV0000000002'], 'amount': [1.5, 2.0], 'lender': [None, None]}),
+    pd.DataFrame({'isin': ['LV0000000003'], 'amount': [3.0], 'lender': ['Mogo']}),
+    pd.DataFrame({'isin': ['LV0000000004'], 'amount': [None], 'lender': [None]}),
+]
+
+WIDENING_PAGES = [
+    pd.DataFrame({'isin': ['LV0000000001', 'LV0000000002'], 'amount': [1, 2]}),
+    pd.DataFrame({'isin': ['LV0000000003'], 'amount': [1.5], 'lender': ['Mogo']}),
+    pd.DataFrame({'isin': ['LV0000000004'], 'amount': ['N/A']}),
+]
+
+
+def test_table_export_widens_empty_columns():
+    pytest.importorskip('pyarrow')
+
+    export = TableExport()
+
+    for page in PAGES:
+        export.write(page, {'currency': 'EUR'})
+
+    table = export.table
+
+    assert table.num_rows == 4
+    assert table.column('lender').to_pylist() == [None, None, 'Mogo', None]
+
+
+def test_parquet_export_widens_empty_columns(tmp_path):
+    dataset = pytest.importorskip('pyarrow.dataset')
+
+    with ParquetExport(str(tmp_path)) as export:
+        for page in PAGES:
+            export.write(page, {'currency': 'EUR'})
+
+    table = dataset.dataset(str(tmp_path), partitioning='hive').to_table()
+
+    assert table.column('isin').to_pylist() == ['LV0000000001', 'LV0000000002', 'LV0000000003', 'LV0000000004']
+    assert table.column('lender').to_pylist() == [None, None, 'Mogo', None]
+    assert str(table.schema.field('lender').type) != 'null'
+
+
+def test_table_export_widens_types_and_adds_columns():
+    pytest.importorskip('pyarrow')
+
+    export = TableExport()
+
+    for page in WIDENING_PAGES[:2]:
+        export.write(page, {'currency': 'EUR'})
+
+    table = export.table
+
+    assert table.column('amount').to_pylist() == [1.0, 2.0, 1.5]
+    assert str(table.schema.field('amount').type) == 'double'
+    assert table.column('lender').to_pylist() == [None, None, 'Mogo']
+
+    export.write(WIDENING_PAGES[2], {'currency': 'EUR'})
+
+    assert export.table.column('amount').to_pylist() == ['1', '2', '1.5', 'N/A']
+
+
+def test_parquet_export_widens_types_and_adds_columns(tmp_path):
+    dataset = pytest.importorskip('pyarrow.dataset')
+
+    with ParquetExport(str(tmp_path)) as export:
+        for page in WIDENING_PAGES[:2]:
+            export.write(page, {'currency': 'EUR'})
+
+    table = dataset.dataset(str(tmp_path), partitioning='hive').to_table()
+
+    assert table.column('amount').to_pylist() == [1.0, 2.0, 1.5]
+    assert table.column('lender').to_pylist() == [None, None, 'Mogo']
@@ -0,0 +1,579 @@
+from mintospy.hooks import MetricsCollector
+from mintospy.exceptions import MintosException, NetworkException
+from mintospy.constants import CONSTANTS
+from mintospy.cache import DiskCache, ResponseCache
+from mintospy.export import TableExport, ParquetExport
+from mintospy.sync import PortfolioSync
+from mintospy.async_api import AsyncMintosApi
+from mintospy.api import MintosApi
+from mintospy.utils import Utils
+from mintospy import codec
+from testing import MintosStandIn
+import threading
+import asyncio
+import shutil
+import sys
+import pytest
+import time
+import json
+import os
+
+
+@pytest.fixture(scope='module')
+def stand_in(tmp_path_factory):
+    mp = pytest.MonkeyPatch()
+
+    mp.setattr(CONSTANTS, 'CACHE', DiskCache(str(tmp_path_factory.mktemp('cache'))))
+    mp.setattr(CONSTANTS, 'CURRENCIES', None)
+    mp.setattr(CONSTANTS, 'COUNTRIES', None)
+    mp.setattr(CONSTANTS, 'LENDING_COMPANIES', None)
+
+    with MintosStandIn(investments=700, claims=450, loans=400, schedule_loans=12) as server:
+        yield server
+
+    mp.undo()
+
+
+@pytest.fixture(scope='module')
+def mintos_client(stand_in):
+    return MintosApi(cookies=stand_in.cookies, save_cookies=False)
+
+
+@pytest.mark.parametrize('current, claims', [(True, True), (True, False), (False, True), (False, False)])
+def test_investments(mintos_client, current: bool, claims: bool):
+    investments = mintos_client.get_investments(currency='EUR', quantity=1000, current=current, claims=claims)
+
+    assert len(investments) == (450 if claims else 700)
+    assert investments.index.is_unique
+
+
+def test_iter_investments(mintos_client):
+    pages = list(mintos_client.iter_investments(currency='KZT', quantity=650, frames=True))
+
+    assert [len(page) for page in pages] == [300, 300, 50]
+
+
+@pytest.mark.parametrize('backend', ['orjson', 'json'])
+def test_undecoded_pages(mintos_client, monkeypatch, backend: str):
+    pytest.importorskip(backend)
+
+    monkeypatch.setattr(codec, 'BACKEND', backend)
+
+    bodies = list(mintos_client.iter_investments(currency='EUR', claims=True, undecoded=True))
+
+    pages = list(mintos_client.iter_investments(currency='EUR', claims=True, frames=True, raw=True))
+
+    assert all(isinstance(body, bytes) for body in bodies)
+    assert [MintosApi._investment_items(json.loads(body), True) for body in bodies] == pages
+
+
+@pytest.mark.parametrize('split_currencies', [True, False])
+def test_loans(mintos_client, split_currencies: bool):
+    loans = mintos_client.get_loans(currencies=['EUR', 'KZT'], quantity=500, split_currencies=split_currencies)
+
+    assert len(loans) == 500
+    assert set(loans['currency']) == {'EUR', 'KZT'}
+
+
+@pytest.mark.parametrize('sort_field, ascending_sort', [
+    ('interest_rate', False),
+    ('risk_score', True),
+    ('lending_company', False),
+    ('remaining_term', True),
+    ('available_for_investment', False),
+])
+def test_split_currencies_order(mintos_client, sort_field: str, ascending_sort: bool):
+    kwargs = {'currencies': ['EUR', 'KZT'], 'quantity': 500, 'sort_field': sort_field, 'ascending_sort': ascending_sort}
+
+    merged = mintos_client.get_loans(split_currencies=True, raw=True, **kwargs)
+
+    expected = mintos_client.get_loans(split_currencies=False, raw=True, **kwargs)
+
+    field, kind = CONSTANTS.LOANS_SORT_KEYS[CONSTANTS.LOANS_SORT_FIELDS[sort_field]]
+
+    def keys(items: list) -> list:
+        return [Utils.sort_key(item.get(field), kind) for item in items]
+
+    # Both currencies are merged in the order a single query of both is sorted in
+    assert keys(merged) == keys(expected)
+    assert {item['amount']['currency'] for item in merged} == {'EUR', 'KZT'}
+
+
+def test_note_schedule(mintos_client):
+    schedule = mintos_client.get_note_schedule('LV0000000001')
+
+    assert len(schedule) == 12
+    assert schedule.equals(mintos_client.get_note_schedule('LV0000000001'))
+
+
+@pytest.mark.parametrize('claims', [False, True])
+def test_typed_investments(mintos_client, claims: bool):
+    investments = mintos_client.get_investments(currency='EUR', quantity=1000, claims=claims, current=False)
+
+    typed = mintos_client.get_investments(currency='EUR', quantity=1000, claims=claims, current=False, typed=True)
+
+    assert typed.index.equals(investments.index)
+    assert typed['status'].dtype == 'category'
+    assert typed['amount'].dtype == float
+    assert typed.select_dtypes('datetime').shape[1] == (2 if claims else 3)
+
+
+def test_typed_note_schedule(mintos_client):
+    schedule = mintos_client.get_note_schedule('LV0000000001', typed=True)
+
+    assert schedule['totalScheduled'].dtype == float
+    assert schedule['totalHasRemainder'].dtype == 'boolean'
+
+
+def test_note_schedules(mintos_client):
+    schedules = mintos_client.get_note_schedules(['LV0000000001', 'LV0000000002', 'LV0000000001'])
+
+    assert len(schedules) == 24
+    assert schedules.attrs['errors'] == {}
+    assert schedules.index.names == ['isin', 'identifier']
+
+    raw = mintos_client.get_note_schedules(['LV0000000001', 'XYZ'], raw=True)
+
+    assert list(raw) == ['LV0000000001'] and list(raw.errors) == ['XYZ']
+    assert isinstance(raw.errors['XYZ'], ValueError)
+
+
+def test_notes_loans(mintos_client):
+    loans = mintos_client.get_notes_loans(['LV0000000001', 'LV0000000002', 'LV0000000001', 'XYZ'])
+
+    assert len(loans) == 24
+    assert loans.index.names == ['isin', 'identifier']
+    assert list(loans.attrs['errors']) == ['XYZ']
+    assert loans.loc['LV0000000001'].equals(mintos_client.get_note_loans('LV0000000001'))
+
+    raw = mintos_client.get_notes_loans(['LV0000000001', 'XYZ'], raw=True)
+
+    assert raw['LV0000000001'] == mintos_client.get_note_loans('LV0000000001', raw=True)
+    assert list(raw) == ['LV0000000001'] and isinstance(raw.errors['XYZ'], ValueError)
+
+
+def test_claims_details(stand_in):
+    collector = MetricsCollector()
+
+    mintos_client = MintosApi(cookies=stand_in.cookies, save_cookies=False, hooks=[collector])
+    mintos_client._ensure_session()
+
+    claim_ids = list(range(1, 11))
+
+    details = mintos_client.get_claims_details([*claim_ids, 1, 'abc'])
+
+    assert list(details.index) == claim_ids
+    assert list(details.attrs['errors']) == ['abc']
+    assert details.loc[1].to_dict() == {
+        k: v for k, v in mintos_client.get_claim_details('1').items() if k != 'id'
+    }
+
+    CONSTANTS.CACHE.invalidate()
+    collector.reset()
+
+    # Details of finished claims are only fetched once
+    mintos_client.get_claims_details(claim_ids[:4], finished=True)
+    raw = mintos_client.get_claims_details(claim_ids, raw=True, finished=True)
+
+    assert len(collector.requests) == len(claim_ids)
+    assert list(raw) == claim_ids and raw[1] == mintos_client.get_claim_details('1', finished=True)
+    assert len(collector.requests) == len(claim_ids)
+
+    mintos_client.get_claims_details(claim_ids, cached=False, finished=True)
+    mintos_client.get_claims_details(claim_ids)
+
+    assert len(collector.requests) == 3 * len(claim_ids)
+
+    raw = mintos_client.get_claims_details(['abc'], raw=True)
+
+    assert raw == {} and isinstance(raw.errors['abc'], MintosException)
+
+
+def test_note_cash_flows(mintos_client):
+    cash_flows = mintos_client.get_note_schedules(['LV0000000001', 'LV0000000002'], cash_flows=True)
+
+    assert len(cash_flows) == 24 * 5
+    assert list(cash_flows.columns) == ['isin', 'loan', 'date', 'component', 'scheduled', 'received']
+
+    schedule = mintos_client.get_note_schedule('LV0000000001', typed=True)
+
+    totals = cash_flows[(cash_flows['isin'] == 'LV0000000001') & (cash_flows['component'] == 'total')]
+
+    assert totals['scheduled'].tolist() == schedule['totalScheduled'].tolist()
+
+
+def test_async_client(mintos_client):
+    async def main():
+        async with AsyncMintosApi(client=mintos_client) as async_api:
+            assert async_api.session.timeout.read == CONSTANTS.REQUEST_TIMEOUT_SECONDS
+
+            schedules = await async_api.get_note_schedules(['LV0000000001', 'XYZ'])
+
+            assert len(schedules) == 12 and list(schedules.attrs['errors']) == ['XYZ']
+
+            details = await async_api.get_claims_details(['1', 'abc'], finished=True)
+
+            assert list(details.index) == ['1'] and list(details.attrs['errors']) == ['abc']
+            assert await async_api.get_claim_details('1', finished=True) == mintos_client.get_claim_details('1')
+
+            loans = await async_api.get_notes_loans(['LV0000000001', 'LV0000000002'])
+
+            assert loans.equals(mintos_client.get_notes_loans(['LV0000000001', 'LV0000000002']))
+
+            dashboard = await async_api.get_dashboard(currencies=['EUR'], raw=True)
+
+            assert list(dashboard['EUR']) == ['portfolio_data', 'net_annual_return', 'aggregates_overview']
+
+            return await async_api.get_portfolio_data(currency='EUR')
+
+    assert asyncio.run(main()) == mintos_client.get_portfolio_data(currency='EUR')
+
+
+def test_overview(mintos_client):
+    assert isinstance(mintos_client.get_portfolio_data(currency='EUR'), dict)
+    assert isinstance(mintos_client.get_net_annual_return(currency='EUR'), dict)
+    assert isinstance(mintos_client.get_aggregates_overview(currency='EUR'), dict)
+
+
+def test_export_table(mintos_client):
+    pytest.importorskip('pyarrow')
+
+    export = TableExport()
+
+    assert mintos_client.export_investments(export, currencies=['EUR', 'KZT'], quantity=400) == 1600
+
+    table = export.table
+
+    assert table.num_rows == 1600
+    assert set(table.column('portfolio').to_pylist()) == {'current', 'finished'}
+    assert table.column('ISIN').null_count == 0
+
+    errors = mintos_client.export_note_schedules(export, isins=['LV0000000001', 'LV0000000002'])
+
+    assert errors == {} and export.table.num_rows == 1624
+
+
+def test_export_parquet(mintos_client, tmp_path):
+    dataset = pytest.importorskip('pyarrow.dataset')
+
+    with ParquetExport(str(tmp_path)) as export:
+        assert mintos_client.export_loans(export, currencies=['EUR', 'KZT']) == 800
+
+    assert sorted(os.listdir(tmp_path)) == ['currency=EUR', 'currency=KZT']
+
+    table = dataset.dataset(str(tmp_path), partitioning='hive').to_table()
+
+    assert table.num_rows == 800
+    assert set(table.column('currency').to_pylist()) == {'EUR', 'KZT'}
+
+
+def test_response_cache(stand_in, monkeypatch):
+    mintos_client = MintosApi(cookies=stand_in.cookies, save_cookies=False, response_cache=ResponseCache())
+
+    # Only the calls are counted, not starting the session or loading the currencies
+    mintos_client._ensure_session()
+    CONSTANTS.get_currency_iso('EUR')
+
+    monkeypatch.setattr(stand_in, 'requests', 0)
+
+    overviews = [mintos_client.get_aggregates_overview('EUR') for _ in range(5)]
+
+    assert stand_in.requests == 1 and all(overview == overviews[0] for overview in overviews)
+
+    mintos_client.get_aggregates_overview('KZT')
+    mintos_client.get_loans(currencies=['EUR'], quantity=400)
+    mintos_client.get_loans(currencies=['EUR'], quantity=400)
+
+    assert stand_in.requests == 4
+    assert mintos_client.response_cache.stats()['hits'] == 6
+
+    mintos_client.response_cache.invalidate()
+    mintos_client.get_aggregates_overview('EUR')
+
+    assert stand_in.requests == 5
+
+
+def test_shared_response_cache(stand_in, monkeypatch):
+    cache = ResponseCache()
+
+    clients = [
+        MintosApi(email=email, cookies=stand_in.cookies, save_cookies=False, response_cache=cache)
+        for email in ('first@example.com', 'second@example.com')
+    ]
+
+    for mintos_client in clients:
+        mintos_client._ensure_session()
+
+    CONSTANTS.get_currency_iso('EUR')
+
+    monkeypatch.setattr(stand_in, 'requests', 0)
+
+    # Each account gets its own responses
+    for mintos_client in [*clients, *clients]:
+        mintos_client.get_aggregates_overview('EUR')
+
+    assert stand_in.requests == 2 and cache.stats()['hits'] == 2
+
+
+def test_dashboard(mintos_client):
+    dashboard = mintos_client.get_dashboard(currencies=['EUR', 'KZT', 'XYZ'])
+
+    assert dashboard.index.names == ['currency', 'metric']
+    assert set(dashboard.index.get_level_values('currency')) == {'EUR', 'KZT'}
+    assert dashboard.loc[('EUR', 'netAnnualReturn'), 'source'] == 'net_annual_return'
+    assert dashboard.loc[('KZT', 'outstandingPrincipal'), 'source'] == 'aggregates_overview'
+    assert list(dashboard.attrs['errors']) == ['XYZ'] and len(dashboard.attrs['errors']['XYZ']) == 3
+
+    raw = mintos_client.get_dashboard(currencies=['EUR', 'XYZ'], raw=True)
+
+    assert raw['EUR']['portfolio_data'] == mintos_client.get_portfolio_data('EUR')
+    assert list(raw) == ['EUR'] and len(raw.errors['XYZ']) == 3
+
+
+def test_session_refresh(stand_in, monkeypatch):
+    mintos_client = MintosApi(cookies=stand_in.cookies, save_cookies=False)
+
+    expiry, scraper = mintos_client.session_expiry, mintos_client.scraper
+
+    assert mintos_client.refresh_session()
+    assert mintos_client.session_expiry >= expiry and mintos_client.scraper is scraper
+
+    monkeypatch.setattr(stand_in, 'session', 'renewed')
+
+    def login_session():
+        client = MintosApi(cookies=stand_in.cookies, save_cookies=False)
+        client._ensure_session()
+
+        return client
+
+    # The browser login is replaced by a client of the renewed session
+    monkeypatch.setattr(mintos_client, '_login_session', login_session)
+
+    assert not mintos_client.refresh_session()
+    assert mintos_client.scraper is not scraper
+    assert mintos_client.cookies == {'MW_SESSION': 'renewed'}
+    assert len(mintos_client.get_aggregates_overview('EUR')) > 0
+
+
+def test_reauthenticate_reuses_stored_session(stand_in, monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+
+    mintos_client = MintosApi(email='investor@example.com', password='password', cookies=stand_in.cookies)
+    mintos_client._ensure_session()
+
+    # Another process of the account already logged in again
+    expiry = int(time.time()) + 60
+
+    mintos_client.vault.save({'MW_SESSION': 'renewed'}, 'renewed-csrf-token', expiry)
+
+    monkeypatch.setattr(stand_in, 'requests', 0)
+
+    mintos_client.reauthenticate()
+
+    assert stand_in.requests == 0
+    assert mintos_client.cookies == {'MW_SESSION': 'renewed'} and mintos_client.csrf_token == 'renewed-csrf-token'
+    assert mintos_client.session_expiry == expiry and mintos_client.vault.load()['expiry'] == expiry
+
+
+def test_keep_alive(stand_in):
+    mintos_client = MintosApi(cookies=stand_in.cookies, save_cookies=False)
+
+    with mintos_client.keep_alive(interval=0.01) as keeper:
+        for _ in range(100):
+            if keeper.refreshes >= 2:
+                break
+
+            time.sleep(0.01)
+
+    assert keeper.refreshes >= 2 and keeper.logins == 0
+
+
+def test_single_login(stand_in, monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+
+    logins = []
+
+    def browser_login(client):
+        logins.append(client)
+
+        time.sleep(0.2)
+
+        client._use_session(stand_in.cookies)
+
+    monkeypatch.setattr(MintosApi, '_browser_login', browser_login)
+
+    clients = []
+
+    def start():
+        client = MintosApi(email='investor@example.com', password='password', tfa_secret='secret')
+        client.get_aggregates_overview('EUR')
+
+        clients.append(client)
+
+    threads = [threading.Thread(target=start) for _ in range(8)]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    # The other clients reuse the session and CSRF token stored by the one that logged in
+    assert len(logins) == 1 and len(clients) == 8
+    assert {client.csrf_token for client in clients} == {'stand-in-csrf-token'}
+    assert all(client.cookies == stand_in.cookies for client in clients)
+
+
+@pytest.mark.skipif(
+    not any(shutil.which(name) for name in ('google-chrome', 'chromium', 'chromium-browser', 'chrome')),
+    reason='Logging in needs Chrome',
+)
+@pytest.mark.parametrize('fast_login', [True, False])
+def test_browser_login(fast_login: bool, tmp_path):
+    with MintosStandIn(investments=10, claims=10, loans=10, schedule_loans=2, tfa_secret='JBSWY3DPEHPK3PXP') as server:
+        mintos_client = MintosApi(
+            email=server.email,
+            password=server.password,
+            tfa_secret=server.tfa_secret,
+            save_cookies=False,
+            fast_login=fast_login,
+            browser_profile=str(tmp_path / 'profile'),
+        )
+
+        mintos_client.get_aggregates_overview('EUR')
+
+        assert mintos_client.scraper.cookies.get('MW_SESSION') == server.session
+        phases = {'driver', 'page_load', 'credentials', 'recaptcha', 'totp', 'overview'}
+
+        assert set(mintos_client.login_timings) == phases
+
+        # Images and fonts aren't loaded during a fast login
+        assert (server.assets == 0) == fast_login
+
+
+def test_login_requires_browser_extra(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setitem(sys.modules, 'pyotp', None)
+
+    mintos_client = MintosApi(email='investor@example.com', password='password')
+
+    with pytest.raises(ImportError, match=r'mintospy\[browser\]'):
+        mintos_client._ensure_session()
+
+
+def test_lazy_session(stand_in, monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+
+    pages = stand_in.pages
+
+    mintos_client = MintosApi(email='investor@example.com', cookies=stand_in.cookies)
+
+    # Nothing is requested until the first call
+    assert stand_in.pages == pages and mintos_client.csrf_token is None
+
+    mintos_client.get_aggregates_overview('EUR')
+
+    assert stand_in.pages == pages + 1 and mintos_client.csrf_token == 'stand-in-csrf-token'
+
+    # The CSRF token is saved with the cookies, so the next client of the account doesn't fetch it again
+    mintos_client = MintosApi(email='investor@example.com')
+    mintos_client.get_aggregates_overview('EUR')
+
+    assert stand_in.pages == pages + 1 and mintos_client.csrf_token == 'stand-in-csrf-token'
+
+
+def test_hooks(stand_in):
+    collector = MetricsCollector()
+
+    mintos_client = MintosApi(cookies=stand_in.cookies, save_cookies=False, hooks=[collector])
+
+    # Starting the session fetches the CSRF token on the first call
+    mintos_client._ensure_session()
+
+    collector.reset()
+
+    mintos_client.get_investments(currency='EUR', quantity=700)
+
+    assert sorted(event.page for event in collector.requests) == [1, 2, 3]
+    assert all(event.status == 200 and event.bytes > 0 for event in collector.requests)
+
+    assert set(collector.stage_summary()['get_investments']) == {'fetch', 'decode', 'parse', 'frame'}
+
+    (summary,) = collector.request_summary().values()
+
+    assert summary['count'] == 3 and summary['latency_p50'] <= summary['latency_p99']
+
+
+def test_retries(stand_in, mintos_client, monkeypatch):
+    monkeypatch.setattr(CONSTANTS, 'RETRY_BACKOFF_SECONDS', 0.01)
+    monkeypatch.setattr(stand_in, 'fail_every', 2)
+
+    assert len(mintos_client.get_investments(currency='EUR', quantity=700)) == 700
+    assert len(mintos_client.get_note_schedule('LV0000000001')) == 12
+
+
+def test_checkpoint(stand_in, mintos_client, monkeypatch, tmp_path):
+    checkpoint = str(tmp_path / 'investments.jsonl')
+
+    monkeypatch.setattr(CONSTANTS, 'MAX_RETRIES', 0)
+    monkeypatch.setattr(stand_in, 'requests', 0)
+    monkeypatch.setattr(stand_in, 'fail_every', 3)
+
+    # Pages are fetched one at a time, so the third page is the one that fails
+    with pytest.raises(NetworkException):
+        mintos_client.get_investments(currency='EUR', quantity=700, max_workers=1, checkpoint=checkpoint)
+
+    assert os.path.exists(checkpoint)
+
+    monkeypatch.setattr(stand_in, 'requests', 0)
+    monkeypatch.setattr(stand_in, 'fail_every', 0)
+
+    investments = mintos_client.get_investments(currency='EUR', quantity=700, max_workers=1, checkpoint=checkpoint)
+
+    assert len(investments) == 700
+    assert stand_in.requests == 1
+    assert not os.path.exists(checkpoint)
+
+
+def test_sync(stand_in, mintos_client, monkeypatch, tmp_path):
+    with PortfolioSync(mintos_client, str(tmp_path / 'portfolio.sqlite3')) as portfolio:
+        assert portfolio.sync('EUR') == {'current': 700, 'finished': 700}
+
+        monkeypatch.setattr(stand_in, 'requests', 0)
+
+        # Nothing changed, so only the first page of current and finished notes is requested
+        assert portfolio.sync('EUR') == {'current': 0, 'finished': 0}
+        assert stand_in.requests <= 4
+
+        monkeypatch.setattr(stand_in, 'investments', 760)
+
+        assert portfolio.sync('EUR') == {'current': 60, 'finished': 60}
+        assert len(portfolio.investments('EUR', current=True)) == 760
+        assert len(portfolio.investments(raw=True)) == 1520
+
+        assert portfolio.sync('EUR', claims=True) == {'current': 450, 'finished': 450}
+
+
+def test_interrupted_sync(mintos_client, monkeypatch, tmp_path):
+    iter_investments = mintos_client.iter_investments
+
+    def interrupted(*args, **kwargs):
+        pages = iter_investments(*args, **kwargs)
+
+        yield next(pages)
+
+        raise NetworkException('Connection lost.')
+
+    with PortfolioSync(mintos_client, str(tmp_path / 'portfolio.sqlite3')) as portfolio:
+        monkeypatch.setattr(mintos_client, 'iter_investments', interrupted)
+
+        with pytest.raises(NetworkException):
+            portfolio.sync('EUR')
+
+        monkeypatch.undo()
+
+        # The first sync never went through every page, so the next one doesn't stop at what it stored
+        assert portfolio.sync('EUR') == {'current': 700, 'finished': 700}
+        assert len(portfolio.investments('EUR', current=True)) == 700
+
+        assert portfolio.sync('EUR') == {'current': 0, 'finished': 0}
@@ -0,0 +1,80 @@
+from mintospy.session import SessionVault
+import multiprocessing
+import pytest
+import time
+import json
+import os
+
+
+def _login_once(path: str, logins_path: str) -> None:
+    vault = SessionVault(path)
+
+    if vault.load() is not None:
+        return
+
+    with vault.lock():
+        if vault.load() is not None:
+            return
+
+        with open(logins_path, 'a') as f:
+            f.write(f'{os.getpid()}\n')
+
+        # A browser login takes a while, the other processes wait for it meanwhile
+        time.sleep(0.2)
+
+        vault.save({'MW_SESSION': 'shared'}, 'csrf-token', time.time() + 60)
+
+
+def test_save_and_load(tmp_path):
+    vault = SessionVault(str(tmp_path / 'cookies.json'))
+
+    assert vault.load() is None
+
+    vault.save({'MW_SESSION': 'session'}, 'csrf-token', time.time() + 60)
+
+    session = vault.load()
+
+    assert session['cookies'] == {'MW_SESSION': 'session'} and session['csrf_token'] == 'csrf-token'
+    assert sorted(os.listdir(tmp_path)) == ['cookies.json', 'cookies.json.lock']
+
+    vault.clear()
+
+    assert vault.load() is None
+
+
+def test_expired_and_invalid_sessions(tmp_path):
+    path = tmp_path / 'cookies.json'
+
+    vault = SessionVault(str(path))
+    vault.save({'MW_SESSION': 'session'}, 'csrf-token', time.time() - 1)
+
+    assert vault.load() is None
+
+    # Sessions saved before the CSRF token was stored are still loaded
+    with open(path, 'w') as f:
+        json.dump({'cookies': {'MW_SESSION': 'session'}, 'expiry': time.time() + 60}, f)
+
+    assert vault.load()['csrf_token'] is None
+
+    with open(path, 'w') as f:
+        f.write('{"cookies": ')
+
+    with pytest.warns(UserWarning):
+        assert vault.load() is None
+
+
+def test_single_login_across_processes(tmp_path):
+    path, logins_path = str(tmp_path / 'cookies.json'), str(tmp_path / 'logins')
+
+    processes = [multiprocessing.Process(target=_login_once, args=(path, logins_path)) for _ in range(8)]
+
+    for process in processes:
+        process.start()
+
+    for process in processes:
+        process.join()
+
+    with open(logins_path) as f:
+        assert len(f.readlines()) == 1
+
+    assert SessionVault(path).load()['cookies'] == {'MW_SESSION': 'shared'}
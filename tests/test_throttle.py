@@ -0,0 +1,80 @@
+from mintospy.throttle import Throttle
+import threading
+import time
+
+
+def test_rate():
+    throttle = Throttle(rate=50, burst=5, max_concurrency=100)
+
+    start = time.monotonic()
+
+    for _ in range(15):
+        throttle.acquire()
+        throttle.release(False)
+
+    # The first 5 requests use the burst, the other 10 wait for tokens refilled at 50 per second
+    assert 0.15 < time.monotonic() - start < 1
+
+
+def test_concurrency():
+    throttle = Throttle(rate=1000, burst=1000, max_concurrency=3)
+
+    in_flight, peak, lock = [0], [0], threading.Lock()
+
+    def request():
+        throttle.acquire()
+
+        with lock:
+            in_flight[0] += 1
+            peak[0] = max(peak[0], in_flight[0])
+
+        time.sleep(0.02)
+
+        with lock:
+            in_flight[0] -= 1
+
+        throttle.release(False)
+
+    threads = [threading.Thread(target=request) for _ in range(12)]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    assert peak[0] == 3
+
+
+def test_adaptive_limit():
+    throttle = Throttle(rate=1000, burst=1000, max_concurrency=8, cooldown=0.05)
+
+    for _ in range(3):
+        throttle.acquire()
+
+    throttle.release(True)
+    throttle.release(True)
+
+    # Requests in flight when the limit was decreased don't decrease it again
+    assert throttle.limit == 4
+    assert throttle.throttled == 2
+
+    throttle.release(False)
+
+    assert throttle.limit == 4.25
+
+    assert Throttle.is_throttled(429, {}) and Throttle.is_throttled(200, {'cf-mitigated': 'challenge'})
+    assert Throttle.is_throttled(200, {}) is False and Throttle.is_throttled(502, {}) is None
+
+
+def test_retry_after():
+    throttle = Throttle(rate=1000, burst=1000, max_concurrency=8)
+
+    throttle.acquire()
+    throttle.release(True, retry_after=0.2)
+
+    start = time.monotonic()
+
+    throttle.acquire()
+
+    assert time.monotonic() - start >= 0.15
@@ -0,0 +1,159 @@
+from mintospy.utils import Utils
+import pandas as pd
+import random
+import pytest
+
+
+def make_investment(idx: int, claims: bool = False) -> dict:
+    rng = random.Random(idx)
+
+    item = {
+        'id' if claims else 'isin': idx if claims else f'LV{idx:010d}',
+        'lender': rng.choice(['Mogo', 'Wowwo', 'Kviku']),
+        'interestRate': str(round(rng.uniform(5, 20), 3)),
+        'initialAmount': {'amount': f'{rng.uniform(1, 500):.4f}', 'currency': 'EUR'},
+        'amount': {'amount': rng.choice([f'{rng.uniform(0, 500):.2f}', None]), 'currency': 'EUR'},
+        'mintosRiskScore': {'score': str(rng.randint(1, 9)), 'subscores': {'lender': '5.5', 'buyback': '7'}},
+        'createdAt': 1650000000000 + idx * 86_400_000,
+        'loanDtEnd': rng.choice([1690000000000 + idx, None, 'Late']),
+        'isListed': rng.choice([True, False]),
+        'status': rng.choice(['current', 'late', 'finished']),
+        'contracts': [{'id': 1}],
+    }
+
+    if idx % 3 == 0:
+        item['deletedAt'] = 1660000000000 + idx
+
+    return item
+
+
+@pytest.mark.parametrize('claims', [False, True])
+def test_parse_investments_frame(claims: bool):
+    investments = [make_investment(idx, claims) for idx in range(500)]
+
+    row_index = 'ID' if claims else 'ISIN'
+
+    expected = pd.DataFrame.from_records(Utils.parse_investments(investments)).set_index(row_index).fillna('N/A')
+
+    parsed = Utils.parse_investments_frame(investments).set_index(row_index).fillna('N/A')
+
+    pd.testing.assert_frame_equal(parsed, expected)
+
+
+def test_parse_investments_frame_mixed_values():
+    investments = [
+        {'isin': 'LV0000000001', 'amount': {'amount': '0', 'currency': 'KZT'}, 'term': '12', 'note': 'abc'},
+        {'isin': 'LV0000000002', 'amount': 5, 'term': 'N/A', 'extra': {'foo': 'bar'}},
+        {'isin': 'LV0000000003', 'amount': {'amount': 0, 'currency': 'KZT'}, 'note': None},
+    ]
+
+    expected = pd.DataFrame.from_records(Utils.parse_investments(investments)).set_index('ISIN').fillna('N/A')
+
+    parsed = Utils.parse_investments_frame(investments).set_index('ISIN').fillna('N/A')
+
+    pd.testing.assert_frame_equal(parsed, expected)
+
+
+def make_payment(idx: int) -> dict:
+    rng = random.Random(f'payment-{idx}')
+
+    def component(key: str) -> dict:
+        return {key: f'{rng.uniform(0, 50):.2f}', 'received': rng.choice(['0.00', '1.50', None]), 'hasRemainder': False}
+
+    return {
+        'loan': {'id': idx, 'identifier': f'{idx}-01'},
+        'currency': {'abbreviation': 'EUR', 'isoCode': 978},
+        'date': 1690000000000 + idx * 86_400_000,
+        'number': idx % 12 + 1,
+        'isPrepaid': idx % 7 == 0,
+        'total': component('scheduled'),
+        'principal': component('scheduled'),
+        'interest': component('scheduled'),
+        'delayedInterest': component('accumulated'),
+        'latePaymentFee': component('accumulated') if idx % 5 else None,
+    }
+
+
+def test_parse_note_schedule_frame():
+    schedule = [make_payment(idx) for idx in range(500)]
+
+    expected = pd.DataFrame.from_records(
+        [Utils.parse_note_schedule(Utils.parse_mintos_items(item)) for item in schedule if item['latePaymentFee']],
+    ).fillna('N/A')
+
+    parsed = Utils.parse_note_schedule_frame([item for item in schedule if item['latePaymentFee']]).fillna('N/A')
+
+    pd.testing.assert_frame_equal(parsed, expected)
+
+
+def test_note_cash_flows():
+    schedule = [make_payment(idx) for idx in range(500)]
+
+    cash_flows = Utils.note_cash_flows({'LV0000000001': schedule[:200], 'LV0000000002': schedule[200:]})
+
+    # Payments without a late payment fee have one component less
+    assert len(cash_flows) == 500 * 5 - 100
+    assert list(cash_flows.columns) == ['isin', 'loan', 'date', 'component', 'scheduled', 'received']
+    assert list(cash_flows['component'].cat.categories) == list(Utils._SCHEDULE_COMPONENTS)
+    assert cash_flows['isin'].value_counts().to_dict() == {'LV0000000002': 1500 - 60, 'LV0000000001': 1000 - 40}
+
+    first = cash_flows.iloc[0]
+
+    assert first['loan'] == '0-01' and first['component'] == 'total'
+    assert first['scheduled'] == float(schedule[0]['total']['scheduled'])
+    assert cash_flows['received'].isna().any()
+    assert pd.api.types.is_datetime64_dtype(cash_flows['date'])
+
+
+def test_parse_items_frame():
+    loans = [
+        {'id': 1, 'identifier': '1-01', 'amount': '10.005', 'term': 12, 'lender': 'Mogo'},
+        {'id': 2, 'identifier': '2-01', 'amount': None, 'term': 'N/A', 'lender': 'Kviku', 'extra': {'a': '1'}},
+        {'id': 3, 'identifier': '3-01', 'amount': '7', 'extra': '2.5'},
+    ]
+
+    expected = pd.DataFrame([Utils.parse_mintos_items(item) for item in loans]).fillna('N/A')
+
+    pd.testing.assert_frame_equal(Utils.parse_items_frame(loans).fillna('N/A'), expected)
+
+
+def test_sort_key():
+    dates = ['02.01.2024', '2023-12-31', 1704240000000, None]
+
+    assert sorted(dates, key=lambda v: Utils.sort_key(v, 'date')) == [None, '2023-12-31', '02.01.2024', 1704240000000]
+
+    assert sorted(['9.5', '10.25', {'amount': '1.5'}], key=Utils.sort_key) == [{'amount': '1.5'}, '9.5', '10.25']
+    assert sorted(['b', 'A', 'a'], key=lambda v: Utils.sort_key(v, 'text')) == ['A', 'a', 'b']
+
+
+def test_typed_frame():
+    investments = [make_investment(idx) for idx in range(500)]
+
+    parsed = Utils.parse_investments_frame(investments).set_index('ISIN')
+
+    typed = Utils.typed_frame(parsed)
+
+    assert typed.index.equals(parsed.index)
+    assert list(typed.columns) == list(parsed.columns)
+
+    assert typed['currency'].dtype == 'category' and typed['status'].dtype == 'category'
+    assert typed['amount'].dtype == float and typed['amount'].isna().any()
+    assert pd.api.types.is_datetime64_dtype(typed['createdAt'])
+    assert pd.api.types.is_datetime64_dtype(typed['loanDtEnd']) and typed['loanDtEnd'].isna().any()
+    assert typed.memory_usage(deep=True).sum() < parsed.fillna('N/A').memory_usage(deep=True).sum()
+
+
+def test_read_csrf_token():
+    page = b'<html><head><meta charset="utf-8"><meta data-hid="csrf-token" name="csrf-token" content="a&amp;b"></head>'
+
+    def chunks(size: int):
+        for idx in range(0, len(page), size):
+            yield page[idx:idx + size]
+
+        raise AssertionError('The rest of the page was read')
+
+    # Tags cut between chunks are found once completed, and nothing is read after them
+    for size in (1, 7, 64, len(page)):
+        assert Utils.read_csrf_token(chunks(size)) == 'a&b'
+
+    assert Utils.read_csrf_token(iter([b'<html><head></head></html>'])) is None